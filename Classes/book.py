@@ -1,13 +1,14 @@
 # book.py
-import ast
 from typing import List, Any, TYPE_CHECKING
 from design_patterns.observer import Subject, Observer
+from Classes.id_allocator import IdAllocator
+from manage_files.csv_manager import decode_id_list
 if TYPE_CHECKING:
     from Classes.user import User
 
 class Book(Subject):
     book_id = 0
-    book_ids = [0]
+    book_ids = IdAllocator(reserved=[0])
     def __init__(self, title: str, author: str, year: int, category: str, available_copies: int):
         self.id = Book.book_id
         self.title = title
@@ -34,17 +35,30 @@ class Book(Subject):
     def createBook(title: str, author: str, year: int, category: str, copies: int) -> 'Book':
         if copies < 0:
             raise ValueError("Number of copies cannot be negative.")
-        while Book.book_id in Book.book_ids:
-            Book.book_id += 1
-        Book.book_ids.append(Book.book_id)
+        Book.book_id = Book.book_ids.allocate()
         return Book(title, author, year, category, copies)
 
+    @staticmethod
+    def createBooks(books_data: List[tuple[str, str, int, str, int]]) -> List['Book']:
+        """
+        Creates many books at once (imports), reserving one range of ids for all of them.
+
+        :param books_data: list of (title, author, year, category, copies) tuples.
+        """
+        if any(data[4] < 0 for data in books_data):
+            raise ValueError("Number of copies cannot be negative.")
+        books = []
+        for new_id, (title, author, year, category, copies) in zip(Book.book_ids.reserve_range(len(books_data)), books_data):
+            Book.book_id = new_id
+            books.append(Book(title, author, year, category, copies))
+        return books
+
     @staticmethod
     def loaded_book(title: str, author: str, year: int, category: str, copies: int, prev_id,
                     followers_ids : List[int], borrow_count : int, borrowed_users : List[int], is_loaned :bool) -> 'Book':
         new_book =  Book(title, author, year, str(category), int(copies))
         new_book.set_id(prev_id)
-        Book.book_ids.append(new_book.id)
+        Book.book_ids.reserve(new_book.id)
         new_book.temp_followers = followers_ids
         new_book.borrow_count = borrow_count
         new_book.borrowed_users = borrowed_users
@@ -58,8 +72,8 @@ class Book(Subject):
         try:
             if self.isLoaned or self.available_copies <1:
                 return False
-            self.updateCopies(-1, to_print=print_update_for_copy)
             self.borrow_count += 1
+            self.updateCopies(-1, to_print=print_update_for_copy)
             self.borrowed_users.append(user.id)
         except Exception as e:
             print(f"Error: book class, borrow book method: {e}")
@@ -138,8 +152,8 @@ class Book(Subject):
         is_loaned = json["isLoaned"].strip().lower() == "yes"
         return Book.loaded_book(title= str(json["title"]), author= str(json["author"]), category=str(json["category"]),
                                 copies=int(json["copies"]), prev_id = int(json["id"]), year=int(json["year"]),
-                                followers_ids=ast.literal_eval(json["user_observers"]),borrow_count=int(json["borrow_count"]),
-                                borrowed_users = ast.literal_eval(json["borrowed_users"]), is_loaned = is_loaned)
+                                followers_ids=decode_id_list(json["user_observers"]),borrow_count=int(json["borrow_count"]),
+                                borrowed_users = decode_id_list(json["borrowed_users"]), is_loaned = is_loaned)
 
 
 
@@ -0,0 +1,99 @@
+# id_allocator.py
+import heapq
+from typing import Iterable, List
+
+
+class IdAllocator:
+    """
+    Hands out unique integer ids (used for both books and users).
+    keeps the used ids in a set and a high-water mark, so allocating, reserving and releasing are O(1)
+    instead of scanning a list. released ids are only handed out again when 'reuse_freed' is set.
+    """
+
+    def __init__(self, reserved: Iterable[int] = (), reuse_freed: bool = False):
+        """
+        :param reserved: ids that are taken from the start (e.g. 0 for the library's own objects).
+        :param reuse_freed: bool - hand out released ids again (smallest first) before new ones.
+        """
+        self._used: set[int] = set()
+        # every id below the mark was handed out or reserved at some point
+        self._next = 0
+        self._max_used = -1
+        self.reuse_freed = reuse_freed
+        self._free: List[int] = []
+        for obj_id in reserved:
+            self.reserve(obj_id)
+
+    def __contains__(self, obj_id: int) -> bool:
+        return obj_id in self._used
+
+    def __len__(self) -> int:
+        return len(self._used)
+
+    def __iter__(self):
+        return iter(self._used)
+
+    def allocate(self) -> int:
+        """
+        Returns a new unused id and marks it as used.
+        """
+        while self.reuse_freed and self._free:
+            obj_id = heapq.heappop(self._free)
+            if obj_id not in self._used:
+                self._mark_used(obj_id)
+                return obj_id
+        if self.reuse_freed:
+            while self._next in self._used:
+                self._next += 1
+            obj_id = self._next
+        else:
+            # above every id ever used, so an id released below the mark isn't handed out again
+            obj_id = max(self._next, self._max_used + 1)
+        self._mark_used(obj_id)
+        self._next = obj_id + 1
+        return obj_id
+
+    def reserve(self, obj_id: int):
+        """
+        Marks an existing id (e.g. of a loaded object) as used.
+        """
+        self._mark_used(int(obj_id))
+
+    def reserve_many(self, obj_ids: Iterable[int]):
+        """
+        Marks many existing ids as used in one step (bulk loads).
+        """
+        obj_ids = set(obj_ids)
+        if obj_ids:
+            self._used.update(obj_ids)
+            self._max_used = max(self._max_used, max(obj_ids))
+
+    def reserve_range(self, count: int) -> range:
+        """
+        Reserves 'count' consecutive new ids in one step (bulk imports).
+
+        :return: range of the reserved ids.
+        """
+        if count < 0:
+            raise ValueError("Number of ids cannot be negative.")
+        start = max(self._next, self._max_used + 1)
+        ids = range(start, start + count)
+        self._used.update(ids)
+        if count:
+            self._max_used = ids[-1]
+            self._next = ids[-1] + 1
+        return ids
+
+    def release(self, obj_id: int):
+        """
+        Frees an id of a removed object.
+        """
+        if obj_id in self._used:
+            self._used.discard(obj_id)
+            if self.reuse_freed:
+                heapq.heappush(self._free, obj_id)
+
+    def _mark_used(self, obj_id: int):
+        self._used.add(obj_id)
+        if obj_id > self._max_used:
+            self._max_used = obj_id
@@ -1,4 +1,5 @@
 # library.py
+import atexit
 import os
 from os import write
 
@@ -9,7 +10,22 @@ from design_patterns.exceptions import PermissionDeniedException, BookNotFoundEx
 from design_patterns.logger import Logger
 from Classes.book import Book
 from Classes.user import User, Librarian
-from manage_files import csv_manager
+from manage_files import csv_manager, parallel_loader, snapshot_manager
+from manage_files.storage_backend import StorageBackend, CsvStorageBackend
+from manage_files.write_behind import WriteBehindFlusher
+from indexes.book_index import BookIndex
+from indexes.token_index import TokenIndex
+from indexes.trigram_index import TrigramIndex
+from indexes.prefix_index import PrefixIndex
+from indexes.fuzzy_index import FuzzyIndex
+from indexes.attribute_index import AttributeIndex
+from indexes.popularity_index import PopularityIndex
+from indexes.username_index import UsernameIndex
+from indexes.book_table import BookTable, NUMPY_AVAILABLE
+from indexes.bitmap_index import BitmapIndex
+from indexes.phonetic_index import PhoneticIndex
+from indexes.query_planner import plan_query
+from indexes.search_cache import SearchCache
 
 from typing import TYPE_CHECKING, Any, Optional,List
 
@@ -57,12 +73,33 @@ class Library(Subject, Observer):
         self.logger: Logger = Logger()
         self.lost_books_user = User("holds_lost_books", "00000")
         self.users[0] = self.lost_books_user
+        # case-normalized username -> user, kept in sync by signUp and the users load paths
+        self.usernames = UsernameIndex()
+        self.usernames.add_user(self.lost_books_user)
         self.users_csv_file_path = None
         self.books_csv_file_path = None
         self.book_decorators_file_path = None
         self.book_headers_mapping = csv_manager.book_headers_mapping
         self.user_headers_mapping = csv_manager.user_headers_mapping
         self.book_deco_headers_mapping = csv_manager.book_deco_headers_mapping
+        # where the collections are persisted (csv files by default, see use_sqlite_storage)
+        self.storage: StorageBackend = CsvStorageBackend()
+        # when set, decorated mutations are queued and written by a background flusher
+        self.write_behind: Optional[WriteBehindFlusher] = None
+        # in-memory indexes over self.books, kept in sync by addBook/removeBook and the load paths
+        self.book_indexes: dict[str, BookIndex] = {"tokens": TokenIndex(), "trigrams": TrigramIndex(),
+                                                   "prefixes": PrefixIndex(), "fuzzy": FuzzyIndex(),
+                                                   "attributes": AttributeIndex(), "popularity": PopularityIndex(),
+                                                   "bitmaps": BitmapIndex(),
+                                                   "phonetic": PhoneticIndex(self.book_descriptions)}
+        # columnar numpy mirror of the books for catalog-wide statistics, only when numpy is installed
+        if NUMPY_AVAILABLE:
+            self.book_indexes["table"] = BookTable()
+        # bumped by every change that can alter a search result, the search cache serves only current entries
+        self.generation = 0
+        # bumped only when books are added, removed or reloaded, the books' text fields don't change otherwise
+        self.catalog_version = 0
+        self.search_cache = SearchCache()
 
         with open(self.logger.log_file, "w") as log_file:
             log_file.write("")
@@ -78,6 +115,22 @@ class Library(Subject, Observer):
     def name(self) -> str:
         return "Library"
 
+    @property
+    def journaled_persistence(self) -> bool:
+        """
+        True if mutations are appended to per-collection journals instead of rewriting the csv files.
+        """
+        return getattr(self.storage, "journaled", False)
+
+    @journaled_persistence.setter
+    def journaled_persistence(self, value: bool):
+        if not isinstance(self.storage, CsvStorageBackend):
+            raise ValueError("Journaled persistence is only available for the csv storage.")
+        if self.storage.journaled and not value:
+            # the files are rewritten from now on, the journals are folded so a load can't replay them over newer rows
+            self.compact_journals()
+        self.storage.journaled = value
+
     def has_permission(self, permission: str) -> bool:
         permissions = ["borrow", "return", "manage_books", "manage_users"]
         return permission in permissions
@@ -88,9 +141,33 @@ class Library(Subject, Observer):
         required_fields = ["username", "password", "role"]
         if required_fields.sort() != list(user_params.keys()).sort():
             raise SignUpError([param for param in required_fields if param not in user_params.keys()])
-        elif any(user.username == user_params["username"] for user in self.users.values()):
+        elif self.isUsernameTaken(user_params["username"]):
             raise SignUpError(f"Username '{user_params['username']}' is already taken.")
 
+    def isUsernameTaken(self, username: str) -> bool:
+        """
+        True if a user already has this username (case-insensitive).
+        """
+        return self.usernames.is_taken(username)
+
+    def getUserByUsername(self, username: str) -> Optional[User]:
+        """
+        Returns the user with this username (case-insensitive), or None.
+        users loaded with usernames that differ only by case are found by their exact username.
+        """
+        return self.usernames.get(username)
+
+    def _index_usernames(self):
+        """
+        Rebuilds the username index after the users were loaded, warning about usernames that differ only by case
+        (they log in with their exact username).
+        """
+        for users in self.usernames.rebuild(self.users.values()):
+            self.log_notify_print(to_log=f"Warning : users {[user.id for user in users]} have the same username up to case: "
+                                         f"{[user.username for user in users]}",
+                                  to_print=f"Warning : usernames differing only by case: {[user.username for user in users]}",
+                                  to_notify=None)
+
     @permission_required("manage_users")
     def signUp(self, user_params: dict[str, Any]):
         """
@@ -111,6 +188,7 @@ class Library(Subject, Observer):
         if user is not None:
             user_id = user.id
             self.users[user_id] = user
+            self.usernames.add_user(user)
             self.log_notify_print(
                 to_log=f"Registered - new {user.role} with Username :{user.username} and id: {user.id} - successfully.",
                 to_notify=[self, f"New {user_params['role']} with username: {user.username} joined the library."],
@@ -144,6 +222,9 @@ class Library(Subject, Observer):
             raise PermissionDeniedException("manage_books")
 
         self.books[book.id] = book
+        self._index_book(book)
+        self.generation += 1
+        self.catalog_version += 1
         self.log_notify_print(to_log= f"\nAdded book - '{book.title}' with id: {book.id} to the library - successfully.",
                               to_notify=[self, f"New book '{book.title}' by '{book.author}' added to library collection."],
                               to_print=f"New book '{book.title}' with id:{book.id} added to the library.")
@@ -162,8 +243,17 @@ class Library(Subject, Observer):
 
         if book.id in self.books.keys():
             self.books.pop(book.id)
-            Book.book_ids.remove(book.id)
-            removed = csv_manager.remove_book_from_csv(book.id, self.books_csv_file_path)
+            self._unindex_book(book)
+            self.generation += 1
+            self.catalog_version += 1
+            Book.book_ids.release(book.id)
+            if self.write_behind is not None:
+                # a pending upsert must not write the removed book back
+                self.write_behind.discard(self.books_csv_file_path, book.id)
+                with self.write_behind.exclusive():
+                    removed = self._remove_book_from_files(book)
+            else:
+                removed = self._remove_book_from_files(book)
             if removed:
                 self.log_notify_print(to_log=f"Removed book - '{book.title}' from the library - successfully.",
                                       to_notify=[self,f"Removed book '{book.title}' by '{book.author}' from library collection."],
@@ -174,31 +264,249 @@ class Library(Subject, Observer):
             self.log_notify_print(to_log= f"Remove book - for '{book.title}' - failed, book not found",to_print= f"Error: Failed to remove book '{book.title}', book not found.", to_notify=None)
             raise BookNotFoundException(book.title)
 
+    @permission_required("manage_books")
+    def removeBooks(self, books, caller: Optional[User] = None) -> int:
+        """
+        Removes many books (e.g. weeding the collection) with a single persistence operation.
+        Raises BookNotFoundException, before removing anything, if one of the books is not in the library.
+
+        :param books: iterable of Book - the books to remove.
+        :return: int - number of removed books.
+        """
+        if caller is not None and not caller.has_permission("manage_books"):
+            self.log_notify_print(to_log=f"Warning : unauthorised object tried to remove books.",
+                                  to_print=f"Warning : unauthorised object tried to remove books.", to_notify=None)
+            raise PermissionDeniedException("manage_books")
+
+        books = list({book.id: book for book in books}.values())
+        missing = [book.title for book in books if book.id not in self.books]
+        if missing:
+            self.log_notify_print(to_log=f"Remove books - failed, books not found: {missing}",
+                                  to_print=f"Error: Failed to remove books, books not found: {missing}", to_notify=None)
+            raise BookNotFoundException(", ".join(missing))
+
+        for book in books:
+            self.books.pop(book.id)
+            self._unindex_book(book)
+            Book.book_ids.release(book.id)
+        self.generation += 1
+        self.catalog_version += 1
+        if self.write_behind is not None:
+            for book in books:
+                self.write_behind.discard(self.books_csv_file_path, book.id)
+            with self.write_behind.exclusive():
+                removed = self._remove_books_from_files(books)
+        else:
+            removed = self._remove_books_from_files(books)
+        if removed:
+            self.log_notify_print(to_log=f"Removed ({len(books)}) books from the library - successfully.",
+                                  to_notify=[self, f"Removed ({len(books)}) books from library collection."],
+                                  to_print=f"Removed ({len(books)}) books from the library.")
+        elif books:
+            self.log_notify_print(to_log=f"Remove books - for ({len(books)}) books - failed",
+                                  to_print=f"Error: Failed to remove ({len(books)}) books", to_notify=None)
+        return len(books)
+
+    def _remove_book_from_files(self, book: Book) -> bool:
+        return self._remove_books_from_files([book])
+
+    def _remove_books_from_files(self, books: List[Book]) -> bool:
+        self._drop_decorators(books)
+        return self.storage.remove_objs([book.id for book in books], self.books_csv_file_path, self.book_headers_mapping)
+
+    def _drop_decorators(self, books: List[Book]):
+        """
+        Drops the decorators of removed books, so a later book with the same id doesn't inherit them.
+        """
+        decorated_ids = [book.id for book in books if self.decorated_books.pop(book.id, None) is not None]
+        if decorated_ids and self.book_decorators_file_path is not None:
+            if self.write_behind is not None:
+                for book_id in decorated_ids:
+                    self.write_behind.discard(self.book_decorators_file_path, book_id)
+            self.storage.remove_objs(decorated_ids, self.book_decorators_file_path, self.book_deco_headers_mapping)
+
     @update_csv_after([dec_book_args_for_csv_update_wrapper])
     def add_decorated_book(self, deco_book: 'BookDecorator'):
         if deco_book.id in self.books.keys():
             self.decorated_books.update({deco_book.id : deco_book})
+            self.book_indexes["phonetic"].refresh_descriptions(self.books[deco_book.id])
+            self.generation += 1
             self.log_notify_print(to_log=f"Added decorator - for book {deco_book.id} - successfully.",
                                   to_print=f"Added decorator for book {deco_book.id}.",to_notify=None)
 
 
+    # ----------- Indexes -------------
+    def _index_book(self, book: Book):
+        for index in self.book_indexes.values():
+            index.add_book(book)
+
+    def _unindex_book(self, book: Book):
+        for index in self.book_indexes.values():
+            index.remove_book(book)
+
+    def rebuild_indexes(self):
+        """
+        Rebuilds all the book indexes from self.books (after the collection was replaced by a load).
+        """
+        for index in self.book_indexes.values():
+            index.rebuild(self.books.values())
+        self.generation += 1
+        self.catalog_version += 1
+
+    def book_descriptions(self, book_id: int) -> List[str]:
+        """
+        Returns the descriptions of a book's decorators (empty if the book isn't decorated).
+        """
+        from design_patterns.decorator import descriptions_of
+        return descriptions_of(self.decorated_books.get(book_id))
+
+    def reindex_descriptions(self):
+        """
+        Indexes the decorators' descriptions again, after self.decorated_books was replaced by a load.
+        """
+        self.book_indexes["phonetic"].rebuild(self.books.values())
+        self.generation += 1
+
+    def book_changed(self, book: Book):
+        """
+        Refreshes the indexes after a book's copies/availability or borrow count changed (lend, return, copies update).
+        the Book doesn't know the library, so whoever changes an indexed book calls it.
+        """
+        self.generation += 1
+        for index in self.book_indexes.values():
+            index.refresh_book(book)
+
+    def updateBookCopies(self, book: Book, count: int, to_print = True):
+        """
+        Changes the available copies of a library book by 'count' and refreshes the indexes.
+        """
+        book.updateCopies(count, to_print=to_print)
+        self.book_changed(book)
+
+    def setBookBorrowCount(self, book: Book, count: int):
+        """
+        Sets the borrow count of a library book and refreshes the indexes (the popular books).
+        """
+        book.set_borrow_count(count)
+        self.book_changed(book)
+
     # ----------- Searching and Filters-------------
     def searchBooks(self, criteria: str, strategy: SearchStrategy, books = None) -> List[Book]:
-        if books is None:
-            book_list, str_to_log = strategy.search([book for book in self.books.values()], criteria)
-        else:
-            book_list, str_to_log = strategy.search([book for book in books], criteria)
+        # only searches of the whole library are cached, keyed by the strategy and the normalized criteria
+        cache_key = None
+        if books is None and strategy.cache_key() is not None:
+            cache_key = (strategy.cache_key(), str(criteria).lower())
+            cached = self.search_cache.get(cache_key, self.generation)
+            if cached is not None:
+                book_list, field_counts = cached
+                if field_counts is not None:
+                    strategy.field_counts = dict(field_counts)
+                return list(book_list)
+
+        # index-backed strategies look up the whole library themselves, the others scan a view (no copy)
+        if books is None and not strategy.searches_library:
+            books = self.books.values()
+        book_list, str_to_log = strategy.search(books, criteria)
+        if cache_key is not None:
+            field_counts = getattr(strategy, "field_counts", None)
+            self.search_cache.put(cache_key, self.generation,
+                                  (list(book_list), dict(field_counts) if field_counts is not None else None))
         return book_list
 
-    def getPopularBooks(self):
-        sorted_books = sorted([book for book in self.books.values()], key=lambda book: book.borrow_count, reverse=True)
-        if sorted_books and len(sorted_books) > 0:
-            self.log_notify_print(to_log=f"Popular books - preformed - successfully. found ({len(sorted_books)}) books.",
-                                  to_print=f"Popular books - preformed - successfully. found ({len(sorted_books)}) books.", to_notify=None)
-            for book in sorted_books:
-                self.log_notify_print(to_log=f"Book: '{book.title}' Loans Counter: {book.borrow_count}",
-                                      to_print=f"{book.title} - Borrow_count: {book.borrow_count}", to_notify=None)
-            return sorted_books[:10]
+    def getCategories(self):
+        """
+        Returns the categories of the library's books (a live view of the category index keys).
+        """
+        return self.book_indexes["attributes"].categories.keys()
+
+    def getBooksByTitle(self, title: str) -> List[Book]:
+        """
+        Returns the books with exactly this title (several books may share a title), from the title index.
+        """
+        return [self.books[book_id] for book_id in self.book_indexes["attributes"].titles.get(title, ())]
+
+    def getBooksByCategory(self, category: str) -> List[Book]:
+        index = self.book_indexes["attributes"]
+        return index.books_by_ids(index.categories.get(category, ()))
+
+    def getAvailableBooks(self) -> List[Book]:
+        """
+        Returns the books with available copies, from the availability index (no scan of the books).
+        """
+        index = self.book_indexes["attributes"]
+        return index.books_by_ids(index.available)
+
+    def getUnavailableBooks(self) -> List[Book]:
+        index = self.book_indexes["attributes"]
+        return index.books_by_ids(index.unavailable)
+
+    def getBookStats(self) -> dict[str, Any]:
+        """
+        Catalog statistics: books, available, unavailable, total borrows, books per category and per decade.
+        computed with vectorized operations on the book table when numpy is installed, by a loop over the books otherwise.
+        """
+        table = self.book_indexes.get("table")
+        if table is not None:
+            return table.stats()
+        categories: dict[str, int] = {}
+        years: dict[int, int] = {}
+        available = borrows = 0
+        for book in self.books.values():
+            available += book.available_copies > 0
+            borrows += book.borrow_count
+            categories[str(book.category)] = categories.get(str(book.category), 0) + 1
+            try:
+                decade = int(book.year) // 10 * 10
+            except (TypeError, ValueError):
+                continue
+            years[decade] = years.get(decade, 0) + 1
+        return {"books": len(self.books), "available": available, "unavailable": len(self.books) - available,
+                "borrows": borrows, "categories": categories, "years": dict(sorted(years.items()))}
+
+    def query(self, query: str) -> List[Book]:
+        """
+        Runs a structured query, e.g. 'author:orwell year:1940..1960 genre:dystopia available' (see indexes/query_planner.py).
+        raises QuerySyntaxError for a query that can't be parsed.
+
+        :return: the matching books, in the library's order.
+        """
+        plan = plan_query(query, self.book_indexes)
+        return self.book_indexes["tokens"].books_by_ids(plan.execute())
+
+    def explain_query(self, query: str) -> str:
+        """
+        Runs the query and returns its plan: the steps in their order, with the estimated and the actual books of each.
+        """
+        plan = plan_query(query, self.book_indexes)
+        plan.execute()
+        return plan.explain()
+
+    def suggest(self, prefix: str, k: int = 5) -> List[str]:
+        """
+        Autocomplete for the search box.
+
+        :param prefix: str - the typed text.
+        :param k: int - max completions.
+        :return: up to 'k' titles/authors starting with 'prefix' (or with a word that does), the most borrowed first.
+        """
+        return self.book_indexes["prefixes"].suggest(prefix, k)
+
+    def search_cache_stats(self) -> dict[str, Any]:
+        """
+        Returns the search cache statistics: hits, misses, size, maxsize and hit_rate.
+        """
+        return self.search_cache.stats()
+
+    def getPopularBooks(self, k: int = 10) -> List[Book]:
+        """
+        Returns the 'k' most borrowed books (most borrowed first), from the popularity index.
+        raises BookNotFoundException if the library has no books.
+        """
+        popular_books = self.book_indexes["popularity"].top(k)
+        if popular_books:
+            self.log_notify_print(to_log=f"Popular books - preformed - successfully. found ({len(popular_books)}) books.",
+                                  to_print=f"Popular books - preformed - successfully. found ({len(popular_books)}) books.", to_notify=None)
+            return popular_books
         else:
             self.log_notify_print(to_log="Popular books - didn't found any books - failed.",
                                   to_print="Error : No popular books to display", to_notify=None)
@@ -215,6 +523,8 @@ class Library(Subject, Observer):
         if book.available_copies > 0:
             user_borrowed = user.borrowBook(book)
             book_borrowed = book.borrow_book(user, print_update_for_copy= print_book)
+            if book_borrowed:
+                self.book_changed(book)
             if not (user_borrowed or not book_borrowed) and print_book:
                 self.log_notify_print(to_log=f"Book borrowing - for '{book.title}' - failed",
                                       to_print= f"Error: when user {user.id} tried to borrow '{book.title}'", to_notify=None)
@@ -238,6 +548,8 @@ class Library(Subject, Observer):
         try:
             user_returned = user.returnBook(book)
             book_returned = book.return_book(user, print_update_for_copy=to_print)
+            if book_returned:
+                self.book_changed(book)
             if not user_returned or not book_returned:
                 self.log_notify_print(to_log=f"Book return - for '{book.title}' and user {user.username} - failed.",
                                       to_print=f"failed to return book '{book.title}' from user {user.username}.", to_notify=None)
@@ -284,8 +596,11 @@ class Library(Subject, Observer):
     # ------------- CSV / JSON Persistence -------------
 
     def load_users_from_csv(self, csv_file_path: str):
+        self._set_loaded_users(self.storage.load_objs_dict(csv_file_path, self.user_headers_mapping, "User"), csv_file_path)
 
-        self.users = csv_manager.load_objs_dict_from_csv(csv_file_path, self.user_headers_mapping, "User")
+    def _set_loaded_users(self, users: dict[int, 'User'], csv_file_path: str):
+        self.users = users
+        self._index_usernames()
         self.users_csv_file_path = csv_file_path
 
         for u in self.users.values():
@@ -302,14 +617,7 @@ class Library(Subject, Observer):
 
 
     def load_books_from_csv(self, csv_file_path: str):
-        self.books = csv_manager.load_objs_dict_from_csv(csv_file_path, csv_manager.book_headers_mapping, "Book")
-        self.books_csv_file_path = csv_file_path
-        if len(self.books.values()) > 0:
-            self.log_notify_print(to_log=f"Loaded ({len(self.books.values())}) books - from csv file: {csv_file_path} - successfully",
-                                  to_print=f"Loaded ({len(self.books.values())}) books from csv file: {csv_file_path}", to_notify=None)
-        else:
-            self.log_notify_print(to_log=f"Warning : no books found in csv file: {csv_file_path}",
-                                  to_print=f"No books found in csv file: {csv_file_path}", to_notify=None)
+        self._set_loaded_books(self.storage.load_objs_dict(csv_file_path, self.book_headers_mapping, "Book"), csv_file_path)
 
         #search if decorators exist and if they do, loading them
         try:
@@ -318,54 +626,213 @@ class Library(Subject, Observer):
             self.log_notify_print(to_log=f"No decorators for books available for '{csv_file_path}'.",
                                   to_print=f"No decorators for books available for '{csv_file_path}'.", to_notify=None)
 
+    def _set_loaded_books(self, books: dict[int, Book], csv_file_path: str):
+        self.books = books
+        self.books_csv_file_path = csv_file_path
+        self.rebuild_indexes()
+        if len(self.books.values()) > 0:
+            self.log_notify_print(to_log=f"Loaded ({len(self.books.values())}) books - from csv file: {csv_file_path} - successfully",
+                                  to_print=f"Loaded ({len(self.books.values())}) books from csv file: {csv_file_path}", to_notify=None)
+        else:
+            self.log_notify_print(to_log=f"Warning : no books found in csv file: {csv_file_path}",
+                                  to_print=f"No books found in csv file: {csv_file_path}", to_notify=None)
+
 
-    def load_decorators_from_csv(self, books_csv_file_path: str):
+    @staticmethod
+    def decorators_file_path(books_csv_file_path: str) -> str:
         directory, filename = os.path.split(books_csv_file_path)
         name, ext = os.path.splitext(filename)
         new_file_name = f"{name}_book_decorators{ext}"
-        csv_file_path = os.path.join(directory, new_file_name)
+        return os.path.join(directory, new_file_name)
+
+    def load_decorators_from_csv(self, books_csv_file_path: str):
+        csv_file_path = self.decorators_file_path(books_csv_file_path)
 
         # Check if the new CSV file exists
-        if os.path.exists(csv_file_path):
+        if self.storage.collection_exists(csv_file_path, self.book_deco_headers_mapping):
             self.log_notify_print(to_log=f"Found decorators csv file: {csv_file_path}",
                                   to_print=f"Found decorators csv file: {csv_file_path}",to_notify=None)
-            self.decorated_books = csv_manager.load_objs_dict_from_csv(csv_file_path,
-                                                                       self.book_deco_headers_mapping, "book_decorator")
-            self.book_decorators_file_path = csv_file_path
-            if len(self.decorated_books.values()) > 0:
-                self.log_notify_print(to_log=f"Loaded ({len(self.decorated_books.values())}) books decorator - from csv file: {csv_file_path} - successfully",
-                                      to_print=f"Loaded ({len(self.decorated_books.values())}) books decorator from csv file: {csv_file_path}",to_notify=None)
-            else:
-                self.log_notify_print(to_log=f"Warning : no books decorator found in csv file: {csv_file_path}",
-                                      to_print=f"No books decorator found in csv file: {csv_file_path}", to_notify=None)
+            self._set_loaded_decorators(self.storage.load_objs_dict(csv_file_path, self.book_deco_headers_mapping,
+                                                                    "book_decorator"), csv_file_path)
         else:
             self.log_notify_print(to_log=f"No decorators for books available for '{csv_file_path}'.",
                                   to_print=f"No books decorator available for '{csv_file_path}'.", to_notify=None)
 
+    def _set_loaded_decorators(self, decorated_books: dict[int, 'BookDecorator'], csv_file_path: str):
+        self.decorated_books = decorated_books
+        self.reindex_descriptions()
+        self.book_decorators_file_path = csv_file_path
+        if len(self.decorated_books.values()) > 0:
+            self.log_notify_print(to_log=f"Loaded ({len(self.decorated_books.values())}) books decorator - from csv file: {csv_file_path} - successfully",
+                                  to_print=f"Loaded ({len(self.decorated_books.values())}) books decorator from csv file: {csv_file_path}",to_notify=None)
+        else:
+            self.log_notify_print(to_log=f"Warning : no books decorator found in csv file: {csv_file_path}",
+                                  to_print=f"No books decorator found in csv file: {csv_file_path}", to_notify=None)
+
+    def load_from_csv_files(self, books_csv_file_path: str = None, users_csv_file_path: str = None,
+                            progress=None, max_workers: int = None):
+        """
+        Loads the books, their decorators and the users files at once: the files are parsed concurrently in
+        worker processes, then the objects are built here. call after_start afterwards to link them.
+        only the csv storage is parsed in parallel, other storages are loaded one collection after another.
 
+        :param progress: optional callable(message: str, done: int, total: int), called on the calling thread.
+        :param max_workers: int - number of worker processes (one per file by default).
+        """
+        if not isinstance(self.storage, CsvStorageBackend):
+            if users_csv_file_path:
+                self.load_users_from_csv(users_csv_file_path)
+            if books_csv_file_path:
+                self.load_books_from_csv(books_csv_file_path)
+            return
+
+        collections = {}
+        if users_csv_file_path:
+            collections["users"] = (users_csv_file_path, self.user_headers_mapping, "User")
+        if books_csv_file_path:
+            collections["books"] = (books_csv_file_path, self.book_headers_mapping, "Book")
+            decorators_path = self.decorators_file_path(books_csv_file_path)
+            if self.storage.collection_exists(decorators_path, self.book_deco_headers_mapping):
+                collections["book decorators"] = (decorators_path, self.book_deco_headers_mapping, "book_decorator")
+        # parsing the files + building each collection
+        total = len(collections) * 2
+        def parsed_progress(message: str, done: int, _total: int):
+            if progress:
+                progress(message, done, total)
+
+        rows = parallel_loader.parse_collections(collections, progress=parsed_progress, max_workers=max_workers)
+        done = len(collections)
+        # decorators wrap the loaded books, so they're built last
+        for name, set_loaded in [("users", self._set_loaded_users), ("books", self._set_loaded_books),
+                                 ("book decorators", self._set_loaded_decorators)]:
+            if name not in collections:
+                continue
+            csv_file_path, headers_mapping, obj_type = collections[name]
+            set_loaded(csv_manager.objs_dict_from_rows(rows[name], headers_mapping, obj_type), csv_file_path)
+            done += 1
+            if progress:
+                progress(f"Built {name}", done, total)
 
     def after_start(self):
         if self.users_csv_file_path is None:
-            self.users_csv_file_path = csv_manager.create_empty_files(self.books_csv_file_path,
-                                                                      self.user_headers_mapping.values(), "_users")
+            self.users_csv_file_path = self.storage.create_empty_collection(self.books_csv_file_path,
+                                                                            self.user_headers_mapping, "_users")
             self.log_notify_print(to_log=f"Created new users csv file: {self.users_csv_file_path}",
                                   to_print=f"Created new users csv file: {self.users_csv_file_path}",to_notify=None)
 
         if self.books_csv_file_path is None:
-            self.books_csv_file_path = csv_manager.create_empty_files(self.users_csv_file_path,
-                                                                      self.book_headers_mapping.values(), "_books")
+            self.books_csv_file_path = self.storage.create_empty_collection(self.users_csv_file_path,
+                                                                            self.book_headers_mapping, "_books")
             self.log_notify_print(to_log=f"Created new books csv file: {self.users_csv_file_path}",
                                   to_print=f"Created new books csv file: {self.users_csv_file_path}", to_notify=None)
 
         if self.book_decorators_file_path is None:
-            self.book_decorators_file_path = csv_manager.create_empty_files(self.books_csv_file_path,
-                                                                            self.book_deco_headers_mapping.values(), "_book_decorators")
+            self.book_decorators_file_path = self.storage.create_empty_collection(self.books_csv_file_path,
+                                                                                  self.book_deco_headers_mapping, "_book_decorators")
             self.log_notify_print(to_log=f"Created new books decorators csv file: {self.users_csv_file_path}",
                                   to_print=f"Created new books decorators csv file: {self.users_csv_file_path}", to_notify=None)
 
         csv_manager.connect_books_and_users(self.users, self.books)
 
 
+    def use_sqlite_storage(self, db_path: str):
+        """
+        Switches the persistence to a local SQLite database. collections that are empty in the database
+        are imported from their csv files the first time they're loaded.
+        """
+        from manage_files.sqlite_manager import SqliteStorageBackend
+        self.flush()
+        self.storage.close()
+        self.storage = SqliteStorageBackend(db_path)
+        if self.write_behind is not None:
+            self.write_behind.storage = self.storage
+        self.log_notify_print(to_log=f"Using sqlite storage: {db_path}",
+                              to_print=f"Using sqlite storage: {db_path}", to_notify=None)
+
+    def enable_write_behind(self, flush_interval: float = 1.0, max_pending: int = 100):
+        """
+        Switches the csv updates to write-behind mode: lend/return/add only mark the objects dirty and a
+        background thread writes them in batches every 'flush_interval' seconds or every 'max_pending' objects.
+        at most 'flush_interval' seconds / 'max_pending' objects of changes can be lost on a crash.
+        """
+        if self.write_behind is not None:
+            self.write_behind.stop()
+        self.write_behind = WriteBehindFlusher(self.storage, flush_interval=flush_interval, max_pending=max_pending)
+        atexit.register(self.shutdown)
+        self.log_notify_print(to_log=f"Enabled write-behind persistence (interval: {flush_interval}s, max pending: {max_pending}).",
+                              to_print=f"Enabled write-behind persistence.", to_notify=None)
+
+    def flush(self):
+        """
+        Writes all the pending write-behind changes now.
+        """
+        if self.write_behind is not None:
+            self.write_behind.flush()
+
+    def shutdown(self):
+        """
+        Stops the write-behind flusher after writing everything still pending.
+        """
+        if self.write_behind is not None:
+            self.write_behind.stop()
+            self.write_behind = None
+            atexit.unregister(self.shutdown)
+
+    def compact_journals(self):
+        """
+        Folds the journals of the users, books and decorators collections into their csv snapshots.
+        """
+        self.flush()
+        for csv_file_path, headers_mapping in [(self.users_csv_file_path, self.user_headers_mapping),
+                                               (self.books_csv_file_path, self.book_headers_mapping),
+                                               (self.book_decorators_file_path, self.book_deco_headers_mapping)]:
+            if self.write_behind is not None:
+                with self.write_behind.exclusive():
+                    self.storage.compact(csv_file_path, headers_mapping)
+            else:
+                self.storage.compact(csv_file_path, headers_mapping)
+        self.log_notify_print(to_log="Compacted csv journals - successfully.",
+                              to_print="Compacted csv journals.", to_notify=None)
+
+    def save_snapshot(self, snapshot_path: str = None) -> str:
+        """
+        Saves the whole library (books, users, decorators, followers and loans) to a binary snapshot.
+
+        :param snapshot_path: str - defaults to the books csv path with a '.snapshot' suffix.
+        :return: str - path of the written snapshot.
+        """
+        if snapshot_path is None:
+            snapshot_path = self.books_csv_file_path + snapshot_manager.SNAPSHOT_SUFFIX
+        snapshot_manager.save_snapshot(snapshot_path, self.users, self.books, self.decorated_books,
+                                       {"users": self.users_csv_file_path, "books": self.books_csv_file_path,
+                                        "book_decorators": self.book_decorators_file_path})
+        self.log_notify_print(to_log=f"Saved library snapshot ({len(self.books)} books, {len(self.users) - 1} users) - to: {snapshot_path} - successfully.",
+                              to_print=f"Saved library snapshot to: {snapshot_path}", to_notify=None)
+        return snapshot_path
+
+    def load_snapshot(self, snapshot_path: str):
+        """
+        Loads the library from a binary snapshot instead of the csv files (replaces after_start).
+        the csv paths saved in the snapshot are restored, so later updates go to the same files.
+        """
+        loaded = snapshot_manager.load_snapshot(snapshot_path, self.lost_books_user)
+        self.books = loaded["books"]
+        self.rebuild_indexes()
+        self.users = loaded["users"]
+        self._index_usernames()
+        self.decorated_books = loaded["decorated_books"]
+        self.reindex_descriptions()
+        self.users_csv_file_path = loaded["csv_paths"]["users"]
+        self.books_csv_file_path = loaded["csv_paths"]["books"]
+        self.book_decorators_file_path = loaded["csv_paths"]["book_decorators"]
+        self.librarian_observers = []
+        for user in self.users.values():
+            if user.role == "librarian":
+                self.attach(user)
+        self.log_notify_print(to_log=f"Loaded library snapshot ({len(self.books)} books, {len(self.users) - 1} users) - from: {snapshot_path} - successfully.",
+                              to_print=f"Loaded library snapshot from: {snapshot_path}", to_notify=None)
+
+
 #----------------other methods----------------------
     def log_notify_print(self, to_log : str or None, to_notify: tuple[Subject, str] or None, to_print: str or None):
         if to_log:
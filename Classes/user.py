@@ -2,11 +2,12 @@
 
 from typing import List, Any
 from werkzeug.security import generate_password_hash, check_password_hash
-import ast
 
 from design_patterns.exceptions import BookNotFoundException
 from design_patterns.observer import Observer, Subject
 from Classes.book import Book
+from Classes.id_allocator import IdAllocator
+from manage_files.csv_manager import decode_id_list
 from design_patterns.function_decorator import permission_required
 
 # Default permissions
@@ -16,16 +17,20 @@ LIBRARIAN_DEFAULT_PERMISSIONS = ["borrow", "return", "manage_books"]
 
 class User(Observer, Subject):
     user_id = 0
-    users_ids = [0]
-    def __init__(self, username: str, password: str, permissions: List[str] = None):
+    users_ids = IdAllocator(reserved=[0])
+    def __init__(self, username: str, password: str = None, permissions: List[str] = None, password_hash: str = None):
         """
         :param username: str - The username of the user.
         :param password: str - The plain-text password for the user. It will be hashed internally.
         :param permissions: List[str] - List of permissions. Defaults to USER_DEFAULT_PERMISSIONS if not provided.
+        :param password_hash: str - An already hashed password (loaded users), used as is without hashing.
         """
         self._id = User.user_id
         self.username = username
-        self.__passwordHash = self.set_password(password)
+        if password_hash is not None:
+            self.__passwordHash = password_hash
+        else:
+            self.__passwordHash = self.set_password(password)
         self.__permissions = permissions or USER_DEFAULT_PERMISSIONS
         self._borrowedBooks: List[Book] = []
         self.__temp_borrowedBooks: List[int] = []
@@ -118,9 +123,7 @@ class User(Observer, Subject):
         :param permissions: List[str] - Optional permissions list.
         :return: User instance.
         """
-        while User.user_id in User.users_ids:
-            User.user_id += 1
-        User.users_ids.append(User.user_id)
+        User.user_id = User.users_ids.allocate()
         return User(username, password, permissions)
 
     @staticmethod
@@ -137,13 +140,17 @@ class User(Observer, Subject):
         :param prev_borrowed: List[int] - List of previously borrowed book IDs.
         :return: User instance.
         """
-        new_user = User(username=username, password=passwordHash, permissions=permissions)
+        # the password is already hashed, so no key derivation runs here
+        new_user = User(username=username, permissions=permissions, password_hash=passwordHash)
+        return User._set_loaded_fields(new_user, prev_id, temp_books, prev_borrowed)
+
+    @staticmethod
+    def _set_loaded_fields(new_user: 'User', prev_id: int, temp_books: List[int] = None,
+                           prev_borrowed: List[int] = None) -> 'User':
         new_user.id = prev_id
-        User.users_ids.append(new_user.id)
+        User.users_ids.reserve(new_user.id)
         new_user.temp_borrowedBooks = temp_books or []
         new_user.previously_borrowed_books = prev_borrowed or []
-        # Directly set the password hash since it's already hashed
-        new_user._User__passwordHash = passwordHash
         return new_user
 
 
@@ -247,8 +254,8 @@ class User(Observer, Subject):
                 username=str(json["username"]),
                 passwordHash=str(json["passwordHash"]),  # Assuming this is already hashed
                 prev_id=int(json["id"]),
-                temp_books=ast.literal_eval(json["borrowed_books"]),
-                prev_borrowed=ast.literal_eval(json["previously_borrowed_books"])
+                temp_books=decode_id_list(json["borrowed_books"]),
+                prev_borrowed=decode_id_list(json["previously_borrowed_books"])
             )
         elif json["role"] == "librarian":
             return Librarian.from_json_librarian(json)
@@ -284,23 +291,32 @@ class Librarian(User):
     A special kind of User with additional default permissions: "manage_books".
     """
 
-    def __init__(self, username: str, passwordHash: str, permissions: List[str] = None):
+    def __init__(self, username: str, passwordHash: str = None, permissions: List[str] = None, password_hash: str = None):
         super().__init__(
             username,
             passwordHash,
-            permissions or LIBRARIAN_DEFAULT_PERMISSIONS
+            permissions or LIBRARIAN_DEFAULT_PERMISSIONS,
+            password_hash=password_hash
         )
         self.role = "librarian"
 
     @staticmethod
     def create_librarian(username: str, passwordHash: str, permissions: List[str] = None):
-        while User.user_id in User.users_ids:
-            User.user_id += 1
-        User.users_ids.append(User.user_id)
+        User.user_id = User.users_ids.allocate()
         return Librarian(username= username,passwordHash= passwordHash,
                          permissions= permissions or LIBRARIAN_DEFAULT_PERMISSIONS)
 
 
+    @staticmethod
+    def loaded_librarian(username: str, passwordHash: str, prev_id: int, permissions: List[str] = None,
+                         temp_books: List[int] = None, prev_borrowed: List[int] = None) -> 'Librarian':
+        """
+        Loads a librarian from stored data with an existing hashed password (no key derivation).
+        """
+        new_librarian = Librarian(username=username, permissions=permissions, password_hash=passwordHash)
+        return User._set_loaded_fields(new_librarian, prev_id, temp_books, prev_borrowed)
+
+
     #------------- json methods --------------------
 
     def to_json(self) -> dict:
@@ -313,8 +329,7 @@ class Librarian(User):
 
     @staticmethod
     def from_json_librarian(json : dict[str, Any]):
-        basic_user = User.loaded_user(username=str(json["username"]), passwordHash=str(json["passwordHash"]),
-                                      prev_id=int(json["id"]), temp_books=ast.literal_eval(json["borrowed_books"]), prev_borrowed = ast.literal_eval(json["previously_borrowed_books"]))
-        basic_user.permissions = LIBRARIAN_DEFAULT_PERMISSIONS
-        basic_user.role = "librarian"
-        return basic_user
+        return Librarian.loaded_librarian(username=str(json["username"]), passwordHash=str(json["passwordHash"]),
+                                          prev_id=int(json["id"]), permissions=LIBRARIAN_DEFAULT_PERMISSIONS,
+                                          temp_books=decode_id_list(json["borrowed_books"]),
+                                          prev_borrowed=decode_id_list(json["previously_borrowed_books"]))
@@ -36,18 +36,19 @@ class EntryGUI:
         )
         self.start_button.pack(pady=5)
 
+        # loading progress, filled while start_system loads the chosen files
+        self.progress_label = tk.Label(self.master, text="")
+        self.progress_label.pack(pady=5)
+
     def load_books_csv(self):
         path = filedialog.askopenfilename(
             title="Select Books CSV",
             filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
         )
         if path:
+            # the files are loaded together (in parallel) when the system starts
             self.books_csv_path = path
-            try:
-                self.library.load_books_from_csv(path)
-                messagebox.showinfo("Success", f"Loaded books from {path}")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to load books: {e}")
+            self.progress_label.config(text=f"Books file: {path}")
 
     def load_users_csv(self):
         path = filedialog.askopenfilename(
@@ -56,14 +57,25 @@ class EntryGUI:
         )
         if path:
             self.users_csv_path = path
-            try:
-                # You need to implement this method in the Library class if not present
-                self.library.load_users_from_csv(path)
-                messagebox.showinfo("Success", f"Loaded users from {path}")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to load users: {e}")
+            self.progress_label.config(text=f"Users file: {path}")
+
+    def show_progress(self, message: str, done: int, total: int):
+        self.progress_label.config(text=f"{message} ({done}/{total})")
+        self.master.update_idletasks()
 
     def start_system(self):
+        if self.books_csv_path or self.users_csv_path:
+            self.start_button.config(state=tk.DISABLED)
+            try:
+                self.library.load_from_csv_files(self.books_csv_path, self.users_csv_path, progress=self.show_progress)
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to load library files: {e}")
+                return
+            finally:
+                self.start_button.config(state=tk.NORMAL)
+            loaded = [path for path in (self.books_csv_path, self.users_csv_path) if path]
+            messagebox.showinfo("Success", f"Loaded {', '.join(loaded)}")
+        self.show_progress("Connecting books and users", 1, 1)
         self.library.after_start()
         # If data has been loaded or not, we proceed
         messagebox.showinfo("Info", "Starting Library System.")
@@ -7,8 +7,15 @@ from Classes.user import User, Librarian
 from Classes.book import Book
 from design_patterns.decorator import DescriptionDecorator, CoverDecorator
 from design_patterns.logger import Logger
-from design_patterns.strategy import SearchByTitle, SearchByAuthor, SearchByCategory
-from design_patterns.exceptions import PermissionDeniedException, BookNotFoundException
+from design_patterns.strategy import (TrigramSearchByTitle, TrigramSearchByAuthor, TrigramSearchAllFields, FuzzySearchTitleOrAuthor,
+                                      SearchByAuthorPhonetic)
+from design_patterns.exceptions import PermissionDeniedException, BookNotFoundException, QuerySyntaxError
+from indexes.bitmap_index import count_bits
+from indexes.query_planner import is_structured_query
+
+# autocomplete: typing pause before the completions are looked up, and completions shown
+SUGGEST_DELAY_MS = 150
+SUGGESTIONS_COUNT = 8
 
 
 class LibraryGUI:
@@ -17,7 +24,7 @@ class LibraryGUI:
       1) A Filter combobox next to the search bar, offering:
          - All Books
          - By Genre (displays a second genre combobox)
-         - Popular Books  (placeholder: self.library.getPopularBooks())
+         - Popular Books  (self.library.getPopularBooks(), the 10 most borrowed)
          - My Books       (books the user borrowed)
          - Available Books (copies > 0)
          - Not Available Books (copies == 0)
@@ -44,9 +51,14 @@ class LibraryGUI:
         self.filter_combobox = None
         self.genre_label = None
         self.genre_combobox = None
+        # autocomplete dropdown of the search entry, filled after a short typing pause
+        self.suggestions_listbox = None
+        self._suggest_job = None
 
         # Book list, details
         self.book_listbox = None
+        # id of the book shown in each row of book_listbox (titles aren't unique)
+        self.book_row_ids = []
         self.details_label = None
         self.cover_image_label = None
 
@@ -126,6 +138,16 @@ class LibraryGUI:
         tk.Label(search_frame, text="Search:").pack(side=tk.LEFT, padx=5)
         self.search_entry = tk.Entry(search_frame, width=20)
         self.search_entry.pack(side=tk.LEFT, padx=5)
+        self.search_entry.bind("<KeyRelease>", self.on_search_key)
+        self.search_entry.bind("<Down>", self.focus_suggestions)
+        self.search_entry.bind("<Escape>", lambda event: self.hide_suggestions())
+        self.search_entry.bind("<Return>", lambda event: self.choose_suggestion(None))
+
+        # the dropdown is placed under the entry only while it has completions
+        self.suggestions_listbox = tk.Listbox(self.root, height=SUGGESTIONS_COUNT, exportselection=False)
+        self.suggestions_listbox.bind("<ButtonRelease-1>", self.choose_suggestion)
+        self.suggestions_listbox.bind("<Return>", self.choose_suggestion)
+        self.suggestions_listbox.bind("<Escape>", lambda event: self.hide_suggestions())
 
         # Filter combobox
         filter_options = [
@@ -274,7 +296,7 @@ class LibraryGUI:
             self.genre_combobox.pack_forget()
 
     def update_genre_combobox(self):
-        categories = sorted({b.category for b in self.library.books.values()})
+        categories = sorted(self.library.getCategories())
         self.genre_combobox.config(values=categories, state="readonly")
         if categories:
             self.genre_combobox.set(categories[0])
@@ -288,8 +310,10 @@ class LibraryGUI:
     def populate_book_list(self):
         """Populate the book list with all library books initially."""
         self.book_listbox.delete(0, tk.END)
+        self.book_row_ids = []
         for i, book in enumerate(self.library.books.values()):
             self.book_listbox.insert(tk.END, book.title)
+            self.book_row_ids.append(book.id)
             if self.current_user and book in getattr(
                 self.current_user, "borrowedBooks", []
             ):
@@ -301,27 +325,102 @@ class LibraryGUI:
             for note in self.current_user.notifications:
                 self.notifications_text.insert(tk.END, note + "\n")
 
+    # ----------------- Autocomplete ----------------- #
+    def on_search_key(self, event):
+        """Debounce: the completions are looked up once the user pauses typing."""
+        if event.keysym in ("Down", "Up", "Escape", "Return"):
+            return
+        if self._suggest_job is not None:
+            self.root.after_cancel(self._suggest_job)
+        self._suggest_job = self.root.after(SUGGEST_DELAY_MS, self.show_suggestions)
+
+    def show_suggestions(self):
+        self._suggest_job = None
+        completions = self.library.suggest(self.search_entry.get(), SUGGESTIONS_COUNT)
+        if not completions:
+            self.hide_suggestions()
+            return
+        self.suggestions_listbox.delete(0, tk.END)
+        for completion in completions:
+            self.suggestions_listbox.insert(tk.END, completion)
+        self.suggestions_listbox.config(height=len(completions))
+        self.suggestions_listbox.place(in_=self.search_entry, relx=0, rely=1, relwidth=1.5)
+        self.suggestions_listbox.lift()
+
+    def hide_suggestions(self):
+        if self._suggest_job is not None:
+            self.root.after_cancel(self._suggest_job)
+            self._suggest_job = None
+        self.suggestions_listbox.place_forget()
+
+    def focus_suggestions(self, event):
+        if self.suggestions_listbox.winfo_ismapped():
+            self.suggestions_listbox.focus_set()
+            self.suggestions_listbox.selection_clear(0, tk.END)
+            self.suggestions_listbox.selection_set(0)
+            self.suggestions_listbox.activate(0)
+
+    def choose_suggestion(self, event):
+        """Puts the chosen completion (if any) in the search entry and runs the search."""
+        selection = self.suggestions_listbox.curselection() if event is not None else ()
+        if selection:
+            self.search_entry.delete(0, tk.END)
+            self.search_entry.insert(0, self.suggestions_listbox.get(selection[0]))
+        self.hide_suggestions()
+        self.search_entry.focus_set()
+        self.perform_search()
+
     # ----------------- Searching / Filtering ----------------- #
+    @property
+    def bitmaps(self):
+        """The library's book bitmaps index, the search results and filters are combined as bitmaps of it."""
+        return self.library.book_indexes["bitmaps"]
+
     def perform_search(self):
         """Combine textual search with the currently chosen filter."""
         criteria = str(self.search_entry.get().strip())
         search_result = ""
-        if criteria and criteria != "":
-            t_res = self.library.searchBooks(criteria, SearchByTitle())
-            a_res = self.library.searchBooks(criteria, SearchByAuthor())
-            c_res = self.library.searchBooks(criteria, SearchByCategory())
-            initial_set = set(t_res + a_res + c_res)
+        if is_structured_query(criteria):
+            # structured query (e.g. 'author:orwell year:1940..1960 available'), planned over the library's indexes
+            try:
+                initial_bitmap = self.bitmaps.bitmap_of(self.library.query(criteria))
+            except QuerySyntaxError as e:
+                messagebox.showerror("Error", str(e))
+                return
+            found = count_bits(initial_bitmap)
+            search_result = f"Query '{criteria}' found ({found}) books - {'successfully' if found > 0 else 'failed'}"
+        elif criteria and criteria != "":
+            # one index probe for the three fields, with the matches of each field for the log
+            strategy = TrigramSearchAllFields()
+            initial_bitmap = self.bitmaps.bitmap_of(self.library.searchBooks(criteria, strategy))
+            counts = strategy.field_counts
             search_result = (
-                f"Search by criteria '{criteria}' found ({len(t_res)}) books by title, ({len(a_res)}) books by author, "
-                f"({len(c_res)}) books by category. reformulated - {'successfully' if len(initial_set) > 0 else 'failed'}"
+                f"Search by criteria '{criteria}' found ({counts['title']}) books by title, ({counts['author']}) books by author, "
+                f"({counts['category']}) books by category. reformulated - {'successfully' if initial_bitmap else 'failed'}"
             )
+            if not initial_bitmap:
+                # probably a typo ("Orwel"), retry tolerating a few wrong letters in the title/author words
+                fuzzy = FuzzySearchTitleOrAuthor()
+                initial_bitmap = self.bitmaps.bitmap_of(self.library.searchBooks(criteria, fuzzy))
+                search_result += (
+                    f"\nFuzzy search by criteria '{criteria}' found ({fuzzy.field_counts['title']}) books by title, "
+                    f"({fuzzy.field_counts['author']}) books by author - {'successfully' if initial_bitmap else 'failed'}"
+                )
+            if not initial_bitmap:
+                # an author spelled by ear ("Tolstoi"), retry by the sound of the authors (and descriptions) words
+                initial_bitmap = self.bitmaps.bitmap_of(self.library.searchBooks(criteria, SearchByAuthorPhonetic()))
+                search_result += (
+                    f"\nPhonetic author search by criteria '{criteria}' found ({count_bits(initial_bitmap)}) books "
+                    f"- {'successfully' if initial_bitmap else 'failed'}"
+                )
         else:
-            initial_set = set(self.library.books.values())
+            initial_bitmap = self.bitmaps.all
 
-        filtered, used_filter = self.apply_filter_to_books(initial_set)
+        filtered, used_filter = self.apply_filter_to_books(initial_bitmap)
+        found = count_bits(filtered)
         merged = (
             f"\nBooks display by '{criteria}', combined with filter '{used_filter}' "
-            f" - {'successfully' if len(filtered) > 0 else 'failed'}. Found ({len(filtered)}) matching books."
+            f" - {'successfully' if found > 0 else 'failed'}. Found ({found}) matching books."
         )
         if used_filter not in ["Title", "Author", "Category"]:
             self.library.log_notify_print(
@@ -332,33 +431,35 @@ class LibraryGUI:
                 to_log=merged, to_print=merged, to_notify=None
             )
         else:
-            msg_filter = f"Filtered books by '{used_filter}' - {'successfully' if len(filtered) > 0 else 'failed'}. Found ({len(filtered)}) matching books."
+            msg_filter = f"Filtered books by '{used_filter}' - {'successfully' if found > 0 else 'failed'}. Found ({found}) matching books."
             self.library.log_notify_print(
                 to_log=msg_filter, to_print=msg_filter, to_notify=None
             )
-        self.update_book_list(filtered)
+        # only the final bitmap becomes Book objects
+        self.update_book_list(self.bitmaps.books_of(filtered))
 
     def perform_filter(self):
         """Apply only the chosen filter, ignoring textual search."""
-        initial_set = set(self.library.books.values())
-        filtered, used_filter = self.apply_filter_to_books(initial_set)
-        self.update_book_list(filtered)
-        msg_filter = f"Filtered books by '{used_filter}' - {'successfully' if len(filtered) > 0 else 'failed'}. Found ({len(filtered)}) matching books."
+        filtered, used_filter = self.apply_filter_to_books(self.bitmaps.all)
+        self.update_book_list(self.bitmaps.books_of(filtered))
+        found = count_bits(filtered)
+        msg_filter = f"Filtered books by '{used_filter}' - {'successfully' if found > 0 else 'failed'}. Found ({found}) matching books."
         self.library.log_notify_print(
             to_log=msg_filter, to_print=msg_filter, to_notify=None
         )
 
-    def apply_filter_to_books(self, books_set):
+    def apply_filter_to_books(self, books_bitmap):
         """
-        Applies the selected filter to the provided set of books and returns the filtered set.
+        Applies the selected filter to the provided books and returns the filtered books.
 
         Parameters:
-            books_set (set): A set of Book objects to filter.
+            books_bitmap (int): A bitmap of the books to filter (see indexes/bitmap_index.py).
 
         Returns:
-            set: A filtered set of Book objects based on the selected filter.
+            int: A bitmap of the books matching the selected filter (combined with AND/NOT on the bitmaps).
         """
         chosen_filter = self.filter_combobox.get()
+        bitmaps = self.bitmaps
 
         # Define filter functions
         def filter_all(books):
@@ -367,57 +468,48 @@ class LibraryGUI:
         def filter_by_genre(books):
             selected_genre = self.genre_combobox.get().strip()
             if selected_genre:
-                return {b for b in books_set if b.category == selected_genre}
-            return books_set
+                return bitmaps.categories.get(selected_genre, 0) & books
+            return books
 
         def filter_popular(books):
             try:
-                popular_books = set(self.library.getPopularBooks())
-                return popular_books.intersection(books)
+                return bitmaps.bitmap_of(self.library.getPopularBooks()) & books
             except BookNotFoundException:
-                return set()
+                return 0
 
         def filter_my_books(books):
             if self.current_user:
-                return {
-                    book
-                    for book in books
-                    if book in getattr(self.current_user, "borrowedBooks", [])
-                }
-            return set()
+                return bitmaps.bitmap_of(getattr(self.current_user, "borrowedBooks", [])) & books
+            return 0
 
+        # the index keeps these bitmaps, so they cost a few word operations instead of a pass over the books
         def filter_available(books):
-            return {book for book in books if book.available_copies > 0}
+            return bitmaps.available & books
 
         def filter_not_available(books):
-            return {book for book in books if book.available_copies == 0}
+            return books & ~bitmaps.available
 
         def filter_previously_borrowed(books):
             if self.current_user and hasattr(
                 self.current_user, "previously_borrowed_books"
             ):
-                prev_ids = set(
-                    self.current_user.previously_borrowed_books
-                )  # Convert to set for O(1) lookups
-                return {book for book in books if book.id in prev_ids}
-            return set()
+                return bitmaps.bitmap_of_ids(self.current_user.previously_borrowed_books) & books
+            return 0
 
         def filter_notifications(books):
             if self.current_user:
-                return {
-                    book for book in books if self.current_user in book.user_observers
-                }
-            return set()
+                return bitmaps.bitmap_of(
+                    book for book in bitmaps.books_of(books) if self.current_user in book.user_observers
+                )
+            return 0
 
         def filter_title(books):
             criteria = str(self.search_entry.get().strip())
-            t_res = self.library.searchBooks(criteria, SearchByTitle())
-            return set(t_res)
+            return bitmaps.bitmap_of(self.library.searchBooks(criteria, TrigramSearchByTitle()))
 
         def filter_author(books):
             criteria = str(self.search_entry.get().strip())
-            a_res = self.library.searchBooks(criteria, SearchByAuthor())
-            return set(a_res)
+            return bitmaps.bitmap_of(self.library.searchBooks(criteria, TrigramSearchByAuthor()))
 
         # Mapping of filter names to their corresponding functions
         filter_functions = {
@@ -437,13 +529,11 @@ class LibraryGUI:
         filter_func = filter_functions.get(chosen_filter, filter_all)
 
         # Apply the filter function and return the result
-        filtered_books = set(filter_func(books_set))
-        return filtered_books, chosen_filter
+        return filter_func(books_bitmap), chosen_filter
 
     def update_book_list(self, books_collection):
         self.book_listbox.delete(0, tk.END)
-        # Sort by title
-        self.book_listbox.delete(0, tk.END)
+        self.book_row_ids = []
 
         # Validate that all items in books_collection are Book instances
         valid_books = set()
@@ -465,9 +555,11 @@ class LibraryGUI:
             self.details_label.config(text="No books to display.")
             return
         try:
+            # Sort by title
             sorted_books = sorted(valid_books, key=lambda bk: str(bk.title).lower())
             for i, book in enumerate(sorted_books):
                 self.book_listbox.insert(tk.END, book.title)
+                self.book_row_ids.append(book.id)
                 if self.current_user and book in getattr(
                     self.current_user, "borrowedBooks", []
                 ):
@@ -476,6 +568,12 @@ class LibraryGUI:
             print(f"Error sorting books: {e}")
 
     # ----------------- Book Selection ----------------- #
+    def book_at_row(self, row: int) -> Optional[Book]:
+        """Returns the book shown in 'row' of the book list (None if it was removed meanwhile)."""
+        if 0 <= row < len(self.book_row_ids):
+            return self.library.books.get(self.book_row_ids[row])
+        return None
+
     def on_book_select(self, event):
         from manage_files.csv_manager import format_json_dict
 
@@ -486,9 +584,7 @@ class LibraryGUI:
             self.cover_image_label.destroy()
         if not selection:
             return
-        idx = selection[0]
-        btitle = event.widget.get(idx)
-        book = next((b for b in self.library.books.values() if b.title == btitle), None)
+        book = self.book_at_row(selection[0])
         if not book:
             return
         if book.id in self.library.decorated_books:
@@ -669,7 +765,9 @@ class LibraryGUI:
         remove_win.title("Remove Book")
 
         tk.Label(remove_win, text="Select Book to Remove:").pack(padx=5, pady=5)
-        book_titles = [b.title for b in self.library.books.values()]
+        # the ids in the order of the titles, so a shared title still removes the chosen book
+        book_ids = list(self.library.books.keys())
+        book_titles = [self.library.books[book_id].title for book_id in book_ids]
         if not book_titles:
             messagebox.showinfo("Info", "No books in the library.")
             remove_win.destroy()
@@ -682,17 +780,14 @@ class LibraryGUI:
         combo.pack(padx=5, pady=5)
 
         def confirm_remove():
-            title = sel_var.get()
-            book = next(
-                (b for b in self.library.books.values() if b.title == title), None
-            )
+            book = self.library.books.get(book_ids[combo.current()]) if combo.current() >= 0 else None
             if not book:
                 messagebox.showerror("Error", "Book not found.")
                 return
             try:
                 self.library.removeBook(book, self.current_user)
-                self.logger.log(f"{self.current_user.username} removed '{title}'.")
-                messagebox.showinfo("Success", f"Book '{title}' removed.")
+                self.logger.log(f"{self.current_user.username} removed '{book.title}'.")
+                messagebox.showinfo("Success", f"Book '{book.title}' removed.")
                 # Refresh filter or default list
                 self.perform_search()
                 remove_win.destroy()
@@ -716,7 +811,7 @@ class LibraryGUI:
 
         idx = sel[0]
         btitle = self.book_listbox.get(idx)
-        book = next((b for b in self.library.books.values() if b.title == btitle), None)
+        book = self.book_at_row(idx)
         if book:
             success = self.library.lendBook(self.current_user, book)
             if success:
@@ -744,7 +839,7 @@ class LibraryGUI:
 
         idx = sel[0]
         btitle = self.book_listbox.get(idx)
-        book = next((b for b in self.library.books.values() if b.title == btitle), None)
+        book = self.book_at_row(idx)
 
         if book:
             try:
@@ -770,7 +865,7 @@ class LibraryGUI:
             return
         idx = sel[0]
         btitle = self.book_listbox.get(idx)
-        book = next((b for b in self.library.books.values() if b.title == btitle), None)
+        book = self.book_at_row(idx)
         if book:
             if self.current_user in book.user_observers:
                 messagebox.showinfo(
@@ -794,7 +889,7 @@ class LibraryGUI:
             return
         idx = sel[0]
         btitle = self.book_listbox.get(idx)
-        book = next((b for b in self.library.books.values() if b.title == btitle), None)
+        book = self.book_at_row(idx)
         if book:
             if self.current_user in book.user_observers:
                 book.detach(self.current_user)
@@ -842,7 +937,7 @@ class LibraryGUI:
 
         idx = sel[0]
         btitle = self.book_listbox.get(idx)
-        book = next((b for b in self.library.books.values() if b.title == btitle), None)
+        book = self.book_at_row(idx)
         if not book:
             messagebox.showerror("Error", "Book not found.")
             return
@@ -68,10 +68,8 @@ class LoginGUI:
         username = self.username_entry.get().strip()
         password = self.password_entry.get().strip()
 
-        # Find a user with the given username
-        user = next(
-            (u for u in self.library.users.values() if u.username == username), None
-        )
+        # Find a user with the given username (username index, case-insensitive)
+        user = self.library.getUserByUsername(username)
 
         if user and user.verify_password(password):
             self.open_main_screen(user)
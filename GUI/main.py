@@ -5,6 +5,8 @@ def main():
     root = tk.Tk()
     app = EntryGUI(root)
     root.mainloop()
+    # write whatever the write-behind flusher still holds
+    app.library.shutdown()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,66 @@
+"""
+Fuzzy search benchmark: the deletion-neighbourhood index vs comparing the misspelled word with every distinct
+title/author word, on a generated catalog with a large vocabulary.
+
+usage (from the project root):
+    python -m benchmarks.bench_fuzzy --books 1000000
+"""
+import argparse
+import random
+import string
+import time
+
+from Classes.book import Book
+from indexes.fuzzy_index import FuzzyIndex, allowed_distance, edit_distance
+
+
+def generate_books(books_count: int, vocabulary_size: int):
+    rng = random.Random(11)
+    vocabulary = list({"".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 10)))
+                       for _ in range(vocabulary_size)})
+    books = []
+    for book_id in range(1, books_count + 1):
+        title = " ".join(rng.choice(vocabulary) for _ in range(3))
+        author = " ".join(rng.choice(vocabulary) for _ in range(2))
+        books.append(Book.loaded_book(title, author, 2000, "Fiction", 1, book_id, [], 0, [], False))
+    return books, vocabulary
+
+
+def misspell(word: str, rng: random.Random) -> str:
+    position = rng.randrange(1, len(word))
+    # swap two letters (two edits) or drop one
+    if rng.random() < 0.5 and position < len(word) - 1:
+        return word[:position] + word[position + 1] + word[position] + word[position + 2:]
+    return word[:position] + word[position + 1:]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the fuzzy search index.")
+    parser.add_argument("--books", type=int, default=200000, help="number of generated books")
+    parser.add_argument("--vocabulary", type=int, default=50000, help="distinct words in the titles/authors")
+    parser.add_argument("--queries", type=int, default=50, help="misspelled queries")
+    args = parser.parse_args()
+
+    books, vocabulary = generate_books(args.books, args.vocabulary)
+    start = time.perf_counter()
+    index = FuzzyIndex()
+    index.rebuild(books)
+    print(f"books: {len(books)}, words: {len(index.words)}, fuzzy index built in {time.perf_counter() - start:.2f}s")
+
+    rng = random.Random(5)
+    queries = [misspell(rng.choice(vocabulary), rng) for _ in range(args.queries)]
+    start = time.perf_counter()
+    for query in queries:
+        index.lookup("author", query)
+    print(f"{'fuzzy index':<22} {(time.perf_counter() - start) / len(queries) * 1e3:>10.2f} ms/query")
+
+    # the alternative: the distance of the query to every distinct word
+    start = time.perf_counter()
+    for query in queries[:5]:
+        max_distance = allowed_distance(query)
+        [word for word in index.words.words if edit_distance(query, word, max_distance) <= max_distance]
+    print(f"{'compare every word':<22} {(time.perf_counter() - start) / 5 * 1e3:>10.2f} ms/query")
+
+
+if __name__ == "__main__":
+    main()
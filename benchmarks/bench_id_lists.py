@@ -0,0 +1,44 @@
+"""
+Benchmark: decoding id list csv cells with ast.literal_eval vs csv_manager.decode_id_list.
+
+usage (from the project root):
+    python -m benchmarks.bench_id_lists --rows 20000 --ids 50
+"""
+import argparse
+import ast
+import random
+import time
+
+from manage_files.csv_manager import decode_id_list, encode_id_list
+
+
+def time_decode(func, cells) -> float:
+    start = time.perf_counter()
+    for cell in cells:
+        func(cell)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark decoding id list cells.")
+    parser.add_argument("--rows", type=int, default=20000, help="number of cells")
+    parser.add_argument("--ids", type=int, default=50, help="ids per cell (e.g. a user's borrow history)")
+    args = parser.parse_args()
+
+    id_lists = [[random.randrange(1_000_000) for _ in range(args.ids)] for _ in range(args.rows)]
+    legacy_cells = [str(ids) for ids in id_lists]
+    compact_cells = [encode_id_list(ids) for ids in id_lists]
+
+    literal_eval_seconds = time_decode(ast.literal_eval, legacy_cells)
+    legacy_seconds = time_decode(decode_id_list, legacy_cells)
+    compact_seconds = time_decode(decode_id_list, compact_cells)
+
+    print(f"cells: {args.rows} x {args.ids} ids")
+    print(f"ast.literal_eval on legacy cells: {literal_eval_seconds:.3f}s")
+    print(f"decode_id_list on legacy cells:   {legacy_seconds:.3f}s")
+    print(f"decode_id_list on compact cells:  {compact_seconds:.3f}s")
+    print(f"speedup (compact vs literal_eval): x{literal_eval_seconds / max(compact_seconds, 1e-9):.1f}")
+
+
+if __name__ == "__main__":
+    main()
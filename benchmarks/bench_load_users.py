@@ -0,0 +1,66 @@
+"""
+Startup benchmark: loading users from csv with and without re-hashing the stored passwords.
+
+usage (from the project root):
+    python -m benchmarks.bench_load_users --users 200
+"""
+import argparse
+import csv
+import os
+import tempfile
+import time
+
+from werkzeug.security import generate_password_hash
+
+from Classes.user import User
+from manage_files import csv_manager
+
+
+def write_users_csv(csv_file_path: str, users_count: int):
+    # one real hash for everyone, hashing every row here would take as long as the legacy load
+    password_hash = generate_password_hash("password")
+    with open(csv_file_path, 'w', encoding='utf-8', newline='') as outfile:
+        writer = csv.DictWriter(outfile, fieldnames=csv_manager.user_headers_mapping.values())
+        writer.writeheader()
+        for user_id in range(1, users_count + 1):
+            role = "librarian" if user_id % 50 == 0 else "regular user"
+            writer.writerow({"user_id": user_id, "username": f"user_{user_id}", "password": password_hash,
+                             "role": role, "borrowed_books": "[]", "previously_borrowed_books": "[]"})
+
+
+def legacy_load(csv_file_path: str) -> int:
+    """The previous load path: every user ran the password hashing before the hash was overwritten."""
+    count = 0
+    with open(csv_file_path, 'r', encoding='utf-8', newline='') as infile:
+        for row in csv.DictReader(infile):
+            user = User(row["username"], row["password"])
+            user._User__passwordHash = row["password"]
+            count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark loading users from csv.")
+    parser.add_argument("--users", type=int, default=200, help="number of users in the generated csv")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        csv_file_path = os.path.join(temp_dir, "users.csv")
+        write_users_csv(csv_file_path, args.users)
+
+        start = time.perf_counter()
+        legacy_load(csv_file_path)
+        legacy_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        users = csv_manager.load_objs_dict_from_csv(csv_file_path, csv_manager.user_headers_mapping, "User")
+        load_seconds = time.perf_counter() - start
+
+    print(f"users: {len(users)}")
+    print(f"with re-hashing (legacy): {legacy_seconds:.3f}s")
+    print(f"from stored hashes:       {load_seconds:.3f}s")
+    print(f"speedup: x{legacy_seconds / max(load_seconds, 1e-9):.0f}")
+
+
+if __name__ == "__main__":
+    main()
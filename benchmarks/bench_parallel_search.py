@@ -0,0 +1,52 @@
+"""
+Parallel search benchmark: a scanning strategy serially vs ParallelSearchStrategy with 1, 2, 4... workers.
+the books are the library's catalog and searched with books=None, so the shards are loaded once before timing
+(they're kept by the workers while the catalog version doesn't change), every query is checked to return the serial
+results. a list passed to the strategy would be sent to the workers again on every search.
+the speedup is bounded by the machine's cores (os.cpu_count() is printed).
+
+usage (from the project root):
+    python -m benchmarks.bench_parallel_search --books 500000 --workers 1 2 4 8
+"""
+import argparse
+import os
+import time
+
+from benchmarks.bench_search import generate_books, time_queries
+from Classes.library import Library
+from design_patterns.strategy import ParallelSearchStrategy, SearchByAllFields
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the parallel search strategy.")
+    parser.add_argument("--books", type=int, default=500000, help="number of generated books")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="worker counts to time")
+    parser.add_argument("--repeat", type=int, default=3, help="repetitions of every query")
+    args = parser.parse_args()
+
+    books = generate_books(args.books)
+    # only the parallel strategy searches the catalog here, so the library's indexes aren't built
+    Library.getInstance().books = {book.id: book for book in books}
+    queries = ["shadow", "Author 7", f"{args.books // 2}", "fiction"]
+    serial = SearchByAllFields()
+    expected = {query: serial.search(books, query)[0] for query in queries}
+    serial_seconds = time_queries(serial, books, queries, args.repeat)
+    print(f"books: {len(books)}, cpus: {os.cpu_count()}")
+    print(f"{'serial':<12} {serial_seconds * 1e3:>10.1f} ms/query")
+
+    for workers in args.workers:
+        parallel = ParallelSearchStrategy(SearchByAllFields(), workers=workers, min_books=0)
+        try:
+            start = time.perf_counter()
+            for query in queries:
+                assert parallel.search(None, query)[0] == expected[query], f"different results for '{query}'"
+            load_seconds = time.perf_counter() - start
+            seconds = time_queries(parallel, None, queries, args.repeat)
+        finally:
+            parallel.close()
+        print(f"{f'{workers} worker(s)':<12} {seconds * 1e3:>10.1f} ms/query  x{serial_seconds / seconds:.2f}"
+              f"  (start + shards + first queries {load_seconds:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
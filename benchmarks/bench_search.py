@@ -0,0 +1,85 @@
+"""
+Search benchmark: the scanning strategies vs the index-backed ones on a generated catalog.
+the queries are substrings (mid-word for the trigram index), the token index matches whole words only.
+
+usage (from the project root):
+    python -m benchmarks.bench_search --books 200000
+"""
+import argparse
+import random
+import time
+
+from Classes.book import Book
+from design_patterns.strategy import (SearchByTitle, SearchByAuthor, IndexedSearchByTitle, IndexedSearchByAuthor,
+                                      TrigramSearchByTitle, TrigramSearchByAuthor, SearchByCategory,
+                                      SearchByAllFields, TrigramSearchAllFields)
+from indexes.token_index import TokenIndex
+from indexes.trigram_index import TrigramIndex
+
+WORDS = ["shadow", "river", "garden", "winter", "secret", "empire", "night", "stone", "glass", "city",
+         "storm", "silver", "forest", "ocean", "fire", "queen", "song", "last", "hidden", "light"]
+GENRES = ["Fiction", "Fantasy", "Science-Fiction", "History", "Drama", "Poetry", "Mystery"]
+
+
+def generate_books(books_count: int):
+    rng = random.Random(7)
+    books = []
+    for book_id in range(1, books_count + 1):
+        title = " ".join(rng.choice(WORDS) for _ in range(3)) + f" {book_id}"
+        author = f"Author {rng.randrange(books_count // 10 + 1)}"
+        books.append(Book.loaded_book(title, author, 1900 + book_id % 120, rng.choice(GENRES), 1,
+                                      book_id, [], 0, [], False))
+    return books
+
+
+def time_queries(strategy, books, queries, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for query in queries:
+            strategy.search(books, query)
+    return (time.perf_counter() - start) / (repeat * len(queries))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the search strategies.")
+    parser.add_argument("--books", type=int, default=200000, help="number of generated books")
+    parser.add_argument("--repeat", type=int, default=3, help="repetitions of every query")
+    args = parser.parse_args()
+
+    books = generate_books(args.books)
+    start = time.perf_counter()
+    token_index = TokenIndex()
+    token_index.rebuild(books)
+    print(f"books: {len(books)}, token index built in {time.perf_counter() - start:.2f}s")
+    start = time.perf_counter()
+    trigram_index = TrigramIndex()
+    trigram_index.rebuild(books)
+    print(f"trigram index built in {time.perf_counter() - start:.2f}s")
+
+    rare_queries = [f"{args.books // 2}", "Author 7", f"{args.books - 3}"]
+    cases = [
+        ("scan title", SearchByTitle(), books),
+        ("token index title", IndexedSearchByTitle(token_index), None),
+        ("scan author", SearchByAuthor(), books),
+        ("token index author", IndexedSearchByAuthor(token_index), None),
+        ("trigram index title", TrigramSearchByTitle(trigram_index), None),
+        ("trigram index author", TrigramSearchByAuthor(trigram_index), None),
+        ("scan all fields", SearchByAllFields(), books),
+        ("trigram all fields", TrigramSearchAllFields(trigram_index), None),
+    ]
+    for name, strategy, searched_books in cases:
+        seconds = time_queries(strategy, searched_books, rare_queries, args.repeat)
+        print(f"{name:<22} {seconds * 1e6:>12.1f} us/query")
+
+    # what LibraryGUI.perform_search did before: three scans of the whole catalog
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for query in rare_queries:
+            for strategy in (SearchByTitle(), SearchByAuthor(), SearchByCategory()):
+                strategy.search(list(books), query)
+    seconds = (time.perf_counter() - start) / (args.repeat * len(rare_queries))
+    print(f"{'three scans (legacy)':<22} {seconds * 1e6:>12.1f} us/query")
+
+
+if __name__ == "__main__":
+    main()
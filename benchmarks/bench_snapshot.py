@@ -0,0 +1,62 @@
+"""
+Startup benchmark: loading a books csv (parse + build objects) vs loading the binary snapshot.
+
+usage (from the project root):
+    python -m benchmarks.bench_snapshot --books 200000
+"""
+import argparse
+import csv
+import os
+import tempfile
+import time
+
+from Classes.book import Book
+from Classes.user import User
+from manage_files import csv_manager, snapshot_manager
+
+
+def write_books_csv(csv_file_path: str, books_count: int):
+    with open(csv_file_path, 'w', encoding='utf-8', newline='') as outfile:
+        writer = csv.DictWriter(outfile, fieldnames=csv_manager.book_headers_mapping.values())
+        writer.writeheader()
+        for book_id in range(1, books_count + 1):
+            writer.writerow({"id": book_id, "title": f"Title {book_id}", "author": f"Author {book_id % 5000}",
+                             "year": 1900 + book_id % 120, "genre": "Fiction", "copies": 3, "is_loaned": "No",
+                             "followers_ids": "", "borrow_count": book_id % 17, "borrowed_users": ""})
+    csv_manager.write_schema_version(csv_file_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark loading books from csv and from a snapshot.")
+    parser.add_argument("--books", type=int, default=200000, help="number of books in the generated csv")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        csv_file_path = os.path.join(temp_dir, "books.csv")
+        snapshot_path = csv_file_path + snapshot_manager.SNAPSHOT_SUFFIX
+        write_books_csv(csv_file_path, args.books)
+        lost_books_user = User("holds_lost_books", password_hash="")
+
+        start = time.perf_counter()
+        books = csv_manager.load_objs_dict_from_csv(csv_file_path, csv_manager.book_headers_mapping, "Book")
+        csv_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        snapshot_manager.save_snapshot(snapshot_path, {0: lost_books_user}, books, {},
+                                       {"users": None, "books": csv_file_path, "book_decorators": None})
+        save_seconds = time.perf_counter() - start
+        snapshot_size = os.path.getsize(snapshot_path)
+
+        start = time.perf_counter()
+        loaded = snapshot_manager.load_snapshot(snapshot_path, lost_books_user)
+        snapshot_seconds = time.perf_counter() - start
+
+    print(f"books: {len(loaded['books'])} (snapshot size: {snapshot_size / 1e6:.1f} MB)")
+    print(f"csv load:      {csv_seconds:.3f}s")
+    print(f"snapshot save: {save_seconds:.3f}s")
+    print(f"snapshot load: {snapshot_seconds:.3f}s")
+    print(f"speedup: x{csv_seconds / max(snapshot_seconds, 1e-9):.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Autocomplete benchmark: PrefixIndex.suggest on a generated catalog, for every prefix a user types on the way
+to a few words, cold (first lookup of the prefix) and warm (cached), and after a borrow of a matching book.
+
+usage (from the project root):
+    python -m benchmarks.bench_suggest --books 200000
+"""
+import argparse
+import time
+
+from benchmarks.bench_search import generate_books, WORDS
+from indexes.prefix_index import PrefixIndex
+
+
+def time_prefixes(index: PrefixIndex, prefixes, k: int) -> float:
+    start = time.perf_counter()
+    for prefix in prefixes:
+        index.suggest(prefix, k)
+    return (time.perf_counter() - start) / len(prefixes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the search box autocomplete.")
+    parser.add_argument("--books", type=int, default=200000, help="number of generated books")
+    parser.add_argument("-k", type=int, default=8, help="completions per lookup")
+    args = parser.parse_args()
+
+    books = generate_books(args.books)
+    for book in books[::97]:
+        book.borrow_count = book.id % 50
+    start = time.perf_counter()
+    index = PrefixIndex()
+    index.rebuild(books)
+    print(f"books: {len(books)}, prefix index built in {time.perf_counter() - start:.2f}s ({len(index.keys)} keys)")
+
+    typed = [word[:end] for word in WORDS[:5] for end in range(1, len(word) + 1)] + ["author 1", "author 12"]
+    print(f"{'cold':<22} {time_prefixes(index, typed, args.k) * 1e6:>12.1f} us/lookup")
+    print(f"{'warm':<22} {time_prefixes(index, typed, args.k) * 1e6:>12.1f} us/lookup")
+
+    # a borrow drops the cached prefixes of the book's keys only
+    borrowed = books[len(books) // 2]
+    borrowed.borrow_count += 1
+    index.refresh_book(borrowed)
+    print(f"{'after a borrow':<22} {time_prefixes(index, typed, args.k) * 1e6:>12.1f} us/lookup")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from typing import Any, Dict, List
 from Classes.book import Book
 
 
@@ -85,3 +85,13 @@ class CoverDecorator(BookDecorator):
         base_json["type"] += f"###cover_image"
         base_json["id"] = self.id
         return base_json
+
+
+def descriptions_of(decorated) -> List[str]:
+    """The descriptions of every DescriptionDecorator in a chain of decorators, outermost first."""
+    descriptions = []
+    while isinstance(decorated, BookDecorator):
+        if isinstance(decorated, DescriptionDecorator):
+            descriptions.append(decorated.description)
+        decorated = decorated._wrapped_book
+    return descriptions
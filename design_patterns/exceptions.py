@@ -18,4 +18,10 @@ class BookNotFoundException(LibraryException):
 
 class SignUpError(LibraryException):
     def __init__(self, missing_fields = None):
-        super().__init__(f"missing required fields : {missing_fields}")
\ No newline at end of file
+        super().__init__(f"missing required fields : {missing_fields}")
+
+class QuerySyntaxError(LibraryException):
+    """Exception raised for a query Library.query can't parse."""
+    def __init__(self, query, reason):
+        self.query = query
+        super().__init__(f"Invalid query '{query}': {reason}")
@@ -152,9 +152,18 @@ def update_csv_after(upsert_configs: List[Dict[str, str]]):
                 args_list.append(upsert_args)
 
             # Perform the CSV updates if there are any upsert operations
-            if args_list:
+            storage = getattr(self_obj, "storage", None)
+            write_behind = getattr(self_obj, "write_behind", None)
+            if args_list and write_behind is not None:
+                # write-behind mode: only mark the objects dirty, the flusher thread writes them
+                for upsert_args in args_list:
+                    write_behind.mark_dirty(upsert_args)
+            elif args_list:
                 try:
-                    update_csv(args_list)
+                    if storage is not None:
+                        storage.update(args_list)
+                    else:
+                        update_csv(args_list)
                 except ValueError as ve:
                     print(f"Decorator Error: {ve}")
                 except Exception as e:
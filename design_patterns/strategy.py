@@ -1,4 +1,5 @@
 # strategy.py
+import os
 from abc import ABC, abstractmethod
 from typing import List, TYPE_CHECKING
 from Classes.book import Book
@@ -7,6 +8,13 @@ if TYPE_CHECKING:
     from Classes.library import Library
 
 class SearchStrategy(ABC):
+    # True for strategies that find the books themselves (from an index) when they get books=None
+    searches_library = False
+
+    def cache_key(self):
+        """Key of the strategy in the library's search cache, None if its results must not be cached."""
+        return type(self).__name__
+
     @abstractmethod
     def search(self, books: List[Book], criteria: str) -> tuple[List[Book], str]:
         """Search for books based on the given criteria."""
@@ -26,3 +34,217 @@ class SearchByCategory(SearchStrategy):
     def search(self, books: List[Book], criteria: str) -> tuple[List[Book],str]:
         results = [book for book in books if criteria.lower() in book.category.lower()]
         return results, f"Search by Category'{criteria}': Found {len(results)} book(s)."
+
+class SearchByAllFields(SearchStrategy):
+    """
+    Title, author and category search in a single pass over the books.
+    after a search 'field_counts' holds the number of books matched by each field.
+    """
+    def __init__(self):
+        self.field_counts: dict[str, int] = {}
+
+    def search(self, books: List[Book], criteria: str) -> tuple[List[Book],str]:
+        query = criteria.lower()
+        title_count = author_count = category_count = 0
+        results = []
+        for book in books:
+            in_title = query in book.title.lower()
+            in_author = query in book.author.lower()
+            in_category = query in book.category.lower()
+            if in_title or in_author or in_category:
+                results.append(book)
+                title_count += in_title
+                author_count += in_author
+                category_count += in_category
+        counts = {"title": title_count, "author": author_count, "category": category_count}
+        self.field_counts = counts
+        return results, all_fields_message(criteria, results, counts)
+
+def all_fields_message(criteria: str, results: List[Book], field_counts: dict[str, int]) -> str:
+    counts = ", ".join(f"{field}: {count}" for field, count in field_counts.items())
+    return f"Search by all fields '{criteria}': Found {len(results)} book(s) ({counts})."
+
+
+#------------------- index-backed strategies -------------------
+
+class IndexedSearchStrategy(SearchStrategy):
+    """
+    Base of the strategies answered from one of the library's book indexes instead of scanning the books.
+    'books' = None means the whole library, a given list only restricts the results to its books.
+    """
+    searches_library = True
+    index_name: str = None
+    field: str = None
+    label: str = None
+
+    def __init__(self, index=None):
+        # the library's index by default
+        self._index = index
+
+    def cache_key(self):
+        # results from a private index (not the library's) aren't cached by the library
+        return type(self).__name__ if self._index is None else None
+
+    @property
+    def index(self):
+        if self._index is not None:
+            return self._index
+        from Classes.library import Library
+        return Library.getInstance().book_indexes[self.index_name]
+
+    def search(self, books: List[Book] or None, criteria: str) -> tuple[List[Book], str]:
+        index = self.index
+        results = index.books_by_ids(index.lookup(self.field, criteria), books)
+        return results, f"Search by {self.label} '{criteria}': Found {len(results)} book(s)."
+
+class IndexedSearchByTitle(IndexedSearchStrategy):
+    """Keyword search (all the words of the criteria) in the titles, from the token index."""
+    index_name, field, label = "tokens", "title", "Title"
+
+class IndexedSearchByAuthor(IndexedSearchStrategy):
+    """Keyword search (all the words of the criteria) in the authors, from the token index."""
+    index_name, field, label = "tokens", "author", "Author"
+
+class IndexedSearchByCategory(IndexedSearchStrategy):
+    """Keyword search (all the words of the criteria) in the categories, from the token index."""
+    index_name, field, label = "tokens", "category", "Category"
+
+class TrigramSearchByTitle(IndexedSearchStrategy):
+    """Substring search in the titles (same results as SearchByTitle), from the trigram index."""
+    index_name, field, label = "trigrams", "title", "Title"
+
+class TrigramSearchByAuthor(IndexedSearchStrategy):
+    """Substring search in the authors (same results as SearchByAuthor), from the trigram index."""
+    index_name, field, label = "trigrams", "author", "Author"
+
+class TrigramSearchByCategory(IndexedSearchStrategy):
+    """Substring search in the categories (same results as SearchByCategory), from the trigram index."""
+    index_name, field, label = "trigrams", "category", "Category"
+
+class TrigramSearchAllFields(IndexedSearchStrategy):
+    """
+    Substring search in the title, author and category at once (same results as SearchByAllFields),
+    from a single trigram index probe. after a search 'field_counts' holds the matches of each field.
+    """
+    index_name = "trigrams"
+
+    def __init__(self, index=None):
+        super().__init__(index)
+        self.field_counts: dict[str, int] = {}
+
+    def search(self, books: List[Book] or None, criteria: str) -> tuple[List[Book], str]:
+        index = self.index
+        matches = index.lookup_fields(criteria)
+        if books is not None:
+            # counts of the given books only
+            book_ids = {book.id for book in books}
+            matches = {field: ids & book_ids for field, ids in matches.items()}
+        self.field_counts = {field: len(ids) for field, ids in matches.items()}
+        results = index.books_by_ids(set().union(*matches.values()), books)
+        return results, all_fields_message(criteria, results, self.field_counts)
+
+class FuzzySearchByTitle(IndexedSearchStrategy):
+    """Typo tolerant keyword search in the titles (every word within a small edit distance), from the fuzzy index."""
+    index_name, field, label = "fuzzy", "title", "Title (fuzzy)"
+
+class FuzzySearchByAuthor(IndexedSearchStrategy):
+    """Typo tolerant keyword search in the authors ("Orwel" finds "George Orwell"), from the fuzzy index."""
+    index_name, field, label = "fuzzy", "author", "Author (fuzzy)"
+
+class FuzzySearchTitleOrAuthor(IndexedSearchStrategy):
+    """
+    Typo tolerant keyword search in the title or the author, the query words are matched once for both fields.
+    after a search 'field_counts' holds the matches of each field.
+    """
+    index_name = "fuzzy"
+
+    def __init__(self, index=None):
+        super().__init__(index)
+        self.field_counts: dict[str, int] = {}
+
+    def search(self, books: List[Book] or None, criteria: str) -> tuple[List[Book], str]:
+        index = self.index
+        matches = index.lookup_fields(criteria)
+        if books is not None:
+            book_ids = {book.id for book in books}
+            matches = {field: ids & book_ids for field, ids in matches.items()}
+        self.field_counts = {field: len(ids) for field, ids in matches.items()}
+        results = index.books_by_ids(set().union(*matches.values()), books)
+        return results, f"Fuzzy search '{criteria}': Found {len(results)} book(s)."
+
+class SearchByAuthorPhonetic(IndexedSearchStrategy):
+    """
+    Search of the authors by how they sound ("Dostoevsky" finds "Fyodor Dostoyevsky"), from the phonetic index.
+    the words of the books' decorator descriptions are matched too, so a description naming the author finds the book.
+    """
+    index_name, field, label = "phonetic", None, "Author (sounds like)"
+
+
+#------------------- parallel strategy -------------------
+
+# below this number of books the wrapped strategy scans in-process, a round trip to the workers would cost more
+PARALLEL_MIN_BOOKS = 20000
+
+class ParallelSearchStrategy(SearchStrategy):
+    """
+    Runs a scanning strategy on shards of the books held by long-lived worker processes (indexes/search_shards.py).
+    the workers only get the searched fields (search_shards.SHARD_FIELDS), so the wrapped strategy must match on them.
+    the library's shards (books=None) are sent once and reused while its catalog version doesn't change. a given list
+    is sent again on every search: it may be edited in place, and checking its books would cost a serial scan.
+    the results are the wrapped strategy's, in the same order.
+    after a search 'field_counts' holds the sum of the shards' counts, for strategies that keep them.
+    """
+    # the library passes books=None, so the shards follow its catalog version instead of a new view per search
+    searches_library = True
+
+    def __init__(self, strategy: SearchStrategy, workers: int = None, min_books: int = PARALLEL_MIN_BOOKS):
+        if strategy.searches_library:
+            raise ValueError(f"{type(strategy).__name__} searches the library's indexes, it can't run on shards.")
+        self.strategy = strategy
+        self.workers = workers
+        self.min_books = min_books
+        self._pool = None
+        # the library's catalog version the shards were loaded from, None if they hold a given list
+        self._loaded = None
+
+    def cache_key(self):
+        # same results as the wrapped strategy
+        return self.strategy.cache_key()
+
+    def search(self, books: List[Book] or None, criteria: str) -> tuple[List[Book], str]:
+        from indexes.search_shards import ShardPool, book_row
+        library = None
+        if books is None:
+            from Classes.library import Library
+            library = Library.getInstance()
+            books = library.books.values()
+        if len(books) < self.min_books or (self.workers or os.cpu_count() or 1) < 2:
+            return self.strategy.search(books, criteria)
+
+        books = list(books)
+        if self._pool is None:
+            self._pool = ShardPool(self.workers)
+        # lends and returns don't change the searched fields, so they don't send the library's shards again
+        version = library.catalog_version if library is not None else None
+        if version is None or version != self._loaded:
+            self._pool.load(list(map(book_row, books)))
+            self._loaded = version
+        positions, shard_counts = self._pool.search(self.strategy, criteria)
+        results = [books[position] for position in positions]
+        if any(counts is not None for counts in shard_counts):
+            field_counts: dict[str, int] = {}
+            for counts in shard_counts:
+                for field, count in (counts or {}).items():
+                    field_counts[field] = field_counts.get(field, 0) + count
+            self.strategy.field_counts = self.field_counts = field_counts
+            if isinstance(self.strategy, SearchByAllFields):
+                return results, all_fields_message(criteria, results, field_counts)
+        return results, (f"Parallel {type(self.strategy).__name__} '{criteria}' on {self._pool.workers} shards: "
+                         f"Found {len(results)} book(s).")
+
+    def close(self):
+        """Stops the worker processes (also done at exit)."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+            self._loaded = None
@@ -0,0 +1,115 @@
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+
+from indexes.book_index import BookIndex
+
+if TYPE_CHECKING:
+    from Classes.book import Book
+
+"""
+Index of the books' exact attributes: title -> ids, category -> ids, a sorted (year, id) array for year ranges, and
+the available/unavailable id sets. the availability sets follow the copies through refresh_book (Library.book_changed).
+"""
+
+
+def book_year(book: 'Book') -> Optional[int]:
+    try:
+        return int(book.year)
+    except (TypeError, ValueError):
+        return None
+
+
+class AttributeIndex(BookIndex):
+    def __init__(self):
+        super().__init__()
+        # exact title -> ids (a list, titles are rarely shared)
+        self.titles: Dict[str, List[int]] = {}
+        # exact category -> ids, a category without books is dropped so the keys are the library's categories
+        self.categories: Dict[str, Set[int]] = {}
+        self.categories_by_id: Dict[int, str] = {}
+        # sorted (year, id) pairs, a year range is one bisect slice
+        self.years: List[Tuple[int, int]] = []
+        self.available: Set[int] = set()
+        self.unavailable: Set[int] = set()
+        # id -> indexed year (the array is found by it on removal, and the query filters check it)
+        self.years_by_id: Dict[int, int] = {}
+        self._rebuilding = False
+
+    def _add(self, book: 'Book'):
+        self.titles.setdefault(str(book.title), []).append(book.id)
+        category = str(book.category)
+        self.categories_by_id[book.id] = category
+        self.categories.setdefault(category, set()).add(book.id)
+        year = book_year(book)
+        if year is not None:
+            self.years_by_id[book.id] = year
+            if self._rebuilding:
+                self.years.append((year, book.id))
+            else:
+                insort(self.years, (year, book.id))
+        self._set_availability(book)
+
+    def _remove(self, book: 'Book'):
+        title_ids = self.titles.get(str(book.title))
+        if title_ids is not None and book.id in title_ids:
+            title_ids.remove(book.id)
+            if not title_ids:
+                del self.titles[str(book.title)]
+        category = self.categories_by_id.pop(book.id, None)
+        if category is not None:
+            ids = self.categories[category]
+            ids.discard(book.id)
+            if not ids:
+                del self.categories[category]
+        year = self.years_by_id.pop(book.id, None)
+        if year is not None:
+            position = bisect_left(self.years, (year, book.id))
+            if position < len(self.years) and self.years[position] == (year, book.id):
+                del self.years[position]
+        self.available.discard(book.id)
+        self.unavailable.discard(book.id)
+
+    def _clear(self):
+        self.titles = {}
+        self.categories = {}
+        self.categories_by_id = {}
+        self.years = []
+        self.available = set()
+        self.unavailable = set()
+        self.years_by_id = {}
+
+    def rebuild(self, books):
+        # _add keeps the array sorted one insert at a time, a load appends and sorts once
+        self._rebuilding = True
+        try:
+            super().rebuild(books)
+        finally:
+            self._rebuilding = False
+        self.years.sort()
+
+    def refresh_book(self, book: 'Book'):
+        if book.id in self.books:
+            self._set_availability(book)
+
+    def _set_availability(self, book: 'Book'):
+        if book.available_copies > 0:
+            self.unavailable.discard(book.id)
+            self.available.add(book.id)
+        else:
+            self.available.discard(book.id)
+            self.unavailable.add(book.id)
+
+    def _year_bounds(self, low: Optional[int], high: Optional[int]) -> Tuple[int, int]:
+        start = 0 if low is None else bisect_left(self.years, (low, -1))
+        end = len(self.years) if high is None else bisect_right(self.years, (high, float("inf")))
+        return start, max(start, end)
+
+    def count_years(self, low: Optional[int], high: Optional[int]) -> int:
+        """Number of books with low <= year <= high (None = unbounded), without building the ids."""
+        start, end = self._year_bounds(low, high)
+        return end - start
+
+    def year_range(self, low: Optional[int], high: Optional[int]) -> Set[int]:
+        """Ids of the books with low <= year <= high (None = unbounded)."""
+        start, end = self._year_bounds(low, high)
+        return {book_id for _, book_id in self.years[start:end]}
@@ -0,0 +1,136 @@
+from typing import Dict, Iterable, Iterator, List, TYPE_CHECKING
+
+from indexes.book_index import BookIndex
+
+if TYPE_CHECKING:
+    from Classes.book import Book
+
+"""
+Bitmaps of books: a python int whose bit i is set when the book at ordinal i is in the set.
+the ordinal of a book is its position in the index (the library's order, dense after a load), so AND/OR/NOT of
+filters are big-int operations over 64 bit words, and only the final bitmap is turned back into Book objects.
+the index keeps the bitmaps of all the books, the available ones and each category up to date.
+a removed book leaves a dead slot, the index is rebuilt (dense ordinals again) once they pass DEAD_SLOTS_RATIO of the
+slots, so adds and removes don't widen the bitmaps without limit.
+"""
+
+# share of dead slots (removed books) after which the ordinals are compacted by a rebuild
+DEAD_SLOTS_RATIO = 0.25
+
+
+def iter_bits(bitmap: int) -> Iterator[int]:
+    """The set bits of 'bitmap', lowest first."""
+    bits = format(bitmap, "b")[::-1] if bitmap > 0 else ""
+    position = bits.find("1")
+    while position != -1:
+        yield position
+        position = bits.find("1", position + 1)
+
+
+def count_bits(bitmap: int) -> int:
+    # int.bit_count is 3.10+
+    return bin(bitmap).count("1")
+
+
+def bitmap_of_ordinals(ordinals: Iterable[int]) -> int:
+    """
+    Builds a bitmap in one pass over a byte buffer (no big-int operation per ordinal).
+    the buffer is as wide as the highest ordinal, not the index.
+    """
+    ordinals = ordinals if isinstance(ordinals, (list, range)) else list(ordinals)
+    if not ordinals:
+        return 0
+    buffer = bytearray(max(ordinals) // 8 + 1)
+    for ordinal in ordinals:
+        buffer[ordinal >> 3] |= 1 << (ordinal & 7)
+    return int.from_bytes(buffer, "little")
+
+
+class BitmapIndex(BookIndex):
+    def __init__(self):
+        super().__init__()
+        # ordinal -> book, None where a book was removed (the slots are compacted by the next rebuild)
+        self.slots: List['Book' or None] = []
+        self.all = 0
+        self.available = 0
+        self.categories: Dict[str, int] = {}
+        self._rebuilding = False
+
+    def _add(self, book: 'Book'):
+        ordinal = self._positions[book.id]
+        while len(self.slots) <= ordinal:
+            self.slots.append(None)
+        self.slots[ordinal] = book
+        if not self._rebuilding:
+            bit = 1 << ordinal
+            self.all |= bit
+            if book.available_copies > 0:
+                self.available |= bit
+            category = str(book.category)
+            self.categories[category] = self.categories.get(category, 0) | bit
+
+    def remove_book(self, book: 'Book'):
+        # the ordinal is read before BookIndex.remove_book drops the book's position
+        ordinal = self._positions.get(book.id)
+        super().remove_book(book)
+        if ordinal is None:
+            return
+        self.slots[ordinal] = None
+        mask = ~(1 << ordinal)
+        self.all &= mask
+        self.available &= mask
+        category = str(book.category)
+        if category in self.categories:
+            self.categories[category] &= mask
+            if not self.categories[category]:
+                del self.categories[category]
+        if len(self.slots) - len(self.books) >= DEAD_SLOTS_RATIO * len(self.slots):
+            # the live books keep their order, so the results are the same with the new ordinals
+            self.rebuild([slot for slot in self.slots if slot is not None])
+
+    def _remove(self, book: 'Book'):
+        # done by remove_book, which still knows the ordinal
+        pass
+
+    def _clear(self):
+        self.slots = []
+        self.all = 0
+        self.available = 0
+        self.categories = {}
+
+    def rebuild(self, books: Iterable['Book']):
+        # the bitmaps are built once from byte buffers instead of one big-int update per book
+        self._rebuilding = True
+        try:
+            super().rebuild(books)
+        finally:
+            self._rebuilding = False
+        self.all = (1 << len(self.slots)) - 1
+        self.available = bitmap_of_ordinals([ordinal for ordinal, book in enumerate(self.slots)
+                                             if book.available_copies > 0])
+        category_ordinals: Dict[str, List[int]] = {}
+        for ordinal, book in enumerate(self.slots):
+            category_ordinals.setdefault(str(book.category), []).append(ordinal)
+        self.categories = {category: bitmap_of_ordinals(ordinals) for category, ordinals in category_ordinals.items()}
+
+    def refresh_book(self, book: 'Book'):
+        ordinal = self._positions.get(book.id)
+        if ordinal is None:
+            return
+        bit = 1 << ordinal
+        if book.available_copies > 0:
+            self.available |= bit
+        else:
+            self.available &= ~bit
+
+    def bitmap_of_ids(self, book_ids: Iterable[int]) -> int:
+        positions = self._positions
+        return bitmap_of_ordinals([positions[book_id] for book_id in book_ids if book_id in positions])
+
+    def bitmap_of(self, books: Iterable['Book']) -> int:
+        return self.bitmap_of_ids(book.id for book in books)
+
+    def books_of(self, bitmap: int) -> List['Book']:
+        """The books of the bitmap, in the library's order."""
+        slots = self.slots
+        return [slots[ordinal] for ordinal in iter_bits(bitmap & self.all)]
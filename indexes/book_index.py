@@ -0,0 +1,82 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from Classes.book import Book
+
+"""
+Base of the in-memory indexes the Library keeps over its books.
+the Library calls add_book/remove_book from addBook/removeBook and rebuild from its load paths,
+so the indexes always hold exactly the books of Library.books.
+"""
+
+# the book fields the text searches look at (Book attribute names)
+BOOK_SEARCH_FIELDS = ("title", "author", "category")
+
+
+class BookIndex(ABC):
+    def __init__(self):
+        # id -> book, for answering queries without the library's dict
+        self.books: Dict[int, 'Book'] = {}
+        # id -> insertion position, so results come back in the library's order (like a scan of Library.books)
+        self._positions: Dict[int, int] = {}
+        self._next_position = 0
+
+    def __len__(self) -> int:
+        return len(self.books)
+
+    def add_book(self, book: 'Book'):
+        if book.id in self.books:
+            self.remove_book(self.books[book.id])
+        self.books[book.id] = book
+        self._positions[book.id] = self._next_position
+        self._next_position += 1
+        self._add(book)
+
+    def remove_book(self, book: 'Book'):
+        indexed_book = self.books.pop(book.id, None)
+        if indexed_book is not None:
+            del self._positions[book.id]
+            self._remove(indexed_book)
+
+    def refresh_book(self, book: 'Book'):
+        """Called when an indexed book's copies/borrow count changed, for indexes that depend on them."""
+        pass
+
+    def rebuild(self, books: Iterable['Book']):
+        """Drops everything and indexes 'books' from scratch (after a load)."""
+        self.clear()
+        self.books = {book.id: book for book in books}
+        self._positions = {book_id: position for position, book_id in enumerate(self.books)}
+        self._next_position = len(self._positions)
+        for book in self.books.values():
+            self._add(book)
+
+    def clear(self):
+        self.books = {}
+        self._positions = {}
+        self._next_position = 0
+        self._clear()
+
+    def books_by_ids(self, book_ids: Iterable[int], books: Optional[Iterable['Book']] = None) -> List['Book']:
+        """
+        Returns the indexed books of 'book_ids' in the library's order, or only the ones in 'books' (in its order) if given.
+        """
+        if books is None:
+            positions = self._positions
+            return [self.books[book_id] for book_id in sorted((book_id for book_id in book_ids if book_id in positions),
+                                                              key=positions.__getitem__)]
+        book_ids = book_ids if isinstance(book_ids, (set, frozenset, dict)) else set(book_ids)
+        return [book for book in books if book.id in book_ids]
+
+    @abstractmethod
+    def _add(self, book: 'Book'):
+        pass
+
+    @abstractmethod
+    def _remove(self, book: 'Book'):
+        pass
+
+    @abstractmethod
+    def _clear(self):
+        pass
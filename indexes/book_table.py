@@ -0,0 +1,129 @@
+from typing import Dict, List, TYPE_CHECKING
+
+from indexes.book_index import BookIndex
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, the library works without the columnar table
+    np = None
+
+if TYPE_CHECKING:
+    from Classes.book import Book
+
+"""
+Columnar mirror of Library.books (needs numpy): one array per numeric attribute (id, year, copies, available_copies,
+borrow_count) and integer codes for the category and the author, one row per book.
+statistics over the whole catalog (Library.getBookStats) become array operations instead of a loop over Book objects.
+the GUI filters don't use it, they're composed as bitmaps (bitmap_index.py), which need no conversion back to books.
+a removed book's row is filled with the last row, so the rows stay dense (and unordered).
+"""
+
+NUMPY_AVAILABLE = np is not None
+INITIAL_CAPACITY = 1024
+# year of the books whose year isn't a number
+UNKNOWN_YEAR = -1
+
+_NUMERIC_COLUMNS = ("id", "year", "copies", "available_copies", "borrow_count")
+_CODED_COLUMNS = ("category", "author")
+
+
+def _int_or(value, default: int) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+class BookTable(BookIndex):
+    def __init__(self, capacity: int = INITIAL_CAPACITY):
+        if np is None:
+            raise ImportError("BookTable needs numpy (pip install numpy).")
+        super().__init__()
+        self._capacity = capacity
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int):
+        self.rows = 0
+        self.columns: Dict[str, 'np.ndarray'] = {name: np.zeros(capacity, dtype=np.int64) for name in _NUMERIC_COLUMNS}
+        self.columns.update({name: np.zeros(capacity, dtype=np.int32) for name in _CODED_COLUMNS})
+        # book id -> row
+        self.row_of: Dict[int, int] = {}
+        # coded column -> value -> code, and the values by code
+        self.codes: Dict[str, Dict[str, int]] = {name: {} for name in _CODED_COLUMNS}
+        self.values: Dict[str, List[str]] = {name: [] for name in _CODED_COLUMNS}
+
+    def _grow(self, needed: int):
+        capacity = len(self.columns["id"])
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, 2 * capacity)
+        for name, column in self.columns.items():
+            grown = np.zeros(new_capacity, dtype=column.dtype)
+            grown[:self.rows] = column[:self.rows]
+            self.columns[name] = grown
+
+    def _code(self, column: str, value) -> int:
+        value = str(value)
+        code = self.codes[column].get(value)
+        if code is None:
+            code = self.codes[column][value] = len(self.values[column])
+            self.values[column].append(value)
+        return code
+
+    def _add(self, book: 'Book'):
+        self._grow(self.rows + 1)
+        row = self.rows
+        self.rows += 1
+        self.row_of[book.id] = row
+        columns = self.columns
+        columns["id"][row] = book.id
+        columns["year"][row] = _int_or(book.year, UNKNOWN_YEAR)
+        columns["copies"][row] = _int_or(book.copies, 0)
+        columns["category"][row] = self._code("category", book.category)
+        columns["author"][row] = self._code("author", book.author)
+        self._set_counts(row, book)
+
+    def _remove(self, book: 'Book'):
+        row = self.row_of.pop(book.id, None)
+        if row is None:
+            return
+        last = self.rows - 1
+        if row != last:
+            for column in self.columns.values():
+                column[row] = column[last]
+            self.row_of[int(self.columns["id"][row])] = row
+        self.rows = last
+
+    def _clear(self):
+        self._allocate(self._capacity)
+
+    def refresh_book(self, book: 'Book'):
+        row = self.row_of.get(book.id)
+        if row is not None:
+            self._set_counts(row, book)
+
+    def _set_counts(self, row: int, book: 'Book'):
+        self.columns["available_copies"][row] = _int_or(book.available_copies, 0)
+        self.columns["borrow_count"][row] = _int_or(book.borrow_count, 0)
+
+    def _column(self, name: str) -> 'np.ndarray':
+        """The live rows of a column (a view, not a copy)."""
+        return self.columns[name][:self.rows]
+
+    # ------------ statistics ------------
+    def category_counts(self) -> Dict[str, int]:
+        counts = np.bincount(self._column("category"), minlength=len(self.values["category"]))
+        return {category: int(count) for category, count in zip(self.values["category"], counts) if count}
+
+    def year_histogram(self, bin_size: int = 10) -> Dict[int, int]:
+        """Books per year bin (e.g. per decade), keyed by the bin's first year. unknown years aren't counted."""
+        years = self._column("year")
+        bins = years[years != UNKNOWN_YEAR] // bin_size * bin_size
+        values, counts = np.unique(bins, return_counts=True)
+        return {int(value): int(count) for value, count in zip(values, counts)}
+
+    def stats(self) -> Dict[str, object]:
+        available = int(np.count_nonzero(self._column("available_copies") > 0))
+        return {"books": self.rows, "available": available, "unavailable": self.rows - available,
+                "borrows": int(self._column("borrow_count").sum()), "categories": self.category_counts(),
+                "years": self.year_histogram()}
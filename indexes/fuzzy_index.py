@@ -0,0 +1,198 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set, Tuple, Union, TYPE_CHECKING
+
+from indexes.book_index import BookIndex
+from indexes.token_index import tokenize
+
+if TYPE_CHECKING:
+    from Classes.book import Book
+
+"""
+Typo tolerant index: a deletion-neighbourhood index over the distinct title/author tokens, plus token -> book ids
+postings per field. a misspelled query token ("orwel") is matched to the indexed tokens within a small edit distance
+("orwell") through their shared deletion variants, instead of comparing it with every book.
+"""
+
+# the book fields the fuzzy search looks at
+FUZZY_FIELDS = ("title", "author")
+# max edits allowed for a query token, short tokens get fewer (one typo in a 3 letter word is another word)
+MAX_EDIT_DISTANCE = 2
+SHORT_TOKEN_LENGTH = 4
+
+
+def allowed_distance(token: str) -> int:
+    if len(token) < 3:
+        return 0
+    return 1 if len(token) <= SHORT_TOKEN_LENGTH else MAX_EDIT_DISTANCE
+
+
+def edit_distance(first: str, second: str, max_distance: int) -> int:
+    """
+    Levenshtein distance (insert, delete, substitute) of the two words, or max_distance + 1 if it is larger.
+    only the diagonal band of width 2 * max_distance + 1 is computed.
+    """
+    if abs(len(first) - len(second)) > max_distance:
+        return max_distance + 1
+    if len(first) > len(second):
+        first, second = second, first
+    too_far = max_distance + 1
+    previous = list(range(len(second) + 1))
+    for i, first_char in enumerate(first, start=1):
+        start, end = max(1, i - max_distance), min(len(second), i + max_distance)
+        current = [too_far] * (len(second) + 1)
+        current[0] = i if i <= max_distance else too_far
+        row_min = current[0]
+        for j in range(start, end + 1):
+            cost = previous[j - 1] + (first_char != second[j - 1])
+            if previous[j] + 1 < cost:
+                cost = previous[j] + 1
+            if current[j - 1] + 1 < cost:
+                cost = current[j - 1] + 1
+            current[j] = cost
+            if cost < row_min:
+                row_min = cost
+        if row_min > max_distance:
+            return too_far
+        previous = current
+    return min(previous[len(second)], too_far)
+
+
+def deletes(word: str, max_distance: int) -> Set[str]:
+    """The word and every string made of it by deleting up to 'max_distance' characters."""
+    variants = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {variant[:i] + variant[i + 1:] for variant in frontier for i in range(len(variant))}
+        variants |= frontier
+    return variants
+
+
+class DeletionIndex:
+    """
+    Symmetric delete (SymSpell) index of words: every word is stored under its deletion variants, so two words within
+    the edit distance share a variant. a lookup is then a few dict probes plus the exact distance of the candidates.
+    only the first PREFIX_LENGTH characters are varied, longer words are told apart by the exact distance check.
+    words are only added (a word no book uses anymore is skipped by the postings, and dropped at the next rebuild).
+    """
+    PREFIX_LENGTH = 7
+
+    def __init__(self, max_distance: int = MAX_EDIT_DISTANCE):
+        self.max_distance = max_distance
+        self.words: List[str] = []
+        self._word_ids: Dict[str, int] = {}
+        # deletion variant -> word id, or a list of word ids when several words share it (most variants are unique)
+        self.variants: Dict[str, Union[int, List[int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def add(self, word: str):
+        if word in self._word_ids:
+            return
+        word_id = self._word_ids[word] = len(self.words)
+        self.words.append(word)
+        variants = self.variants
+        for variant in deletes(word[:self.PREFIX_LENGTH], self.max_distance):
+            ids = variants.get(variant)
+            if ids is None:
+                variants[variant] = word_id
+            elif type(ids) is int:
+                variants[variant] = [ids, word_id]
+            else:
+                ids.append(word_id)
+
+    def search(self, word: str, max_distance: int) -> List[Tuple[str, int]]:
+        """Returns the indexed (word, distance) pairs within 'max_distance' (at most the index's) of 'word'."""
+        max_distance = min(max_distance, self.max_distance)
+        candidates = set()
+        variants = self.variants
+        for variant in deletes(word[:self.PREFIX_LENGTH], max_distance):
+            ids = variants.get(variant)
+            if ids is None:
+                continue
+            if type(ids) is int:
+                candidates.add(ids)
+            else:
+                candidates.update(ids)
+        found = []
+        for word_id in candidates:
+            candidate = self.words[word_id]
+            distance = edit_distance(word, candidate, max_distance)
+            if distance <= max_distance:
+                found.append((candidate, distance))
+        return found
+
+
+class FuzzyIndex(BookIndex):
+    def __init__(self, fields: Iterable[str] = FUZZY_FIELDS):
+        super().__init__()
+        self.fields = tuple(fields)
+        self.postings: Dict[str, Dict[str, Set[int]]] = {field: defaultdict(set) for field in self.fields}
+        self.words = DeletionIndex()
+
+    def _add(self, book: 'Book'):
+        for field in self.fields:
+            postings = self.postings[field]
+            for token in tokenize(getattr(book, field)):
+                if token not in postings:
+                    self.words.add(token)
+                postings[token].add(book.id)
+
+    def _remove(self, book: 'Book'):
+        for field in self.fields:
+            postings = self.postings[field]
+            for token in tokenize(getattr(book, field)):
+                ids = postings.get(token)
+                if ids is not None:
+                    ids.discard(book.id)
+                    # kept (empty), the word stays in the deletion index until the next rebuild
+
+    def _clear(self):
+        self.postings = {field: defaultdict(set) for field in self.fields}
+        self.words = DeletionIndex()
+
+    def similar_tokens(self, token: str) -> List[Tuple[str, int]]:
+        """Returns the indexed tokens (with their edit distance) a query token may be a typo of."""
+        max_distance = allowed_distance(token)
+        if max_distance == 0:
+            return [(token, 0)]
+        return self.words.search(token, max_distance)
+
+    def lookup(self, field: str, criteria: str) -> Set[int]:
+        """
+        Returns the ids of the books whose 'field' has, for every token of 'criteria', a token within its allowed
+        edit distance. an empty criteria matches every book (like the scanning strategies).
+        """
+        tokens = set(tokenize(criteria))
+        if not tokens:
+            return set(self.books)
+        postings = self.postings[field]
+        result = None
+        for token in tokens:
+            ids = set()
+            for similar, _ in self.similar_tokens(token):
+                ids.update(postings.get(similar, ()))
+            result = ids if result is None else result & ids
+            if not result:
+                return set()
+        return result
+
+    def lookup_fields(self, criteria: str) -> Dict[str, Set[int]]:
+        """Returns field -> ids of lookup(field, criteria) for every indexed field, matching the query tokens once."""
+        tokens = set(tokenize(criteria))
+        if not tokens:
+            return {field: set(self.books) for field in self.fields}
+        similar = [self.similar_tokens(token) for token in tokens]
+        matches = {}
+        for field in self.fields:
+            postings = self.postings[field]
+            result = None
+            for token_matches in similar:
+                ids = set()
+                for token, _ in token_matches:
+                    ids.update(postings.get(token, ()))
+                result = ids if result is None else result & ids
+                if not result:
+                    break
+            matches[field] = result or set()
+        return matches
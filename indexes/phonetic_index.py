@@ -0,0 +1,112 @@
+import unicodedata
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, Optional, Set, TYPE_CHECKING
+
+from indexes.book_index import BookIndex
+from indexes.token_index import tokenize
+
+if TYPE_CHECKING:
+    from Classes.book import Book
+
+"""
+Phonetic index of the authors: each word of the author (and of the book's decorator descriptions) is stored by its
+Soundex code, so names that sound alike ("Dostoyevsky" / "Dostoevsky", "Tolstoi" / "Tolstoy") share a key and a
+lookup is one dict probe per query word. the codes of a book are kept, so it's removed without encoding it again.
+"""
+
+# letter -> Soundex digit, vowels (and y) are 0 and separate equal digits, h and w are skipped
+_SOUNDEX_DIGITS = {letter: str(digit) for digit, letters in enumerate(
+    ("aeiouy", "bfpv", "cgjkqsxz", "dt", "l", "mn", "r")) for letter in letters}
+
+PHONETIC_FIELDS = ("author", "description")
+
+
+def soundex(word: str) -> str:
+    """
+    American Soundex code of a word, e.g. "Tolstoi" -> "T423". accents are dropped first ("Dostoïevski" -> "D231"),
+    a word without latin letters has no code ("").
+    """
+    letters = [letter for letter in unicodedata.normalize("NFKD", word.casefold()) if letter in _SOUNDEX_DIGITS
+               or letter in "hw"]
+    if not letters:
+        return ""
+    code = letters[0].upper()
+    previous = _SOUNDEX_DIGITS.get(letters[0], "")
+    for letter in letters[1:]:
+        if letter in "hw":
+            # h and w don't separate two letters with the same digit
+            continue
+        digit = _SOUNDEX_DIGITS[letter]
+        if digit != "0" and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        previous = digit
+    return code.ljust(4, "0")
+
+
+def phonetic_codes(text) -> Set[str]:
+    """The Soundex codes of the words of a text."""
+    return {code for code in map(soundex, tokenize(text)) if code}
+
+
+class PhoneticIndex(BookIndex):
+    def __init__(self, descriptions: Optional[Callable[[int], Iterable[str]]] = None):
+        """
+        :param descriptions: function of a book id -> its decorator descriptions (the library's), None for authors only.
+        """
+        super().__init__()
+        self.descriptions = descriptions
+        # field -> code -> ids
+        self.postings: Dict[str, Dict[str, Set[int]]] = {field: defaultdict(set) for field in PHONETIC_FIELDS}
+        # id -> field -> indexed codes (the descriptions may have changed by the time the book is removed)
+        self.codes_by_id: Dict[int, Dict[str, Set[str]]] = {}
+
+    def _add(self, book: 'Book'):
+        codes = {"author": phonetic_codes(book.author), "description": set()}
+        if self.descriptions is not None:
+            for description in self.descriptions(book.id):
+                codes["description"] |= phonetic_codes(description)
+        self.codes_by_id[book.id] = codes
+        for field, field_codes in codes.items():
+            postings = self.postings[field]
+            for code in field_codes:
+                postings[code].add(book.id)
+
+    def _remove(self, book: 'Book'):
+        codes = self.codes_by_id.pop(book.id, {})
+        for field, field_codes in codes.items():
+            postings = self.postings[field]
+            for code in field_codes:
+                ids = postings.get(code)
+                if ids is not None:
+                    ids.discard(book.id)
+                    if not ids:
+                        del postings[code]
+
+    def _clear(self):
+        self.postings = {field: defaultdict(set) for field in PHONETIC_FIELDS}
+        self.codes_by_id = {}
+
+    def refresh_descriptions(self, book: 'Book'):
+        """Indexes the book's current descriptions again (after a description decorator was added)."""
+        if book.id in self.books:
+            self._remove(book)
+            self._add(book)
+
+    def lookup(self, field: Optional[str], criteria: str) -> Set[int]:
+        """
+        Ids of the books where every word of 'criteria' sounds like a word of 'field' (None = the author or a
+        description). a criteria without codes matches every book (like the scanning strategies).
+        """
+        codes = phonetic_codes(criteria)
+        if not codes:
+            return set(self.books)
+        fields = PHONETIC_FIELDS if field is None else (field,)
+        result = None
+        for code in codes:
+            ids = set().union(*(self.postings[name].get(code, ()) for name in fields))
+            result = ids if result is None else result & ids
+            if not result:
+                break
+        return result
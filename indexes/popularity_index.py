@@ -0,0 +1,70 @@
+from bisect import bisect_left, insort
+from typing import Dict, List, TYPE_CHECKING
+
+from indexes.book_index import BookIndex
+
+if TYPE_CHECKING:
+    from Classes.book import Book
+
+"""
+Popularity ranking: the books bucketed by borrow_count, with the distinct counts kept sorted.
+a borrow moves one book to the next bucket (a dict move and at most a bisect insert of a new count), and the top-k is
+read from the highest buckets down, without sorting the catalog.
+"""
+
+
+class PopularityIndex(BookIndex):
+    def __init__(self):
+        super().__init__()
+        # borrow count -> ids (a dict as an ordered set, ties come out in the order they reached the count)
+        self.buckets: Dict[int, Dict[int, None]] = {}
+        # the counts that have books, ascending
+        self.counts: List[int] = []
+        # id -> the count the book is bucketed under
+        self.book_counts: Dict[int, int] = {}
+
+    def _add(self, book: 'Book'):
+        self._put(book.id, book.borrow_count)
+
+    def _remove(self, book: 'Book'):
+        count = self.book_counts.pop(book.id, None)
+        if count is not None:
+            self._take(book.id, count)
+
+    def _clear(self):
+        self.buckets = {}
+        self.counts = []
+        self.book_counts = {}
+
+    def refresh_book(self, book: 'Book'):
+        count = self.book_counts.get(book.id)
+        if count is not None and count != book.borrow_count:
+            self._take(book.id, count)
+            self._put(book.id, book.borrow_count)
+
+    def _put(self, book_id: int, count: int):
+        self.book_counts[book_id] = count
+        bucket = self.buckets.get(count)
+        if bucket is None:
+            bucket = self.buckets[count] = {}
+            insort(self.counts, count)
+        bucket[book_id] = None
+
+    def _take(self, book_id: int, count: int):
+        bucket = self.buckets[count]
+        del bucket[book_id]
+        if not bucket:
+            del self.buckets[count]
+            del self.counts[bisect_left(self.counts, count)]
+
+    def top(self, k: int) -> List['Book']:
+        """
+        Returns the 'k' most borrowed books, most borrowed first.
+        """
+        top_books = []
+        for count in reversed(self.counts):
+            for book_id in self.buckets[count]:
+                if len(top_books) >= k:
+                    return top_books
+                top_books.append(self.books[book_id])
+        return top_books
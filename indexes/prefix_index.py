@@ -0,0 +1,166 @@
+import heapq
+from bisect import bisect_left, insort
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set, Tuple, TYPE_CHECKING
+
+from indexes.book_index import BookIndex
+from indexes.token_index import tokenize
+
+if TYPE_CHECKING:
+    from Classes.book import Book
+
+"""
+Prefix index for the search box autocomplete.
+the normalized titles and authors (and each of their words, so "hob" completes "The Hobbit") are kept in a sorted
+array, the keys of a prefix are one bisect range of it. the ranked completions of a prefix are computed from its
+range once and cached, a borrow then only moves the book inside the cached lists of its own prefixes.
+"""
+
+# the book fields the completions come from
+SUGGEST_FIELDS = ("title", "author")
+# completions kept per cached prefix, larger suggest() requests are computed without the cache
+MAX_SUGGESTIONS = 20
+# cached prefixes, the cache is dropped when it grows past this
+MAX_CACHED_PREFIXES = 4096
+
+
+def normalize(text) -> str:
+    """Lowercase text with single spaces, e.g. "  The   Hobbit" -> "the hobbit"."""
+    return " ".join(str(text).casefold().split())
+
+
+class PrefixIndex(BookIndex):
+    def __init__(self, fields: Iterable[str] = SUGGEST_FIELDS):
+        super().__init__()
+        self.fields = tuple(fields)
+        # sorted distinct keys, and key -> (book id, field) pairs that produce it
+        self.keys: List[str] = []
+        self.entries: Dict[str, Set[Tuple[int, str]]] = defaultdict(set)
+        # prefix -> ranked (-score, completion) pairs (up to MAX_SUGGESTIONS)
+        self._completions: Dict[str, List[Tuple[int, str]]] = {}
+        # book id -> borrow_count it is ranked by
+        self._scores: Dict[int, int] = {}
+        self._rebuilding = False
+
+    def book_keys(self, book: 'Book', field: str) -> Set[str]:
+        value = normalize(getattr(book, field))
+        keys = set(tokenize(value))
+        if value:
+            keys.add(value)
+        return keys
+
+    def _add(self, book: 'Book'):
+        entries = self.entries
+        for field in self.fields:
+            entry = (book.id, field)
+            for key in self.book_keys(book, field):
+                if not self._rebuilding and key not in entries:
+                    insort(self.keys, key)
+                entries[key].add(entry)
+        self._scores[book.id] = book.borrow_count
+        if self._completions:
+            self._raise_score(book)
+
+    def _remove(self, book: 'Book'):
+        for field in self.fields:
+            for key in self.book_keys(book, field):
+                entries = self.entries.get(key)
+                if entries is None:
+                    continue
+                entries.discard((book.id, field))
+                if not entries:
+                    del self.entries[key]
+                    del self.keys[bisect_left(self.keys, key)]
+                # the book may have been ranked in, the next book of these prefixes isn't known
+                self._invalidate(key)
+        self._scores.pop(book.id, None)
+
+    def _clear(self):
+        self.keys = []
+        self.entries = defaultdict(set)
+        self._completions = {}
+        self._scores = {}
+
+    def rebuild(self, books: Iterable['Book']):
+        # one sort at the end instead of an insort per key
+        self._rebuilding = True
+        try:
+            super().rebuild(books)
+        finally:
+            self._rebuilding = False
+        self.keys = sorted(self.entries)
+
+    def refresh_book(self, book: 'Book'):
+        # the ranking uses borrow_count, which only grows by borrowing, so the cached completions are updated in place
+        previous = self._scores.get(book.id)
+        if previous is None or previous == book.borrow_count:
+            return
+        self._scores[book.id] = book.borrow_count
+        if book.borrow_count < previous:
+            for field in self.fields:
+                for key in self.book_keys(book, field):
+                    self._invalidate(key)
+        elif self._completions:
+            self._raise_score(book)
+
+    def _raise_score(self, book: 'Book'):
+        """Puts the book's completions with its (higher) score into the cached completions of its prefixes."""
+        score = book.borrow_count
+        for field in self.fields:
+            text = getattr(book, field)
+            prefixes = {key[:end] for key in self.book_keys(book, field) for end in range(1, len(key) + 1)}
+            for prefix in prefixes:
+                completions = self._completions.get(prefix)
+                if completions is None:
+                    continue
+                for position, (old_score, old_text) in enumerate(completions):
+                    if old_text == text:
+                        if old_score >= score:
+                            break
+                        del completions[position]
+                        insort(completions, (-score, text))
+                        break
+                else:
+                    # the list is cut to MAX_SUGGESTIONS only when more completions exist, so a new one competes with the last
+                    if len(completions) < MAX_SUGGESTIONS or (-score, text) < completions[-1]:
+                        insort(completions, (-score, text))
+                        del completions[MAX_SUGGESTIONS:]
+
+    def _invalidate(self, key: str):
+        if self._completions:
+            for end in range(1, len(key) + 1):
+                self._completions.pop(key[:end], None)
+
+    def _keys_range(self, prefix: str) -> Tuple[int, int]:
+        start = bisect_left(self.keys, prefix)
+        # every key starting with 'prefix' sorts before prefix + the highest code point
+        return start, bisect_left(self.keys, prefix + "\U0010ffff", start)
+
+    def suggest(self, prefix: str, k: int = 5) -> List[str]:
+        """
+        Returns up to 'k' distinct titles/authors having a key that starts with 'prefix',
+        the most borrowed first (a completion scores the borrow_count of its most borrowed book).
+        """
+        prefix = normalize(prefix)
+        if not prefix or k <= 0:
+            return []
+        if k <= MAX_SUGGESTIONS:
+            completions = self._completions.get(prefix)
+            if completions is None:
+                if len(self._completions) >= MAX_CACHED_PREFIXES:
+                    self._completions.clear()
+                completions = self._completions[prefix] = self._rank(prefix, MAX_SUGGESTIONS)
+            return [text for _, text in completions[:k]]
+        return [text for _, text in self._rank(prefix, k)]
+
+    def _rank(self, prefix: str, k: int) -> List[Tuple[int, str]]:
+        start, end = self._keys_range(prefix)
+        scores: Dict[str, int] = {}
+        books, entries = self.books, self.entries
+        for key in self.keys[start:end]:
+            for book_id, field in entries[key]:
+                book = books[book_id]
+                text = getattr(book, field)
+                if scores.get(text, -1) < book.borrow_count:
+                    scores[text] = book.borrow_count
+        return heapq.nsmallest(k, ((-score, text) for text, score in scores.items()))
@@ -0,0 +1,231 @@
+import re
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Set, TYPE_CHECKING
+
+from design_patterns.exceptions import QuerySyntaxError
+from indexes.token_index import tokenize
+
+if TYPE_CHECKING:
+    from indexes.book_index import BookIndex
+
+"""
+Structured book queries, e.g. 'author:orwell year:1940..1960 genre:dystopia available'.
+every term becomes a step answered by one of the library's indexes. the plan runs the step with the fewest estimated
+books first, and the next steps only check its ids (cheapest first), so the work follows the smallest result.
+
+terms (all must hold):
+    title:<words>  author:<words>  genre:<words> (or category:)   - all the words, like the token index search
+    year:1949  year:1940..1960  year:..1960  year:1940..         - inclusive year range
+    available  unavailable (or available:yes / available:no)
+    <words>                                                       - in the title, author or category
+a value with spaces is quoted: title:"animal farm".
+"""
+
+_TERM_PATTERN = re.compile(r'(?:(\w+):)?(?:"([^"]*)"|(\S+))')
+_YEAR_PATTERN = re.compile(r"^(\d+)?(\.\.)?(\d+)?$")
+
+TEXT_FIELDS = {"title": "title", "author": "author", "genre": "category", "category": "category"}
+QUERY_FIELDS = set(TEXT_FIELDS) | {"year", "available"}
+
+
+class QueryStep(ABC):
+    """One term of a query: its estimated books, all its ids, and the ids of a candidates set it matches."""
+    description = ""
+    index_name = ""
+
+    @abstractmethod
+    def estimate(self) -> int:
+        pass
+
+    @abstractmethod
+    def fetch(self) -> Set[int]:
+        pass
+
+    def filter(self, book_ids: Set[int]) -> Set[int]:
+        return book_ids & self.fetch()
+
+
+class TokensStep(QueryStep):
+    """All the words in one field (token index postings)."""
+    index_name = "tokens"
+
+    def __init__(self, index: 'BookIndex', field: str, words: str, description: str):
+        self.index, self.field, self.description = index, field, description
+        self.tokens = set(tokenize(words))
+        self.postings = [index.postings[field].get(token, set()) for token in self.tokens]
+
+    def estimate(self) -> int:
+        # the rarest word bounds the result
+        return min((len(ids) for ids in self.postings), default=len(self.index))
+
+    def fetch(self) -> Set[int]:
+        if not self.postings:
+            return set(self.index.books)
+        postings = sorted(self.postings, key=len)
+        result = set(postings[0])
+        for ids in postings[1:]:
+            result &= ids
+        return result
+
+    def filter(self, book_ids: Set[int]) -> Set[int]:
+        return {book_id for book_id in book_ids if all(book_id in ids for ids in self.postings)}
+
+
+class AnyFieldStep(QueryStep):
+    """A free word, in the title, author or category."""
+    index_name = "tokens"
+
+    def __init__(self, index: 'BookIndex', word: str):
+        self.description = word
+        fields = ("title", "author", "category")
+        self.postings = [index.postings[field].get(token, set()) for token in tokenize(word) for field in fields]
+        self.per_token = [self.postings[i:i + len(fields)] for i in range(0, len(self.postings), len(fields))]
+        self.index = index
+
+    def estimate(self) -> int:
+        return min((sum(len(ids) for ids in token_postings) for token_postings in self.per_token), default=len(self.index))
+
+    def fetch(self) -> Set[int]:
+        if not self.per_token:
+            return set(self.index.books)
+        result = None
+        for token_postings in self.per_token:
+            ids = set().union(*token_postings)
+            result = ids if result is None else result & ids
+        return result
+
+    def filter(self, book_ids: Set[int]) -> Set[int]:
+        return {book_id for book_id in book_ids
+                if all(any(book_id in ids for ids in token_postings) for token_postings in self.per_token)}
+
+
+class YearStep(QueryStep):
+    """An inclusive year range (sorted year array of the attribute index)."""
+    index_name = "attributes"
+
+    def __init__(self, index: 'BookIndex', low: Optional[int], high: Optional[int], description: str):
+        self.index, self.low, self.high, self.description = index, low, high, description
+
+    def estimate(self) -> int:
+        return self.index.count_years(self.low, self.high)
+
+    def fetch(self) -> Set[int]:
+        return self.index.year_range(self.low, self.high)
+
+    def filter(self, book_ids: Set[int]) -> Set[int]:
+        years = self.index.years_by_id
+        low = float("-inf") if self.low is None else self.low
+        high = float("inf") if self.high is None else self.high
+        return {book_id for book_id in book_ids if book_id in years and low <= years[book_id] <= high}
+
+
+class AvailabilityStep(QueryStep):
+    """Books with (or without) available copies (availability sets of the attribute index)."""
+    index_name = "attributes"
+
+    def __init__(self, index: 'BookIndex', available: bool):
+        self.index, self.description = index, "available" if available else "unavailable"
+        self.ids = index.available if available else index.unavailable
+
+    def estimate(self) -> int:
+        return len(self.ids)
+
+    def fetch(self) -> Set[int]:
+        return set(self.ids)
+
+    def filter(self, book_ids: Set[int]) -> Set[int]:
+        return {book_id for book_id in book_ids if book_id in self.ids}
+
+
+class QueryPlan:
+    def __init__(self, query: str, steps: List[QueryStep], catalog: 'BookIndex'):
+        self.query = query
+        # most selective first
+        self.steps = sorted(steps, key=lambda step: step.estimate())
+        # any index of all the books, only a query without terms reads all of them
+        self.catalog = catalog
+        # (step, estimate, books left after the step), filled by execute()
+        self.trace = []
+
+    def execute(self) -> Set[int]:
+        self.trace = []
+        if not self.steps:
+            return set(self.catalog.books)
+        book_ids = None
+        for step in self.steps:
+            estimate = step.estimate()
+            book_ids = step.fetch() if book_ids is None else step.filter(book_ids)
+            self.trace.append((step, estimate, len(book_ids)))
+            if not book_ids:
+                break
+        return book_ids
+
+    def explain(self) -> str:
+        lines = [f"Query plan for '{self.query}':"]
+        if not self.steps:
+            lines.append(f"  no terms, all {len(self.catalog.books)} books")
+        for number, step in enumerate(self.steps, start=1):
+            traced = next(((estimate, left) for traced_step, estimate, left in self.trace if traced_step is step), None)
+            if traced is None:
+                lines.append(f"  {number}. {step.description} [{step.index_name}] estimated {step.estimate()} - skipped, no books left")
+            else:
+                action = "scan" if number == 1 else "filter"
+                lines.append(f"  {number}. {step.description} [{step.index_name}] {action}, estimated {traced[0]} -> {traced[1]} book(s)")
+        return "\n".join(lines)
+
+
+def is_structured_query(text: str) -> bool:
+    """
+    True if a term of 'text' has a known field key (author:..., year:..., available:...), so a search like "Re:Zero"
+    is still a plain search.
+    """
+    return any(match.group(1) is not None and match.group(1).lower() in QUERY_FIELDS
+               for match in _TERM_PATTERN.finditer(text))
+
+
+def parse_year_range(query: str, value: str):
+    match = _YEAR_PATTERN.match(value)
+    if not match or not (match.group(1) or match.group(3)):
+        raise QuerySyntaxError(query, f"bad year range '{value}'")
+    low = int(match.group(1)) if match.group(1) else None
+    high = int(match.group(3)) if match.group(3) else None
+    if not match.group(2):
+        if high is not None:
+            raise QuerySyntaxError(query, f"bad year range '{value}'")
+        high = low
+    if low is not None and high is not None and low > high:
+        raise QuerySyntaxError(query, f"empty year range '{value}'")
+    return low, high
+
+
+def plan_query(query: str, book_indexes: Dict[str, 'BookIndex']) -> QueryPlan:
+    """
+    Parses 'query' to a plan over the library's indexes (raises QuerySyntaxError).
+    """
+    tokens_index, attributes_index = book_indexes["tokens"], book_indexes["attributes"]
+    steps = []
+    for match in _TERM_PATTERN.finditer(query):
+        key, quoted, plain = match.group(1), match.group(2), match.group(3)
+        value = quoted if quoted is not None else plain
+        term = match.group(0)
+        if key is None:
+            if value.lower() in ("available", "unavailable"):
+                steps.append(AvailabilityStep(attributes_index, value.lower() == "available"))
+            elif tokenize(value):
+                steps.extend(AnyFieldStep(tokens_index, word) for word in tokenize(value))
+            continue
+        key = key.lower()
+        if key in TEXT_FIELDS:
+            if not tokenize(value):
+                raise QuerySyntaxError(query, f"no words in '{term}'")
+            steps.append(TokensStep(tokens_index, TEXT_FIELDS[key], value, term))
+        elif key == "year":
+            low, high = parse_year_range(query, value)
+            steps.append(YearStep(attributes_index, low, high, term))
+        elif key == "available":
+            if value.lower() not in ("yes", "no"):
+                raise QuerySyntaxError(query, f"'{term}' should be available:yes or available:no")
+            steps.append(AvailabilityStep(attributes_index, value.lower() == "yes"))
+        else:
+            raise QuerySyntaxError(query, f"unknown field '{key}'")
+    return QueryPlan(query, steps, tokens_index)
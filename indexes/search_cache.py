@@ -0,0 +1,54 @@
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+"""
+LRU cache of search results for Library.searchBooks.
+every entry remembers the library generation it was computed at, the Library bumps its generation on every
+change that can alter a result (books added/removed/decorated, copies/availability changed, a load), so an
+entry is served only while nothing changed since it was computed.
+"""
+
+DEFAULT_CACHE_SIZE = 512
+
+
+class SearchCache:
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        if maxsize < 1:
+            raise ValueError("Search cache size must be at least 1.")
+        self.maxsize = maxsize
+        # key -> (generation, value)
+        self._entries: OrderedDict[Hashable, Tuple[int, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, generation: int) -> Optional[Any]:
+        """
+        Returns the cached value of 'key' if it was computed at 'generation', else None (a miss).
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != generation:
+            if entry is not None:
+                # stale, computed before the last change
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: Hashable, generation: int, value: Any):
+        self._entries[key] = (generation, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "maxsize": self.maxsize,
+                "hit_rate": self.hits / lookups if lookups else 0.0}
@@ -0,0 +1,115 @@
+import atexit
+import multiprocessing
+import os
+from operator import attrgetter
+from typing import Any, List, Optional, Sequence, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from Classes.book import Book
+    from design_patterns.strategy import SearchStrategy
+
+"""
+Book shards held by long-lived worker processes, for ParallelSearchStrategy.
+the books' searched text fields are split into contiguous shards (one per worker) and sent once, every search then
+only sends the strategy and the criteria to all the workers and gets back the positions of the matches. the
+positions in shard order are the serial strategy's results (same books, same order) in the searched list.
+"""
+
+# the fields the workers rebuild their books from, the wrapped strategies match on them only
+SHARD_FIELDS = ("id", "title", "author", "category", "year")
+
+
+# book -> its SHARD_FIELDS values (a tuple)
+book_row = attrgetter(*SHARD_FIELDS)
+
+
+def _book_from_row(row: tuple) -> 'Book':
+    from Classes.book import Book
+    book_id, title, author, category, year = row
+    return Book.loaded_book(title, author, year, category, 0, book_id, [], 0, [], False)
+
+
+def _shard_worker(connection):
+    """Worker loop: keeps its shard of books and answers searches on it until told to stop."""
+    books: List['Book'] = []
+    while True:
+        command, payload = connection.recv()
+        if command == "stop":
+            break
+        try:
+            if command == "load":
+                books = [_book_from_row(row) for row in payload]
+                connection.send(("ok", len(books)))
+            elif command == "search":
+                strategy, criteria = payload
+                results, _ = strategy.search(books, criteria)
+                positions = {id(book): position for position, book in enumerate(books)}
+                connection.send(("ok", ([positions[id(book)] for book in results], getattr(strategy, "field_counts", None))))
+        except Exception as e:
+            connection.send(("error", repr(e)))
+    connection.close()
+
+
+class ShardPool:
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        # spawned (not forked) workers, so they don't inherit the GUI or open files
+        context = multiprocessing.get_context("spawn")
+        self._connections = []
+        self._processes = []
+        for _ in range(self.workers):
+            parent_connection, child_connection = context.Pipe()
+            process = context.Process(target=_shard_worker, args=(child_connection,), daemon=True)
+            process.start()
+            child_connection.close()
+            self._connections.append(parent_connection)
+            self._processes.append(process)
+        # position of the first book of every shard in the loaded list
+        self.offsets: List[int] = [0] * self.workers
+        atexit.register(self.close)
+
+    def load(self, rows: Sequence[tuple]):
+        """Splits the book rows (book_row) into contiguous shards and sends each worker its shard."""
+        size = -(-len(rows) // self.workers) if rows else 0
+        self.offsets = [min(i * size, len(rows)) for i in range(self.workers)]
+        for connection, offset in zip(self._connections, self.offsets):
+            connection.send(("load", list(rows[offset:offset + size])))
+        for connection in self._connections:
+            self._receive(connection)
+
+    def search(self, strategy: 'SearchStrategy', criteria: str) -> Tuple[List[int], List[Any]]:
+        """
+        Runs the strategy on every shard concurrently.
+
+        :return: (the positions of the matching books in the loaded rows, in order,
+                  each shard's 'field_counts' of the strategy or None).
+        """
+        for connection in self._connections:
+            connection.send(("search", (strategy, criteria)))
+        positions, field_counts = [], []
+        for connection, offset in zip(self._connections, self.offsets):
+            shard_positions, counts = self._receive(connection)
+            positions.extend(offset + position for position in shard_positions)
+            field_counts.append(counts)
+        return positions, field_counts
+
+    @staticmethod
+    def _receive(connection):
+        status, payload = connection.recv()
+        if status == "error":
+            raise RuntimeError(f"Search shard worker failed: {payload}")
+        return payload
+
+    def close(self):
+        for connection in self._connections:
+            try:
+                connection.send(("stop", None))
+                connection.close()
+            except (OSError, BrokenPipeError):
+                pass
+        for process in self._processes:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
+        self._connections, self._processes = [], []
+        atexit.unregister(self.close)
@@ -0,0 +1,73 @@
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set, TYPE_CHECKING
+
+from indexes.book_index import BookIndex, BOOK_SEARCH_FIELDS
+
+if TYPE_CHECKING:
+    from Classes.book import Book
+
+"""
+Inverted index of normalized tokens: for each searched field, token -> ids of the books that contain it.
+a keyword query is answered by intersecting the posting sets of its tokens, without looking at the other books.
+"""
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text) -> List[str]:
+    """
+    Splits a text to lowercase word tokens (letters, digits and '_'), e.g. "The Lord-of" -> ["the", "lord", "of"].
+    """
+    return _TOKEN_PATTERN.findall(str(text).casefold())
+
+
+class TokenIndex(BookIndex):
+    def __init__(self, fields: Iterable[str] = BOOK_SEARCH_FIELDS):
+        super().__init__()
+        self.fields = tuple(fields)
+        self.postings: Dict[str, Dict[str, Set[int]]] = {field: defaultdict(set) for field in self.fields}
+
+    def _add(self, book: 'Book'):
+        book_id = book.id
+        for field in self.fields:
+            postings = self.postings[field]
+            for token in _TOKEN_PATTERN.findall(str(getattr(book, field)).casefold()):
+                postings[token].add(book_id)
+
+    def _remove(self, book: 'Book'):
+        for field in self.fields:
+            postings = self.postings[field]
+            for token in tokenize(getattr(book, field)):
+                ids = postings.get(token)
+                if ids is not None:
+                    ids.discard(book.id)
+                    if not ids:
+                        del postings[token]
+
+    def _clear(self):
+        self.postings = {field: defaultdict(set) for field in self.fields}
+
+    def lookup(self, field: str, criteria: str) -> Set[int]:
+        """
+        Returns the ids of the books whose 'field' contains all the tokens of 'criteria'.
+        an empty criteria matches every book (like the scanning strategies).
+        """
+        tokens = set(tokenize(criteria))
+        if not tokens:
+            return set(self.books)
+        postings = self.postings[field]
+        posting_sets = []
+        for token in tokens:
+            ids = postings.get(token)
+            if not ids:
+                return set()
+            posting_sets.append(ids)
+        # intersect from the rarest token, so the work is bounded by the smallest posting set
+        posting_sets.sort(key=len)
+        result = set(posting_sets[0])
+        for ids in posting_sets[1:]:
+            result &= ids
+            if not result:
+                break
+        return result
@@ -0,0 +1,105 @@
+from collections import defaultdict
+from typing import Dict, Iterable, Set, TYPE_CHECKING
+
+from indexes.book_index import BookIndex, BOOK_SEARCH_FIELDS
+
+if TYPE_CHECKING:
+    from Classes.book import Book
+
+"""
+Trigram index for substring search with the scanning strategies' semantics (criteria.lower() in field.lower()).
+every 3 characters window of the lowercased fields points to the ids of the books that contain it (one
+posting set per trigram for all the fields). a query's candidates are the intersection of the posting sets of
+its trigrams, and each candidate is verified against the stored lowercased field, so the results are exact.
+"""
+
+TRIGRAM_LENGTH = 3
+
+
+def trigrams(text: str) -> Set[str]:
+    return {text[i:i + TRIGRAM_LENGTH] for i in range(len(text) - TRIGRAM_LENGTH + 1)}
+
+
+class TrigramIndex(BookIndex):
+    def __init__(self, fields: Iterable[str] = BOOK_SEARCH_FIELDS):
+        super().__init__()
+        self.fields = tuple(fields)
+        self.postings: Dict[str, Set[int]] = defaultdict(set)
+        # field -> id -> lowercased value, the verification never lowercases a book again
+        self.values: Dict[str, Dict[int, str]] = {field: {} for field in self.fields}
+
+    def _book_trigrams(self, book: 'Book') -> Set[str]:
+        book_trigrams = set()
+        for field in self.fields:
+            book_trigrams |= trigrams(self.values[field][book.id])
+        return book_trigrams
+
+    def _add(self, book: 'Book'):
+        for field in self.fields:
+            self.values[field][book.id] = str(getattr(book, field)).lower()
+        postings = self.postings
+        for trigram in self._book_trigrams(book):
+            postings[trigram].add(book.id)
+
+    def _remove(self, book: 'Book'):
+        for trigram in self._book_trigrams(book):
+            ids = self.postings.get(trigram)
+            if ids is not None:
+                ids.discard(book.id)
+                if not ids:
+                    del self.postings[trigram]
+        for field in self.fields:
+            self.values[field].pop(book.id, None)
+
+    def _clear(self):
+        self.postings = defaultdict(set)
+        self.values = {field: {} for field in self.fields}
+
+    def candidates(self, criteria: str) -> Set[int] or None:
+        """
+        Returns the ids of the books that contain all the trigrams of 'criteria' in one of the fields,
+        or None for a criteria too short to have trigrams (every book is a candidate).
+        """
+        query_trigrams = trigrams(criteria.lower())
+        if not query_trigrams:
+            return None
+        posting_sets = []
+        for trigram in query_trigrams:
+            ids = self.postings.get(trigram)
+            if not ids:
+                return set()
+            posting_sets.append(ids)
+        posting_sets.sort(key=len)
+        result = set(posting_sets[0])
+        for ids in posting_sets[1:]:
+            result &= ids
+            if not result:
+                break
+        return result
+
+    def lookup_fields(self, criteria: str) -> Dict[str, Set[int]]:
+        """
+        Returns field -> ids of the books with 'criteria' as a substring of that field, from a single candidates probe.
+        """
+        query = criteria.lower()
+        candidate_ids = self.candidates(criteria)
+        matches = {}
+        for field in self.fields:
+            values = self.values[field]
+            if candidate_ids is None:
+                matches[field] = {book_id for book_id, value in values.items() if query in value}
+            else:
+                matches[field] = {book_id for book_id in candidate_ids if query in values[book_id]}
+        return matches
+
+    def lookup(self, field: str, criteria: str) -> Set[int]:
+        """
+        Returns the ids of the books with 'criteria' as a substring of 'field' (case insensitive).
+        """
+        query = criteria.lower()
+        values = self.values[field]
+        candidate_ids = self.candidates(criteria)
+        if candidate_ids is None:
+            # shorter than a trigram: checked against the stored lowercased values
+            return {book_id for book_id, value in values.items() if query in value}
+        return {book_id for book_id in candidate_ids if query in values[book_id]}
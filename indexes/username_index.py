@@ -0,0 +1,61 @@
+from typing import Dict, Iterable, List, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from Classes.user import User
+
+"""
+Username index of the library's users: case-normalized username -> users, for the login and the sign-up checks.
+new usernames are unique case-insensitively (signUp checks it), but older users files may hold names that differ
+only by case ("Bob" and "bob"), so a key keeps all its users and the exact username wins the lookup.
+"""
+
+
+def normalize_username(username: str) -> str:
+    return str(username).strip().casefold()
+
+
+class UsernameIndex:
+    def __init__(self):
+        self.users: Dict[str, List['User']] = {}
+
+    def __len__(self) -> int:
+        return sum(len(users) for users in self.users.values())
+
+    def add_user(self, user: 'User'):
+        users = self.users.setdefault(normalize_username(user.username), [])
+        if user not in users:
+            users.append(user)
+
+    def remove_user(self, user: 'User'):
+        username = normalize_username(user.username)
+        users = self.users.get(username)
+        if users is not None and user in users:
+            users.remove(user)
+            if not users:
+                del self.users[username]
+
+    def rebuild(self, users: Iterable['User']) -> List[List['User']]:
+        """
+        Indexes 'users' from scratch.
+
+        :return: the groups of users whose usernames differ only by case (empty if there are none).
+        """
+        self.users = {}
+        for user in users:
+            self.add_user(user)
+        return [users for users in self.users.values() if len(users) > 1]
+
+    def get(self, username: str) -> Optional['User']:
+        """
+        The user with this username (case-insensitive). when several users share it up to case, only the one with
+        exactly this username is returned (None if none of them has it).
+        """
+        users = self.users.get(normalize_username(username))
+        if not users:
+            return None
+        if len(users) == 1:
+            return users[0]
+        return next((user for user in users if user.username == str(username).strip()), None)
+
+    def is_taken(self, username: str) -> bool:
+        return normalize_username(username) in self.users
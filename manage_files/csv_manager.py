@@ -1,10 +1,13 @@
+import ast
 import csv
 import os
 from importlib.metadata import requires
-from typing import Any, Dict
+from typing import Any, Dict, List
 import json
 from pathlib import Path
 
+from manage_files import journal_manager, tombstone_manager
+
 user_headers_mapping = {
     "id": "user_id",
     "username": "username",
@@ -47,20 +50,25 @@ def check_csv_headers(csv_file_path: str, required_headers: list[str]) -> bool:
     """
     with open(csv_file_path, mode='r', encoding='utf-8', newline='') as infile:
         reader = csv.DictReader(infile)
-        csv_headers = reader.fieldnames
+        return check_headers(reader.fieldnames, required_headers)
 
-        # If CSV is empty or has no header row, fieldnames might be None
-        if not csv_headers:
-            csv_headers = []
 
-        missing_headers = [hdr for hdr in required_headers if hdr not in csv_headers]
+def check_headers(csv_headers, required_headers: list[str]) -> bool:
+    """
+    Same as check_csv_headers, for headers that were already read.
+    """
+    # If CSV is empty or has no header row, fieldnames might be None
+    if not csv_headers:
+        csv_headers = []
 
-        if missing_headers:
-            raise ValueError(
-                f"CSV is missing required header(s): {missing_headers}. "
-                f"CSV Headers: {csv_headers}. "
-                f"Required Headers: {required_headers}."
-            )
+    missing_headers = [hdr for hdr in required_headers if hdr not in csv_headers]
+
+    if missing_headers:
+        raise ValueError(
+            f"CSV is missing required header(s): {missing_headers}. "
+            f"CSV Headers: {csv_headers}. "
+            f"Required Headers: {required_headers}."
+        )
 
     return True
 
@@ -78,109 +86,171 @@ def load_objs_dict_from_csv(csv_file_path: str, headers_mapping: dict[str, str],
     :return: A list of objects instantiated by calling the from_json method.
     :raises ValueError: If a required CSV header is missing (re-raised from check_csv_headers).
     """
-    if obj_type == "Book":
-        modify_csv(csv_file_path)
-    # 1. Ensure the CSV has all headers required by headers_mapping.values()
-    check_csv_headers(csv_file_path, list(headers_mapping.values()))
+    return objs_dict_from_rows(read_rows_from_csv(csv_file_path, headers_mapping, obj_type), headers_mapping, obj_type)
+
 
+def objs_dict_from_rows(rows, headers_mapping: dict[str, str], obj_type: str) -> dict[int, Any]:
+    """
+    Instantiates the objects of rows that map the csv headers to their values.
+
+    :return: dict of object id -> object.
+    """
     objects = {}
-    with open(csv_file_path, mode='r', encoding='utf-8', newline='') as infile:
-        reader = csv.DictReader(infile)
+    for row in rows:
+        # Build a dict that maps the object's keys to row values
+        json_data = {}
+        for obj_key, csv_header in headers_mapping.items():
+            json_data[obj_key] = row[csv_header]
 
-        for row in reader:
-            # 2. Build a dict that maps the object's keys to row values
-            json_data = {}
-            for obj_key, csv_header in headers_mapping.items():
-                json_data[obj_key] = row[csv_header]
-
-            if obj_type == 'User':
-                from Classes.user import User
-                obj_instance = User.from_json(json_data)
-            elif obj_type == 'Book':
-                from Classes.book import Book
-                obj_instance = Book.from_json(json_data)
-            elif obj_type == 'book_decorator':
-                obj_instance = get_decorator_from_dict(json_data)
-            else:
-                raise ValueError(f"Error while loading users from csv: unknown obj type : {obj_type}")
-            if obj_instance is not None:
-                objects[int(json_data["id"])] = obj_instance
+        obj_instance = obj_from_json(json_data, obj_type)
+        if obj_instance is not None:
+            objects[int(json_data["id"])] = obj_instance
 
     return objects
 
-def modify_csv(file_path: str):
+
+def read_rows_from_csv(csv_file_path: str, headers_mapping: dict[str, str], obj_type: str) -> list[dict[str, Any]]:
     """
-    Modify the CSV file in place to fit the required structure:
-      - If there's no 'id' header, create it with int values = row number (1-based).
-      - 'title', 'genre', 'copies', 'year', 'is_loaned' headers remain the same if they exist.
-      - If there's no 'followers_ids' column, create it and fill with "[]".
-      - If there's no 'borrow_count' column, create it:
-           if is_loaned == "Yes" => borrow_count = copies
-           else => borrow_count = 0
-      - Preserve all other existing columns/values.
-    """
-
-    required_fields = [
-        "id",
-        "title",
-        "genre",
-        "copies",
-        "year",
-        "is_loaned",
-        "followers_ids",
-        "borrow_count",
-        "borrowed_users"
-    ]
+    Reads the current rows of a collection in one streaming pass: the csv snapshot with its journal replayed on top.
+    books files of an older schema get their missing columns/values filled in memory, the file is not rewritten.
 
-    # Read the original CSV
-    with open(file_path, 'r', encoding='utf-8', newline='') as infile:
+    :return: list of rows, each row maps the csv headers to the csv values.
+    :raises ValueError: If a required CSV header is missing.
+    """
+    with open(csv_file_path, mode='r', encoding='utf-8', newline='') as infile:
         reader = csv.DictReader(infile)
-        original_fieldnames = list(reader.fieldnames) if reader.fieldnames else []
+        if obj_type == "Book":
+            fieldnames, rows = book_rows_in_schema(reader, csv_file_path)
+        else:
+            fieldnames, rows = reader.fieldnames, reader
+        # 1. Ensure the CSV has all headers required by headers_mapping.values()
+        check_headers(fieldnames, list(headers_mapping.values()))
+        rows = list(rows)
+    tombstone_manager.set_rows_count(csv_file_path, len(rows))
+    # 2. skip the removed rows that are still in the file
+    rows = tombstone_manager.drop_tombstoned(csv_file_path, headers_mapping["id"], rows)
+    # 3. the csv is only a snapshot, replay the mutations journaled after it
+    return journal_manager.replay_journal(csv_file_path, headers_mapping["id"], rows)
+
+
+def obj_from_json(json_data: dict[str, Any], obj_type: str):
+    """
+    Creates the object of type 'obj_type' from a dict of its from_json keys.
+    """
+    if obj_type == 'User':
+        from Classes.user import User
+        return User.from_json(json_data)
+    elif obj_type == 'Book':
+        from Classes.book import Book
+        return Book.from_json(json_data)
+    elif obj_type == 'book_decorator':
+        return get_decorator_from_dict(json_data)
+    else:
+        raise ValueError(f"Error while loading users from csv: unknown obj type : {obj_type}")
 
-        # Determine which required fields are missing
-        missing_fields = [f for f in required_fields if f not in original_fieldnames]
 
-        # Create a new fieldnames list that combines original + any missing
-        new_fieldnames = original_fieldnames + missing_fields
+#--------------------- books csv schema ---------------------
 
-        rows = []
-        for i, row in enumerate(reader, start=1):
-            # If 'id' is missing or empty in the original, set it
-            if "id" not in row or not row["id"].strip():
-                row["id"] = i
+# version of the books csv layout. a '<csv>.schema' sidecar with this version means every row is normalized
+BOOKS_SCHEMA_VERSION = 1
+SCHEMA_SUFFIX = ".schema"
 
-            # If 'followers_ids' is missing or empty, set it to "[]"
-            if "followers_ids" not in row or not row["followers_ids"].strip():
-                row["followers_ids"] = []
+BOOK_REQUIRED_FIELDS = [
+    "id",
+    "title",
+    "genre",
+    "copies",
+    "year",
+    "is_loaned",
+    "followers_ids",
+    "borrow_count",
+    "borrowed_users"
+]
 
-            if not row.get("borrowed_users", "").strip():
-                if row["is_loaned"] == "Yes":
-                    row["borrowed_users"] = [0] * int(row.get("copies", "0").strip())
-                else:
-                    row["borrowed_users"] = []
 
-            # If 'borrow_count' is missing, calculate based on 'is_loaned' and 'copies'
-            if "borrow_count" not in row or not row["borrow_count"]:
-                    row["borrow_count"] = 0
+def schema_path(csv_file_path: str) -> str:
+    return csv_file_path + SCHEMA_SUFFIX
+
+
+def read_schema_version(csv_file_path: str) -> int:
+    """
+    Returns the schema version of a books csv, 0 if it was never migrated.
+    """
+    try:
+        with open(schema_path(csv_file_path), 'r', encoding='utf-8') as schema_file:
+            return int(schema_file.read().strip())
+    except (FileNotFoundError, ValueError):
+        return 0
+
+
+def write_schema_version(csv_file_path: str, version: int = BOOKS_SCHEMA_VERSION):
+    with open(schema_path(csv_file_path), 'w', encoding='utf-8') as schema_file:
+        schema_file.write(str(version))
+
+
+def normalize_book_row(row: dict[str, Any], row_number: int) -> dict[str, Any]:
+    """
+    Fills the missing columns/values of a books csv row with their defaults:
+      - 'id' = row number (1-based).
+      - 'followers_ids' = "[]".
+      - 'borrowed_users' (missing column only) = lost copies ([0] per copy) if is_loaned == "Yes", otherwise "[]".
+      - 'borrow_count' = 0.
+      - any other missing required column = "".
+    """
+    if not str(row.get("id") or "").strip():
+        row["id"] = str(row_number)
+
+    if not str(row.get("followers_ids") or "").strip():
+        row["followers_ids"] = "[]"
+
+    # "" is an empty list in the compact encoding, only a missing column means the borrowers are unknown
+    if row.get("borrowed_users") is None:
+        if row.get("is_loaned") == "Yes":
+            row["borrowed_users"] = json.dumps([0] * int(str(row.get("copies") or "0").strip()))
+        else:
+            row["borrowed_users"] = "[]"
 
-            # Make sure that missing columns (from new_fieldnames) are set to empty if not present
-            for field in missing_fields:
-                if field not in row:
-                    row[field] = ""
+    if not str(row.get("borrow_count") or "").strip():
+        row["borrow_count"] = "0"
 
-            # Convert all new numeric fields to string for writing consistency
-            if isinstance(row.get("id"), int):
-                row["id"] = str(row["id"])
-            if isinstance(row.get("borrow_count"), int):
-                row["borrow_count"] = str(row["borrow_count"])
+    for field in BOOK_REQUIRED_FIELDS:
+        if row.get(field) is None:
+            row[field] = ""
+    return row
 
-            rows.append(row)
+
+def book_rows_in_schema(reader: csv.DictReader, csv_file_path: str):
+    """
+    Returns the fieldnames and the rows of a books csv in the current schema.
+    rows of a file that wasn't migrated are normalized in memory while they're streamed.
+    """
+    fieldnames = list(reader.fieldnames or [])
+    missing_fields = [field for field in BOOK_REQUIRED_FIELDS if field not in fieldnames]
+    if not missing_fields and read_schema_version(csv_file_path) == BOOKS_SCHEMA_VERSION:
+        return fieldnames, reader
+    return fieldnames + missing_fields, (normalize_book_row(row, i) for i, row in enumerate(reader, start=1))
+
+
+def modify_csv(file_path: str):
+    """
+    Migrates the books CSV file in place to the current schema (see normalize_book_row)
+    and marks it with a schema sidecar, so later loads parse it in a single pass.
+    Preserves all other existing columns/values.
+    this is the explicit migrate command: python -m manage_files.csv_manager migrate <books csv>
+    """
+    # Read the original CSV
+    with open(file_path, 'r', encoding='utf-8', newline='') as infile:
+        reader = csv.DictReader(infile)
+        new_fieldnames, rows = book_rows_in_schema(reader, file_path)
+        rows = list(rows)
 
     # Write the updated CSV with both original and newly added columns
     with open(file_path, 'w', encoding='utf-8', newline='') as outfile:
         writer = csv.DictWriter(outfile, fieldnames=new_fieldnames)
         writer.writeheader()
         writer.writerows(rows)
+    write_schema_version(file_path)
+
 
 def connect_books_and_users(users: dict[int ,'User'], books: dict[int ,'Book']):
     reconnect_borrowed_books(users, books)
@@ -251,7 +321,7 @@ def connect_lost_books(books_dict : dict[int, 'Book'], users_dict : dict[int, 'U
 
 
 
-def create_empty_files(csv_file_path, headers_list, file_name_adder :str):
+def derived_file_path(csv_file_path, file_name_adder :str) -> str:
     # Split the original file into base (without extension) and the extension
     if csv_file_path:
         base, ext = os.path.splitext(csv_file_path)
@@ -264,6 +334,11 @@ def create_empty_files(csv_file_path, headers_list, file_name_adder :str):
         new_file_name = file_name_adder + ".csv"
         # Construct the new file path
         new_file_path = os.path.join(project_dir, new_file_name)
+    return new_file_path
+
+
+def create_empty_files(csv_file_path, headers_list, file_name_adder :str):
+    new_file_path = derived_file_path(csv_file_path, file_name_adder)
 
     # Create and write the new CSV file
     with open(new_file_path, 'w', encoding='utf-8', newline='') as outfile:
@@ -275,6 +350,45 @@ def create_empty_files(csv_file_path, headers_list, file_name_adder :str):
 
 
 
+def encode_id_list(ids: List[int]) -> str:
+    """
+    Encodes a list of integer ids as a compact csv cell: space separated ints ("1 2 3"), "" for an empty list.
+    """
+    return " ".join(str(int(obj_id)) for obj_id in ids)
+
+
+def decode_id_list(value: str) -> List[int]:
+    """
+    Decodes an ids list cell. reads the compact "1 2 3" encoding and the legacy "[1, 2, 3]" lists.
+    """
+    value = value.strip() if value else ""
+    if not value:
+        return []
+    if value[0] == "[":
+        # legacy cell, split it directly instead of building an AST
+        try:
+            return [int(obj_id) for obj_id in value.strip("[]").split(",") if obj_id.strip()]
+        except ValueError:
+            return [int(obj_id) for obj_id in ast.literal_eval(value)]
+    return list(map(int, value.split()))
+
+
+def obj_to_row(obj_data: Dict[str, Any], headers_mapping: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Converts an object's json dict to a csv row (csv header -> value).
+    """
+    row_data = {}
+    for obj_key, csv_header in headers_mapping.items():
+        value = obj_data.get(obj_key, "")
+        if isinstance(value, list) and all(isinstance(item, int) for item in value):
+            value = encode_id_list(value)
+        # Serialize other lists and dictionaries to JSON strings
+        elif isinstance(value, (list, dict)):
+            value = json.dumps(value)
+        row_data[csv_header] = value
+    return row_data
+
+
 def upsert_obj_to_csv(
         obj_data: Dict[str, Any],
         csv_file_path: str,
@@ -290,14 +404,39 @@ def upsert_obj_to_csv(
     :raises ValueError: If the CSV file lacks required headers.
     :raises IOError: If there's an issue reading or writing to the CSV file.
     """
+    upsert_objs_to_csv([obj_data], csv_file_path, headers_mapping)
+
+
+def upsert_objs_to_csv(
+        objs_data: List[Dict[str, Any]],
+        csv_file_path: str,
+        headers_mapping: Dict[str, str]
+) -> None:
+    """
+    Upserts a batch of objects with a single read and a single rewrite of the CSV.
+    rows with a matching 'id' are overwritten, the rest are appended (later objects win for the same id).
+    :param objs_data: A list of the objects' data dictionaries.
+    :param csv_file_path: Path to the existing CSV file.
+    :param headers_mapping: A mapping of the object's dict keys to the CSV headers.
+    :raises ValueError: If the CSV file lacks required headers.
+    :raises IOError: If there's an issue reading or writing to the CSV file.
+    """
     try:
+        # a journal left from journaled mode would be replayed over the rewritten rows by the next load, fold it first
+        compact_journal(csv_file_path, headers_mapping)
+
         # Step 1: Read all existing rows
+        is_books_csv = headers_mapping == book_headers_mapping
         with open(csv_file_path, mode='r', encoding='utf-8', newline='') as infile:
             reader = csv.DictReader(infile)
             existing_headers = reader.fieldnames
 
             if existing_headers is None:
                 raise ValueError(f"The CSV file '{csv_file_path}' has no headers.")
+            rows = reader
+            if is_books_csv:
+                # the whole file is rewritten anyway, so an older books file is migrated on the way
+                existing_headers, rows = book_rows_in_schema(reader, csv_file_path)
 
             # Verify that all required headers are present
             missing_headers = [header for header in headers_mapping.values() if header not in existing_headers]
@@ -308,51 +447,46 @@ def upsert_obj_to_csv(
                 )
 
             # Read all rows into a list
-            rows = list(reader)
-
-        # Step 2: Prepare the new row data
-        row_data = {}
-        for obj_key, csv_header in headers_mapping.items():
-            value = obj_data.get(obj_key, "")
-            # Serialize lists and dictionaries to JSON strings
-            if isinstance(value, (list, dict)):
-                value = json.dumps(value)
-            row_data[csv_header] = value
+            rows = list(rows)
 
-        # Step 3: Determine the 'id' header and the object 'id' value
+        # Step 2: Determine the 'id' header
         id_header = headers_mapping.get('id')
         if not id_header:
             raise ValueError("Headers mapping must include a mapping for 'id'.")
-
-        obj_id = str(obj_data.get('id', '')).strip()
-        if not obj_id:
-            raise ValueError("Object data must include a non-empty 'id'.")
-
-        # Step 4: Search for an existing row with the same 'id'
-        row_found = False
-        for index, row in enumerate(rows):
-            if row.get(id_header, '').strip() == obj_id:
-                # Overwrite the existing row
-                rows[index] = row_data
-                row_found = True
-                break
-
-        if not row_found:
-            # Append the new row
-            rows.append(row_data)
+        # the file is rewritten anyway, so the tombstoned rows are dropped on the way
+        rows = tombstone_manager.drop_tombstoned(csv_file_path, id_header, rows)
+        rows_index = {row.get(id_header, '').strip(): index for index, row in enumerate(rows)}
+
+        for obj_data in objs_data:
+            # Step 3: Prepare the new row data and the object 'id' value
+            row_data = obj_to_row(obj_data, headers_mapping)
+            obj_id = str(obj_data.get('id', '')).strip()
+            if not obj_id:
+                raise ValueError("Object data must include a non-empty 'id'.")
+
+            # Step 4: Overwrite the existing row with the same 'id' or append a new one
+            if obj_id in rows_index:
+                rows[rows_index[obj_id]] = row_data
+            else:
+                rows_index[obj_id] = len(rows)
+                rows.append(row_data)
 
         # Step 5: Write all rows back to the CSV
         with open(csv_file_path, mode='w', encoding='utf-8', newline='') as outfile:
             writer = csv.DictWriter(outfile, fieldnames=existing_headers)
             writer.writeheader()
             writer.writerows(rows)
+        if is_books_csv:
+            write_schema_version(csv_file_path)
+        tombstone_manager.clear_tombstones(csv_file_path)
+        tombstone_manager.set_rows_count(csv_file_path, len(rows))
 
     except FileNotFoundError:
         raise FileNotFoundError(f"The CSV file '{csv_file_path}' does not exist.")
     except IOError as e:
         raise IOError(f"An I/O error occurred: {e}")
     except Exception as e:
-        raise Exception(f"An unexpected error occurred: {e}. func args = {obj_data}, {csv_file_path}, {headers_mapping}")
+        raise Exception(f"An unexpected error occurred: {e}. func args = {objs_data}, {csv_file_path}, {headers_mapping}")
 
 
 def get_decorator_from_dict(deco_dict : Dict[str, Any]):
@@ -397,59 +531,115 @@ def format_json_dict(json_dict):
 
 
 
-def remove_book_from_csv(book_id: int, csv_file_path: str):
+def remove_obj_from_csv(obj_id: int, csv_file_path: str, headers_mapping: Dict[str, str]):
+    """
+    Removes the object with the specified ID from the CSV file right away (one rewrite of the file).
+    for many removals use remove_objs_from_csv, that only records tombstones.
+
+    :param obj_id: int - The ID of the object to be removed.
+    :param csv_file_path: str - The path to the CSV file.
+    :param headers_mapping: the collection's mapping of the object's dict keys to the CSV headers.
     """
-    Removes the book with the specified ID from the CSV file.
+    if csv_file_path is None:
+        print("Warning: csv_file_path is non. skipping file modification.")
+        return False
+    tombstones = tombstone_manager.read_tombstones(csv_file_path)
+    return _rewrite_csv_without(csv_file_path, tombstones | {str(obj_id).strip()}, headers_mapping)
+
 
-    :param book_id: int - The ID of the book to be removed.
+def remove_objs_from_csv(obj_ids, csv_file_path: str, headers_mapping: Dict[str, str]) -> bool:
+    """
+    Removes objects by recording their ids as tombstones (one append to the '.deleted' sidecar).
+    the file is rewritten without the tombstoned rows only when they pass TOMBSTONE_COMPACTION_RATIO.
+
+    :param obj_ids: iterable of the ids of the objects to be removed.
     :param csv_file_path: str - The path to the CSV file.
+    :param headers_mapping: the collection's mapping of the object's dict keys to the CSV headers.
     """
     if csv_file_path is None:
         print("Warning: csv_file_path is non. skipping file modification.")
+        return False
+    tombstone_manager.add_tombstones(csv_file_path, obj_ids)
+    if tombstone_manager.needs_compaction(csv_file_path):
+        compact_tombstones(csv_file_path, headers_mapping)
+    return True
+
+
+def compact_tombstones(csv_file_path: str, headers_mapping: Dict[str, str]) -> None:
+    """
+    Rewrites the csv once without its tombstoned rows and deletes the sidecar.
+    """
+    if csv_file_path is None or not tombstone_manager.read_tombstones(csv_file_path):
         return
+    _rewrite_csv_without(csv_file_path, tombstone_manager.read_tombstones(csv_file_path), headers_mapping)
+
+
+def _rewrite_csv_without(csv_file_path: str, removed_ids: set[str], headers_mapping: Dict[str, str]) -> bool:
+    """
+    Streams the csv into a temp file without the rows of 'removed_ids' and replaces the file with it.
+    the tombstones are all dropped by the rewrite, so the sidecar is deleted.
+    only a books csv is migrated to the books schema on the way (and gets its schema sidecar).
+
+    :return: bool - True if at least one row was removed.
+    """
     path = Path(csv_file_path)  # Convert string path to Path object
     temp_file = path.with_suffix('.tmp')  # Create a temporary file with .tmp suffix
+    is_books_csv = headers_mapping == book_headers_mapping
+    id_header = headers_mapping["id"]
+    removed = False
+    rows_count = 0
 
     try:
         with path.open(mode='r', encoding='utf-8', newline='') as csvfile, \
              temp_file.open(mode='w', encoding='utf-8', newline='') as temp_csvfile:
 
             reader = csv.DictReader(csvfile)
-            fieldnames = reader.fieldnames
-            if fieldnames is None:
+            if reader.fieldnames is None:
                 print("CSV file has no header.")
-                return
+                return False
+            fieldnames, rows = list(reader.fieldnames), reader
+            if is_books_csv:
+                fieldnames, rows = book_rows_in_schema(reader, csv_file_path)
 
             writer = csv.DictWriter(temp_csvfile, fieldnames=fieldnames)
             writer.writeheader()
-            removed = False
-            for row in reader:
+            for row in rows:
                 try:
-                    current_id = int(row['id'])
-                    if current_id != book_id:
+                    current_id = str(int(row[id_header]))
+                    if current_id not in removed_ids:
                         writer.writerow(row)
+                        rows_count += 1
                     else:
                         removed = True
                 except ValueError:
                     print(f"Invalid ID value in row: {row}")
                 except Exception as e:
                     print(f"Error processing row {row}: {e}")
+            temp_csvfile.flush()
+            os.fsync(temp_csvfile.fileno())
         # Replace original CSV with the temp file
         temp_file.replace(path)
+        if is_books_csv:
+            write_schema_version(csv_file_path)
+        tombstone_manager.clear_tombstones(csv_file_path)
+        tombstone_manager.set_rows_count(csv_file_path, rows_count)
     except FileNotFoundError:
         print(f"The file {csv_file_path} does not exist.")
     except Exception as e:
-        print(f"Failed to remove book from CSV: {e}")
+        print(f"Failed to remove rows from CSV: {e}")
         if temp_file.exists():
             temp_file.unlink()  # Remove the temp file in case of failure
     return removed
 
 
-def update_csv(args_list : list[dict:str,Any]):
+def update_csv(args_list : list[dict:str,Any], journaled: bool = False):
     """
     :param args_list: list[dict] - The list of arguments to execute upsert functions with.
+                      consecutive upserts to the same csv file are written together in one batch.
+    :param journaled: bool - append the upserts to the collections journals instead of rewriting the csv files.
     """
     required_args = ["obj_data", "csv_file_path", "headers_mapping"]
+    batches = []
     for args in args_list:
         missing_args = [arg for arg in required_args if arg not in args]
         if missing_args:
@@ -461,5 +651,104 @@ def update_csv(args_list : list[dict:str,Any]):
         if empty_args:
             print(f"Error when passing args for writing to file : Empty arguments: {empty_args} \n")
 
-        upsert_obj_to_csv(obj_data= args["obj_data"], csv_file_path= args["csv_file_path"], headers_mapping= args["headers_mapping"])
+        if batches and batches[-1][0] == args["csv_file_path"]:
+            batches[-1][2].append(args["obj_data"])
+        else:
+            batches.append((args["csv_file_path"], args["headers_mapping"], [args["obj_data"]]))
+
+    for csv_file_path, headers_mapping, objs_data in batches:
+        if journaled:
+            journal_upsert_objs(objs_data= objs_data, csv_file_path= csv_file_path, headers_mapping= headers_mapping)
+        else:
+            upsert_objs_to_csv(objs_data= objs_data, csv_file_path= csv_file_path, headers_mapping= headers_mapping)
+
+
+#--------------------- journaled persistence ---------------------
+
+def journal_upsert_obj(obj_data: Dict[str, Any], csv_file_path: str, headers_mapping: Dict[str, str]) -> None:
+    """
+    Appends an upsert record of the object to the journal of 'csv_file_path'. costs O(record), the csv
+    snapshot is only rewritten when the journal passes JOURNAL_COMPACTION_THRESHOLD records.
+    """
+    journal_upsert_objs([obj_data], csv_file_path, headers_mapping)
+
 
+def journal_upsert_objs(objs_data: List[Dict[str, Any]], csv_file_path: str, headers_mapping: Dict[str, str]) -> None:
+    """
+    Appends upsert records of all the objects to the journal of 'csv_file_path' with a single write.
+    """
+    records = []
+    for obj_data in objs_data:
+        obj_id = str(obj_data.get('id', '')).strip()
+        if not obj_id:
+            raise ValueError("Object data must include a non-empty 'id'.")
+        records.append(journal_manager.upsert_record(obj_to_row(obj_data, headers_mapping), obj_id))
+    records_count = journal_manager.append_records(csv_file_path, records)
+    if records_count >= journal_manager.JOURNAL_COMPACTION_THRESHOLD:
+        compact_journal(csv_file_path, headers_mapping)
+
+
+def journal_remove_book(book_id: int, csv_file_path: str, headers_mapping: Dict[str, str]) -> bool:
+    """
+    Appends a delete record for the book to the journal of 'csv_file_path'.
+    """
+    return journal_remove_books([book_id], csv_file_path, headers_mapping)
+
+
+def journal_remove_books(book_ids, csv_file_path: str, headers_mapping: Dict[str, str]) -> bool:
+    """
+    Appends delete records for all the books to the journal of 'csv_file_path' with a single write.
+    """
+    if csv_file_path is None:
+        print("Warning: csv_file_path is non. skipping file modification.")
+        return False
+    records = [journal_manager.delete_record(book_id) for book_id in book_ids]
+    records_count = journal_manager.append_records(csv_file_path, records)
+    if records_count >= journal_manager.JOURNAL_COMPACTION_THRESHOLD:
+        compact_journal(csv_file_path, headers_mapping)
+    return True
+
+
+def compact_journal(csv_file_path: str, headers_mapping: Dict[str, str]) -> None:
+    """
+    Folds the journal into a new csv snapshot: writes snapshot + journal to a temp file,
+    atomically replaces the csv with it and then deletes the journal.
+    """
+    if csv_file_path is None or journal_manager.journal_records_count(csv_file_path) == 0:
+        return
+    path = Path(csv_file_path)
+    temp_file = path.with_suffix('.tmp')
+    is_books_csv = headers_mapping == book_headers_mapping
+    with path.open(mode='r', encoding='utf-8', newline='') as infile:
+        reader = csv.DictReader(infile)
+        fieldnames, rows = list(reader.fieldnames or []), reader
+        if is_books_csv:
+            fieldnames, rows = book_rows_in_schema(reader, csv_file_path)
+        rows = list(rows)
+    fieldnames += [header for header in headers_mapping.values() if header not in fieldnames]
+    rows = tombstone_manager.drop_tombstoned(csv_file_path, headers_mapping["id"], rows)
+    rows = journal_manager.replay_journal(csv_file_path, headers_mapping["id"], rows)
+
+    with temp_file.open(mode='w', encoding='utf-8', newline='') as outfile:
+        writer = csv.DictWriter(outfile, fieldnames=fieldnames, restval="")
+        writer.writeheader()
+        writer.writerows(rows)
+        outfile.flush()
+        os.fsync(outfile.fileno())
+    temp_file.replace(path)
+    if is_books_csv:
+        write_schema_version(csv_file_path)
+    tombstone_manager.clear_tombstones(csv_file_path)
+    tombstone_manager.set_rows_count(csv_file_path, len(rows))
+    journal_manager.clear_journal(csv_file_path)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Library csv files maintenance.")
+    parser.add_argument("command", choices=["migrate"], help="migrate: rewrite a books csv in the current schema")
+    parser.add_argument("csv_file_path", help="path of the books csv file")
+    cli_args = parser.parse_args()
+    modify_csv(cli_args.csv_file_path)
+    print(f"Migrated '{cli_args.csv_file_path}' to books schema version {BOOKS_SCHEMA_VERSION}.")
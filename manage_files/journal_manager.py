@@ -0,0 +1,122 @@
+import json
+import os
+from typing import Any, Dict, List
+
+"""
+Append-only journal for the csv collections.
+every mutation is appended as one json line to '<csv file>.journal', the csv file itself is only a snapshot
+that gets rewritten when the journal is compacted. loading = snapshot rows + replayed journal records.
+"""
+
+JOURNAL_SUFFIX = ".journal"
+# number of records after which the journal is folded back into the csv snapshot
+JOURNAL_COMPACTION_THRESHOLD = 1000
+# fsync after every append, so a committed lend/return survives a crash
+JOURNAL_FSYNC = True
+
+UPSERT_OP = "upsert"
+DELETE_OP = "delete"
+
+# records currently waiting in each journal file (lazily counted on first access)
+_records_count: dict[str, int] = {}
+
+
+def journal_path(csv_file_path: str) -> str:
+    return csv_file_path + JOURNAL_SUFFIX
+
+
+def journal_records_count(csv_file_path: str) -> int:
+    """
+    Returns the number of records in the journal of the given csv file.
+    the file is counted only once, after that the counter is kept in memory.
+    """
+    if csv_file_path not in _records_count:
+        path = journal_path(csv_file_path)
+        count = 0
+        if os.path.exists(path):
+            with open(path, mode='r', encoding='utf-8') as journal:
+                count = sum(1 for line in journal if line.strip())
+        _records_count[csv_file_path] = count
+    return _records_count[csv_file_path]
+
+
+def append_records(csv_file_path: str, records: List[Dict[str, Any]]) -> int:
+    """
+    Appends the records to the journal of 'csv_file_path' with a single write (and fsync).
+
+    :param csv_file_path: str - the csv snapshot the journal belongs to.
+    :param records: list of dicts with keys 'op', 'id' and for upserts 'row' (csv header -> csv value).
+    :return: int - the number of records in the journal after the append.
+    """
+    if not records:
+        return journal_records_count(csv_file_path)
+    count = journal_records_count(csv_file_path)
+    data = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+    with open(journal_path(csv_file_path), mode='a', encoding='utf-8', newline='') as journal:
+        journal.write(data)
+        journal.flush()
+        if JOURNAL_FSYNC:
+            os.fsync(journal.fileno())
+    _records_count[csv_file_path] = count + len(records)
+    return _records_count[csv_file_path]
+
+
+def upsert_record(row_data: Dict[str, Any], obj_id: str) -> Dict[str, Any]:
+    return {"op": UPSERT_OP, "id": str(obj_id).strip(), "row": row_data}
+
+
+def delete_record(obj_id) -> Dict[str, Any]:
+    return {"op": DELETE_OP, "id": str(obj_id).strip()}
+
+
+def read_records(csv_file_path: str) -> List[Dict[str, Any]]:
+    """
+    Reads all the records of the journal. a torn last line (crash in the middle of an append) is ignored.
+    """
+    path = journal_path(csv_file_path)
+    records = []
+    if not os.path.exists(path):
+        _records_count[csv_file_path] = 0
+        return records
+    with open(path, mode='r', encoding='utf-8') as journal:
+        for line in journal:
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                print(f"Warning: skipping corrupted journal record in {path}: {line.strip()}")
+    _records_count[csv_file_path] = len(records)
+    return records
+
+
+def replay_journal(csv_file_path: str, id_header: str, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Applies the journal of 'csv_file_path' on top of the snapshot rows.
+
+    :param csv_file_path: str - the csv snapshot the journal belongs to.
+    :param id_header: str - the csv header that holds the id of each row.
+    :param rows: the snapshot rows, as read by csv.DictReader.
+    :return: the rows after replaying the journal, in snapshot order (new rows appended at the end).
+    """
+    records = read_records(csv_file_path)
+    if not records:
+        return rows
+    rows_by_id = {str(row.get(id_header, "")).strip(): row for row in rows}
+    for record in records:
+        obj_id = str(record.get("id", "")).strip()
+        if record.get("op") == UPSERT_OP:
+            # re-inserting after a delete moves the row to the end, same as a csv append
+            rows_by_id[obj_id] = record["row"]
+        elif record.get("op") == DELETE_OP:
+            rows_by_id.pop(obj_id, None)
+        else:
+            print(f"Warning: unknown journal op '{record.get('op')}' in {journal_path(csv_file_path)}")
+    return list(rows_by_id.values())
+
+
+def clear_journal(csv_file_path: str):
+    path = journal_path(csv_file_path)
+    if os.path.exists(path):
+        os.remove(path)
+    _records_count[csv_file_path] = 0
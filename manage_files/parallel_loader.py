@@ -0,0 +1,66 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from manage_files import csv_manager
+
+"""
+Parallel startup loading of the csv collections.
+the books, users and book decorators files are parsed concurrently in a process pool (csv text -> tuples,
+with the schema normalization, tombstones and journal replay of csv_manager.read_rows_from_csv).
+the objects and their links are built afterwards in the main process, since the object graph,
+the id allocators and the Library singleton live there.
+"""
+
+# below this total size the files are parsed in-process, starting the pool would cost more than it saves
+PARALLEL_MIN_BYTES = 1_000_000
+
+# progress(message, done steps, total steps)
+ProgressCallback = Callable[[str, int, int], None]
+
+
+def parse_csv_file(csv_file_path: str, headers_mapping: Dict[str, str], obj_type: str) -> Tuple[List[str], List[tuple]]:
+    """
+    Reads the current rows of a collection and returns them as tuples (cheaper to send between processes than dicts).
+
+    :return: (headers, rows) - the csv headers of 'headers_mapping' and a tuple of their values per row.
+    """
+    headers = list(headers_mapping.values())
+    rows = csv_manager.read_rows_from_csv(csv_file_path, headers_mapping, obj_type)
+    return headers, [tuple(row.get(header, "") for header in headers) for row in rows]
+
+
+def rows_from_tuples(headers: List[str], rows: List[tuple]) -> List[Dict[str, Any]]:
+    return [dict(zip(headers, row)) for row in rows]
+
+
+def parse_collections(collections: Dict[str, Tuple[str, Dict[str, str], str]], progress: Optional[ProgressCallback] = None,
+                      max_workers: Optional[int] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Parses several csv collections concurrently.
+
+    :param collections: dict of name -> (csv file path, headers mapping, obj type).
+    :param progress: optional callback, called in the calling thread after each parsed file.
+    :param max_workers: int - number of worker processes (one per file by default).
+    :return: dict of name -> rows (csv header -> csv value).
+    """
+    total = len(collections)
+    parsed = {}
+    total_size = sum(os.path.getsize(path) for path, _, _ in collections.values() if os.path.exists(path))
+    # a single core gains nothing from workers, it only pays for sending the rows back
+    if total <= 1 or total_size < PARALLEL_MIN_BYTES or (os.cpu_count() or 1) < 2:
+        for done, (name, (path, headers_mapping, obj_type)) in enumerate(collections.items(), start=1):
+            parsed[name] = csv_manager.read_rows_from_csv(path, headers_mapping, obj_type)
+            if progress:
+                progress(f"Parsed {name} file", done, total)
+        return parsed
+
+    with ProcessPoolExecutor(max_workers=max_workers or total) as executor:
+        futures = {executor.submit(parse_csv_file, path, headers_mapping, obj_type): name
+                   for name, (path, headers_mapping, obj_type) in collections.items()}
+        for done, future in enumerate(as_completed(futures), start=1):
+            name = futures[future]
+            parsed[name] = rows_from_tuples(*future.result())
+            if progress:
+                progress(f"Parsed {name} file", done, total)
+    return parsed
@@ -0,0 +1,318 @@
+import gc
+import os
+import struct
+import sys
+import zlib
+from array import array
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+"""
+Binary snapshot of the whole library (books, users, book decorators, followers and loans).
+the csv files stay the import/export format, the snapshot is only for a fast startup: every column is a
+fixed-width little-endian integer array (int64 ids, int32 for the rest), all the texts are indexes into one string table and the
+id lists (followers, loans, history) are stored as offsets + flat ids arrays, so loading is a few
+array reads and the object graph is rebuilt directly, without parsing text or a relinking pass.
+
+layout: header (magic, format version, payload length, crc32 of the payload) followed by the payload.
+"""
+
+SNAPSHOT_MAGIC = b"LIBSNAP\0"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SUFFIX = ".snapshot"
+# magic, format version, payload length, crc32
+_HEADER = struct.Struct("<8sHQI")
+_ARRAY_HEADER = struct.Struct("<cQ")
+
+# user roles and decorator types are stored as small codes
+_ROLES = ["regular user", "librarian"]
+_DECORATOR_TYPES = ["description", "cover_image"]
+
+
+class SnapshotError(ValueError):
+    """Raised for a snapshot file that is not a valid snapshot of this format."""
+    pass
+
+
+#------------------- low level -------------------
+
+def _int_array(typecode: str, values) -> array:
+    arr = array(typecode, values)
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr
+
+
+class _Writer:
+    def __init__(self):
+        self.parts: List[bytes] = []
+        self._strings: Dict[str, int] = {}
+        self._strings_list: List[str] = []
+
+    def string_index(self, value: Optional[str]) -> int:
+        """Returns the index of 'value' in the string table, -1 for None."""
+        if value is None:
+            return -1
+        index = self._strings.get(value)
+        if index is None:
+            index = len(self._strings_list)
+            self._strings[value] = index
+            self._strings_list.append(value)
+        return index
+
+    def write_array(self, typecode: str, values):
+        arr = _int_array(typecode, values)
+        self.parts.append(_ARRAY_HEADER.pack(typecode.encode("ascii"), len(arr)))
+        self.parts.append(arr.tobytes())
+
+    def write_id_lists(self, id_lists: List[List[int]]):
+        """Writes a list of id lists as (offsets, flat ids)."""
+        offsets = [0]
+        flat_ids: List[int] = []
+        for ids in id_lists:
+            flat_ids.extend(ids)
+            offsets.append(len(flat_ids))
+        self.write_array("I", offsets)
+        self.write_array("q", flat_ids)
+
+    def strings_table(self) -> bytes:
+        # offsets are in characters of the decoded text, so reading a string is a str slice
+        offsets = [0]
+        for value in self._strings_list:
+            offsets.append(offsets[-1] + len(value))
+        blob = "".join(self._strings_list).encode("utf-8")
+        arr = _int_array("Q", offsets)
+        return (_ARRAY_HEADER.pack(b"Q", len(arr)) + arr.tobytes() +
+                struct.pack("<Q", len(blob)) + blob)
+
+
+class _Reader:
+    def __init__(self, payload: bytes):
+        self.view = memoryview(payload)
+        self.pos = 0
+
+    def read_array(self, expected_typecode: str) -> array:
+        """Reads the next array, checking it has the expected type."""
+        typecode, count = _ARRAY_HEADER.unpack_from(self.view, self.pos)
+        self.pos += _ARRAY_HEADER.size
+        if typecode.decode("ascii") != expected_typecode:
+            raise SnapshotError(f"Corrupted snapshot: expected a '{expected_typecode}' array.")
+        arr = array(expected_typecode)
+        end = self.pos + count * arr.itemsize
+        arr.frombytes(self.view[self.pos:end])
+        if sys.byteorder == "big":
+            arr.byteswap()
+        self.pos = end
+        return arr
+
+    def read_id_lists(self) -> List[List[int]]:
+        offsets = self.read_array("I").tolist()
+        flat_ids = self.read_array("q").tolist()
+        return [flat_ids[start:end] for start, end in zip(offsets, offsets[1:])]
+
+    def read_strings(self) -> List[str]:
+        offsets = self.read_array("Q").tolist()
+        (blob_length,) = struct.unpack_from("<Q", self.view, self.pos)
+        self.pos += 8
+        text = bytes(self.view[self.pos:self.pos + blob_length]).decode("utf-8")
+        self.pos += blob_length
+        return [text[start:end] for start, end in zip(offsets, offsets[1:])]
+
+
+def _decorators_chain(decorator) -> tuple[Any, List[tuple[int, str]]]:
+    """
+    Returns the decorated book and its (type code, value) decorators, innermost first.
+    """
+    from design_patterns.decorator import BookDecorator, CoverDecorator
+    chain = []
+    current = decorator
+    while isinstance(current, BookDecorator):
+        if isinstance(current, CoverDecorator):
+            chain.append((_DECORATOR_TYPES.index("cover_image"), current.cover_image))
+        else:
+            chain.append((_DECORATOR_TYPES.index("description"), current.description))
+        current = current._wrapped_book
+    chain.reverse()
+    return current, chain
+
+
+#------------------- save -------------------
+
+def save_snapshot(snapshot_path: str, users: Dict[int, Any], books: Dict[int, Any],
+                  decorated_books: Dict[int, Any], csv_paths: Dict[str, Optional[str]]) -> None:
+    """
+    Writes the library collections to 'snapshot_path' atomically (temp file, fsync, replace).
+
+    :param csv_paths: dict - 'users', 'books' and 'book_decorators' csv paths, restored on load.
+    """
+    writer = _Writer()
+
+    writer.write_array("i", [writer.string_index(csv_paths.get(name))
+                             for name in ("users", "books", "book_decorators")])
+
+    books_list = list(books.values())
+    writer.write_array("q", [book.id for book in books_list])
+    writer.write_array("i", [writer.string_index(book.title) for book in books_list])
+    writer.write_array("i", [writer.string_index(book.author) for book in books_list])
+    writer.write_array("i", [writer.string_index(str(book.category)) for book in books_list])
+    writer.write_array("i", [int(book.year) for book in books_list])
+    writer.write_array("i", [int(book.copies) for book in books_list])
+    writer.write_array("i", [int(book.available_copies) for book in books_list])
+    writer.write_array("i", [int(book.borrow_count) for book in books_list])
+    writer.write_array("B", [1 if book.isLoaned else 0 for book in books_list])
+    writer.write_id_lists([[user.id for user in book.user_observers] for book in books_list])
+    writer.write_id_lists([list(book.borrowed_users) for book in books_list])
+
+    users_list = list(users.values())
+    writer.write_array("q", [user.id for user in users_list])
+    writer.write_array("i", [writer.string_index(user.username) for user in users_list])
+    writer.write_array("i", [writer.string_index(user.passwordHash) for user in users_list])
+    writer.write_array("B", [_ROLES.index(user.role) for user in users_list])
+    # loans that couldn't be connected to a book are kept as ids as well
+    writer.write_id_lists([[book.id for book in user.borrowedBooks] + list(user.temp_borrowedBooks)
+                           for user in users_list])
+    writer.write_id_lists([list(user.previously_borrowed_books) for user in users_list])
+
+    decorators = []
+    for deco_book in decorated_books.values():
+        if deco_book is not None:
+            book, chain = _decorators_chain(deco_book)
+            decorators.append((book.id, chain))
+    writer.write_array("q", [book_id for book_id, _ in decorators])
+    writer.write_id_lists([[type_code for type_code, _ in chain] for _, chain in decorators])
+    writer.write_id_lists([[writer.string_index(value) for _, value in chain] for _, chain in decorators])
+
+    payload = writer.strings_table() + b"".join(writer.parts)
+    header = _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(payload), zlib.crc32(payload))
+
+    path = Path(snapshot_path)
+    temp_file = path.with_name(path.name + ".tmp")
+    with temp_file.open(mode="wb") as outfile:
+        outfile.write(header)
+        outfile.write(payload)
+        outfile.flush()
+        os.fsync(outfile.fileno())
+    temp_file.replace(path)
+
+
+#------------------- load -------------------
+
+def read_payload(snapshot_path: str) -> bytes:
+    """
+    Reads the snapshot payload after checking the magic, the format version and the checksum.
+    """
+    with open(snapshot_path, "rb") as infile:
+        data = infile.read()
+    if len(data) < _HEADER.size:
+        raise SnapshotError(f"'{snapshot_path}' is not a library snapshot.")
+    magic, version, payload_length, checksum = _HEADER.unpack_from(data)
+    if magic != SNAPSHOT_MAGIC:
+        raise SnapshotError(f"'{snapshot_path}' is not a library snapshot.")
+    if version != SNAPSHOT_VERSION:
+        raise SnapshotError(f"Unsupported snapshot version {version} (expected {SNAPSHOT_VERSION}).")
+    payload = data[_HEADER.size:]
+    if len(payload) != payload_length or zlib.crc32(payload) != checksum:
+        raise SnapshotError(f"Snapshot '{snapshot_path}' is corrupted (checksum mismatch).")
+    return payload
+
+
+def load_snapshot(snapshot_path: str, lost_books_user) -> Dict[str, Any]:
+    """
+    Rebuilds the library object graph from a snapshot.
+    the loans of user id 0 are given to 'lost_books_user' (the library's own user).
+
+    :return: dict with 'users', 'books', 'decorated_books' (id -> object) and 'csv_paths'.
+    """
+    # the load allocates millions of small objects at once, the cyclic gc passes it would trigger
+    # on the way only rescan the new objects and take most of the load time
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return _build_library(_Reader(read_payload(snapshot_path)), lost_books_user)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def _build_library(reader: _Reader, lost_books_user) -> Dict[str, Any]:
+    from Classes.book import Book
+    from Classes.user import User, Librarian, LIBRARIAN_DEFAULT_PERMISSIONS
+    from design_patterns.decorator import CoverDecorator, DescriptionDecorator
+
+    strings = reader.read_strings()
+
+    def string_at(index: int) -> Optional[str]:
+        return None if index < 0 else strings[index]
+
+    users_path, books_path, decorators_path = [string_at(index) for index in reader.read_array("i")]
+
+    #--- books
+    book_ids = reader.read_array("q").tolist()
+    titles, authors, categories = [[strings[index] for index in reader.read_array("i")] for _ in range(3)]
+    years, copies, available, borrow_counts = [reader.read_array("i").tolist() for _ in range(4)]
+    is_loaned = reader.read_array("B").tolist()
+    followers, borrowed_users = reader.read_id_lists(), reader.read_id_lists()
+
+    books: Dict[int, Book] = {}
+    for book_id, title, author, year, category, book_copies, available_copies, borrow_count, loaned, borrowed \
+            in zip(book_ids, titles, authors, years, categories, copies, available, borrow_counts, is_loaned, borrowed_users):
+        book = Book(title, author, year, category, book_copies)
+        book.id = book_id
+        book.available_copies = available_copies
+        book.borrow_count = borrow_count
+        book.isLoaned = bool(loaned)
+        book.borrowed_users = borrowed
+        books[book_id] = book
+    Book.book_ids.reserve_many(book_ids)
+
+    #--- users
+    user_ids = reader.read_array("q")
+    usernames, password_hashes, roles = reader.read_array("i"), reader.read_array("i"), reader.read_array("B")
+    borrowed_books, previously_borrowed = reader.read_id_lists(), reader.read_id_lists()
+
+    users: Dict[int, User] = {}
+    for i, user_id in enumerate(user_ids):
+        if user_id == 0:
+            user = lost_books_user
+        elif _ROLES[roles[i]] == "librarian":
+            user = Librarian(username=strings[usernames[i]], permissions=LIBRARIAN_DEFAULT_PERMISSIONS,
+                             password_hash=strings[password_hashes[i]])
+        else:
+            user = User(username=strings[usernames[i]], password_hash=strings[password_hashes[i]])
+        user.id = user_id
+        user.previously_borrowed_books = previously_borrowed[i]
+        loans, missing = [], []
+        for book_id in borrowed_books[i]:
+            if book_id in books:
+                loans.append(books[book_id])
+            else:
+                missing.append(book_id)
+        user.borrowedBooks = loans
+        user.temp_borrowedBooks = missing
+        users[user_id] = user
+    User.users_ids.reserve_many(users.keys())
+    if 0 not in users:
+        users[0] = lost_books_user
+
+    # followers are linked after all the users exist
+    for book, followers_ids in zip(books.values(), followers):
+        book.user_observers = [users[user_id] for user_id in followers_ids if user_id in users]
+        book.temp_followers = [user_id for user_id in followers_ids if user_id not in users]
+
+    #--- decorators
+    decorated_ids = reader.read_array("q")
+    decorator_types, decorator_values = reader.read_id_lists(), reader.read_id_lists()
+    decorated_books = {}
+    for book_id, types, values in zip(decorated_ids, decorator_types, decorator_values):
+        if book_id not in books:
+            continue
+        decorator = books[book_id]
+        for type_code, value_index in zip(types, values):
+            if _DECORATOR_TYPES[type_code] == "cover_image":
+                decorator = CoverDecorator(decorator, strings[value_index])
+            else:
+                decorator = DescriptionDecorator(decorator, strings[value_index])
+        decorated_books[book_id] = decorator
+
+    return {"users": users, "books": books, "decorated_books": decorated_books,
+            "csv_paths": {"users": users_path, "books": books_path, "book_decorators": decorators_path}}
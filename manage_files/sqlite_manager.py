@@ -0,0 +1,132 @@
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List
+
+from manage_files import csv_manager
+from manage_files.storage_backend import StorageBackend, collection_name
+
+"""
+SQLite storage backend (stdlib sqlite3, a single local database file).
+every collection is a table with the csv headers as columns and 'id' as the integer primary key,
+so an upsert of one lend/return is an indexed update of one row instead of a csv rewrite.
+"""
+
+
+class SqliteStorageBackend(StorageBackend):
+    def __init__(self, db_path: str):
+        """
+        :param db_path: str - path of the database file, created if it doesn't exist.
+        """
+        self.db_path = db_path
+        # the write-behind flusher writes from its own thread, the lock serializes the connection use
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.RLock()
+        with self._lock:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+        self._tables: set[str] = set()
+
+    #------------------- tables and statements -------------------
+
+    def _ensure_table(self, headers_mapping: Dict[str, str]) -> str:
+        table = collection_name(headers_mapping)
+        if table not in self._tables:
+            id_header = headers_mapping["id"]
+            columns = [f'"{id_header}" INTEGER PRIMARY KEY']
+            columns += [f'"{header}" TEXT' for header in headers_mapping.values() if header != id_header]
+            with self._lock, self.connection:
+                self.connection.execute(f'CREATE TABLE IF NOT EXISTS "{table}" ({", ".join(columns)})')
+            self._tables.add(table)
+        return table
+
+    @staticmethod
+    def _upsert_sql(table: str, headers_mapping: Dict[str, str]) -> str:
+        # the same sql text for every call, so sqlite3 reuses the prepared statement from its cache
+        headers = list(headers_mapping.values())
+        id_header = headers_mapping["id"]
+        columns = ", ".join(f'"{header}"' for header in headers)
+        placeholders = ", ".join("?" for _ in headers)
+        updates = ", ".join(f'"{header}" = excluded."{header}"' for header in headers if header != id_header)
+        return (f'INSERT INTO "{table}" ({columns}) VALUES ({placeholders}) '
+                f'ON CONFLICT("{id_header}") DO UPDATE SET {updates}')
+
+    @staticmethod
+    def _row_values(row: Dict[str, Any], headers_mapping: Dict[str, str]) -> tuple:
+        id_header = headers_mapping["id"]
+        return tuple(int(str(row[header]).strip()) if header == id_header else str(row.get(header, ""))
+                     for header in headers_mapping.values())
+
+    def _count(self, table: str) -> int:
+        with self._lock:
+            return self.connection.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+
+    #------------------- StorageBackend -------------------
+
+    def load_objs_dict(self, source_path: str, headers_mapping: Dict[str, str], obj_type: str) -> Dict[int, Any]:
+        """
+        Loads the collection from its table. an empty table is first imported from the csv at 'source_path'.
+        """
+        table = self._ensure_table(headers_mapping)
+        if self._count(table) == 0 and source_path and os.path.exists(source_path):
+            self.import_csv(source_path, headers_mapping, obj_type)
+        headers = list(headers_mapping.values())
+        columns = ", ".join(f'"{header}"' for header in headers)
+        with self._lock:
+            cursor = self.connection.execute(f'SELECT {columns} FROM "{table}" ORDER BY "{headers_mapping["id"]}"')
+            rows = [dict(zip(headers, ["" if value is None else str(value) for value in values]))
+                    for values in cursor.fetchall()]
+        return csv_manager.objs_dict_from_rows(rows, headers_mapping, obj_type)
+
+    def collection_exists(self, source_path: str, headers_mapping: Dict[str, str]) -> bool:
+        table = self._ensure_table(headers_mapping)
+        return self._count(table) > 0 or (source_path is not None and os.path.exists(source_path))
+
+    def update(self, args_list: List[Dict[str, Any]]):
+        """
+        Upserts all the objects in one transaction (a lend/return commits the user and the book together).
+        """
+        statements = []
+        for args in args_list:
+            headers_mapping = args["headers_mapping"]
+            table = self._ensure_table(headers_mapping)
+            row = csv_manager.obj_to_row(args["obj_data"], headers_mapping)
+            statements.append((self._upsert_sql(table, headers_mapping), self._row_values(row, headers_mapping)))
+        with self._lock, self.connection:
+            for sql, values in statements:
+                self.connection.execute(sql, values)
+
+    def remove_objs(self, obj_ids: Iterable[int], source_path: str, headers_mapping: Dict[str, str]) -> bool:
+        table = self._ensure_table(headers_mapping)
+        with self._lock, self.connection:
+            cursor = self.connection.executemany(f'DELETE FROM "{table}" WHERE "{headers_mapping["id"]}" = ?',
+                                                 [(int(obj_id),) for obj_id in obj_ids])
+        return cursor.rowcount > 0
+
+    def create_empty_collection(self, base_path: str, headers_mapping: Dict[str, str], file_name_adder: str) -> str:
+        # the path only names the collection, the data lives in the database
+        self._ensure_table(headers_mapping)
+        return csv_manager.derived_file_path(base_path, file_name_adder)
+
+    def compact(self, source_path: str, headers_mapping: Dict[str, str]):
+        with self._lock:
+            self.connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self):
+        with self._lock:
+            self.connection.close()
+
+    #------------------- importers -------------------
+
+    def import_csv(self, csv_file_path: str, headers_mapping: Dict[str, str], obj_type: str) -> int:
+        """
+        Imports a collection from the existing csv layout (snapshot + journal) in one transaction.
+
+        :return: int - number of imported rows.
+        """
+        table = self._ensure_table(headers_mapping)
+        rows = csv_manager.read_rows_from_csv(csv_file_path, headers_mapping, obj_type)
+        values = [self._row_values(row, headers_mapping) for row in rows]
+        with self._lock, self.connection:
+            self.connection.executemany(self._upsert_sql(table, headers_mapping), values)
+        return len(values)
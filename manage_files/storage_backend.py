@@ -0,0 +1,91 @@
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List
+
+from manage_files import csv_manager
+
+"""
+Pluggable storage for the library collections (users, books, book decorators).
+the Library talks only to a StorageBackend, so the csv files can be swapped for another engine.
+each collection is identified by its csv file path and its headers mapping, like in csv_manager.
+"""
+
+
+def collection_name(headers_mapping: Dict[str, str]) -> str:
+    """
+    Returns the name of the collection ('users', 'books' or 'book_decorators') a headers mapping belongs to.
+    """
+    if headers_mapping == csv_manager.user_headers_mapping:
+        return "users"
+    elif headers_mapping == csv_manager.book_headers_mapping:
+        return "books"
+    elif headers_mapping == csv_manager.book_deco_headers_mapping:
+        return "book_decorators"
+    raise ValueError(f"Unknown headers mapping: {headers_mapping}")
+
+
+class StorageBackend(ABC):
+    @abstractmethod
+    def load_objs_dict(self, source_path: str, headers_mapping: Dict[str, str], obj_type: str) -> Dict[int, Any]:
+        """Loads all the objects of a collection (id -> object)."""
+        pass
+
+    @abstractmethod
+    def collection_exists(self, source_path: str, headers_mapping: Dict[str, str]) -> bool:
+        """Returns True if there's stored data for the collection."""
+        pass
+
+    @abstractmethod
+    def update(self, args_list: List[Dict[str, Any]]):
+        """Upserts objects, same args as csv_manager.update_csv. all the upserts are committed together."""
+        pass
+
+    @abstractmethod
+    def remove_objs(self, obj_ids: Iterable[int], source_path: str, headers_mapping: Dict[str, str]) -> bool:
+        """Removes objects by id. returns True if the removal was persisted."""
+        pass
+
+    @abstractmethod
+    def create_empty_collection(self, base_path: str, headers_mapping: Dict[str, str], file_name_adder: str) -> str:
+        """Creates an empty collection next to 'base_path' and returns its path."""
+        pass
+
+    def compact(self, source_path: str, headers_mapping: Dict[str, str]):
+        """Folds pending logs of the collection into its main storage."""
+        pass
+
+    def close(self):
+        pass
+
+
+class CsvStorageBackend(StorageBackend):
+    """
+    The csv files storage, optionally with per-collection append-only journals.
+    """
+    def __init__(self, journaled: bool = False):
+        self.journaled = journaled
+
+    def load_objs_dict(self, source_path: str, headers_mapping: Dict[str, str], obj_type: str) -> Dict[int, Any]:
+        return csv_manager.load_objs_dict_from_csv(source_path, headers_mapping, obj_type)
+
+    def collection_exists(self, source_path: str, headers_mapping: Dict[str, str]) -> bool:
+        return source_path is not None and os.path.exists(source_path)
+
+    def update(self, args_list: List[Dict[str, Any]]):
+        csv_manager.update_csv(args_list, journaled=self.journaled)
+
+    def remove_objs(self, obj_ids: Iterable[int], source_path: str, headers_mapping: Dict[str, str]) -> bool:
+        # one journal append / one tombstones append for all the ids, the csv itself isn't rewritten here
+        obj_ids = list(obj_ids)
+        if not obj_ids:
+            return False
+        if self.journaled:
+            return csv_manager.journal_remove_books(obj_ids, source_path, headers_mapping)
+        return csv_manager.remove_objs_from_csv(obj_ids, source_path, headers_mapping)
+
+    def create_empty_collection(self, base_path: str, headers_mapping: Dict[str, str], file_name_adder: str) -> str:
+        return csv_manager.create_empty_files(base_path, headers_mapping.values(), file_name_adder)
+
+    def compact(self, source_path: str, headers_mapping: Dict[str, str]):
+        csv_manager.compact_journal(source_path, headers_mapping)
+        csv_manager.compact_tombstones(source_path, headers_mapping)
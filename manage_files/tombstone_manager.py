@@ -0,0 +1,110 @@
+import os
+from typing import Any, Dict, Iterable, List
+
+"""
+Tombstones for the csv collections (deleted-ids sidecar).
+removing an object appends its id to '<csv file>.deleted' instead of rewriting the csv, the loaders skip
+the tombstoned rows. the csv is rewritten once (compaction) when the tombstones pass
+TOMBSTONE_COMPACTION_RATIO of its rows, or for free by any other full rewrite of the file.
+"""
+
+TOMBSTONE_SUFFIX = ".deleted"
+# share of tombstoned rows after which the csv is rewritten without them
+TOMBSTONE_COMPACTION_RATIO = 0.2
+# fsync after every append, so a committed removal survives a crash
+TOMBSTONE_FSYNC = True
+
+# tombstoned ids of each csv file and rows in each csv file (both lazily read on first access)
+_tombstones: dict[str, set[str]] = {}
+_rows_count: dict[str, int] = {}
+
+
+def tombstone_path(csv_file_path: str) -> str:
+    return csv_file_path + TOMBSTONE_SUFFIX
+
+
+def read_tombstones(csv_file_path: str) -> set[str]:
+    """
+    Returns the tombstoned ids (as stripped strings, like the csv id cells) of the given csv file.
+    the sidecar is read only once, after that the ids are kept in memory.
+    """
+    if csv_file_path not in _tombstones:
+        path = tombstone_path(csv_file_path)
+        ids = set()
+        if os.path.exists(path):
+            with open(path, mode='r', encoding='utf-8') as sidecar:
+                ids = {line.strip() for line in sidecar if line.strip()}
+        _tombstones[csv_file_path] = ids
+    return _tombstones[csv_file_path]
+
+
+def add_tombstones(csv_file_path: str, obj_ids: Iterable) -> int:
+    """
+    Appends the ids to the sidecar of 'csv_file_path' with a single write (and fsync).
+
+    :return: int - the number of tombstoned ids after the append.
+    """
+    tombstones = read_tombstones(csv_file_path)
+    new_ids = []
+    for obj_id in obj_ids:
+        obj_id = str(obj_id).strip()
+        if obj_id not in tombstones and obj_id not in new_ids:
+            new_ids.append(obj_id)
+    if new_ids:
+        with open(tombstone_path(csv_file_path), mode='a', encoding='utf-8', newline='') as sidecar:
+            sidecar.write("".join(obj_id + "\n" for obj_id in new_ids))
+            sidecar.flush()
+            if TOMBSTONE_FSYNC:
+                os.fsync(sidecar.fileno())
+        tombstones.update(new_ids)
+    return len(tombstones)
+
+
+def drop_tombstoned(csv_file_path: str, id_header: str, rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Returns the rows whose id is not tombstoned.
+    """
+    tombstones = read_tombstones(csv_file_path)
+    if not tombstones:
+        return list(rows)
+    return [row for row in rows if str(row.get(id_header, "")).strip() not in tombstones]
+
+
+def clear_tombstones(csv_file_path: str):
+    """
+    Deletes the sidecar, called after the csv was rewritten without the tombstoned rows.
+    """
+    path = tombstone_path(csv_file_path)
+    if os.path.exists(path):
+        os.remove(path)
+    _tombstones[csv_file_path] = set()
+
+
+def set_rows_count(csv_file_path: str, count: int):
+    """
+    Records the number of rows in the csv file (tombstoned ones included), after it was read or written.
+    """
+    _rows_count[csv_file_path] = count
+
+
+def rows_count(csv_file_path: str) -> int:
+    """
+    Returns the number of rows in the csv file. counted by lines only once, after that kept in memory.
+    """
+    if csv_file_path not in _rows_count:
+        count = 0
+        if os.path.exists(csv_file_path):
+            with open(csv_file_path, mode='rb') as infile:
+                count = max(sum(1 for line in infile if line.strip()) - 1, 0)
+        _rows_count[csv_file_path] = count
+    return _rows_count[csv_file_path]
+
+
+def needs_compaction(csv_file_path: str) -> bool:
+    """
+    True when the tombstones passed TOMBSTONE_COMPACTION_RATIO of the csv rows.
+    """
+    tombstones_count = len(read_tombstones(csv_file_path))
+    if tombstones_count == 0:
+        return False
+    return tombstones_count >= TOMBSTONE_COMPACTION_RATIO * max(rows_count(csv_file_path), 1)
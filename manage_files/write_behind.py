@@ -0,0 +1,126 @@
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict
+
+from manage_files.storage_backend import StorageBackend, CsvStorageBackend
+
+"""
+Write-behind (group commit) persistence for the update_csv_after decorator.
+decorated calls only mark the changed objects as dirty, a background thread writes all the pending
+upserts every 'flush_interval' seconds or as soon as 'max_pending' objects are waiting.
+several upserts of the same object are coalesced into one write of its latest state.
+"""
+
+DEFAULT_FLUSH_INTERVAL = 1.0
+DEFAULT_MAX_PENDING = 100
+
+
+class WriteBehindFlusher:
+    def __init__(self, storage: StorageBackend = None, flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+                 max_pending: int = DEFAULT_MAX_PENDING):
+        """
+        :param storage: StorageBackend - where the batches are written, the csv files by default.
+        :param flush_interval: float - max seconds a dirty object waits before it's written (bounds the crash loss in time).
+        :param max_pending: int - number of dirty objects that triggers an early flush (bounds the crash loss in objects).
+        """
+        if flush_interval <= 0 or max_pending < 1:
+            raise ValueError("flush_interval must be positive and max_pending at least 1.")
+        self.storage = storage or CsvStorageBackend()
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        # (csv file path, obj id) -> upsert args
+        self._pending: Dict[tuple[str, str], Dict[str, Any]] = {}
+        self._condition = threading.Condition()
+        # serializes the actual writes, so batches reach the files in the order they were taken
+        self._write_lock = threading.RLock()
+        self._stopped = False
+        self.flushes_count = 0
+        self.written_count = 0
+        self._thread = threading.Thread(target=self._run, name="csv-write-behind", daemon=True)
+        self._thread.start()
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def mark_dirty(self, upsert_args: Dict[str, Any]):
+        """
+        Queues an upsert (same dict update_csv expects). replaces a pending upsert of the same object.
+        """
+        key = (upsert_args["csv_file_path"], str(upsert_args["obj_data"].get("id", "")).strip())
+        with self._condition:
+            if self._stopped:
+                raise RuntimeError("Write-behind flusher was stopped.")
+            self._pending[key] = upsert_args
+            if len(self._pending) >= self.max_pending:
+                self._condition.notify()
+
+    def discard(self, csv_file_path: str, obj_id):
+        """
+        Drops a pending upsert, e.g. of a removed object that must not be written back.
+        """
+        with self._condition:
+            self._pending.pop((csv_file_path, str(obj_id).strip()), None)
+
+    def flush(self) -> bool:
+        """
+        Writes all the pending upserts now, one batch per csv file.
+
+        :return: bool - False if the storage failed, the batch is then pending again (retried by the next flush).
+        """
+        with self._write_lock:
+            with self._condition:
+                batch = list(self._pending.values())
+                self._pending.clear()
+            if not batch:
+                return True
+            # grouping by file lets the storage write every file once
+            batch.sort(key=lambda args: args["csv_file_path"])
+            try:
+                self.storage.update(batch)
+            except Exception as e:
+                print(f"Write-behind Error: failed to write {len(batch)} objects, kept pending: {e}")
+                with self._condition:
+                    # objects marked again during the write keep their newer state
+                    for upsert_args in batch:
+                        key = (upsert_args["csv_file_path"], str(upsert_args["obj_data"].get("id", "")).strip())
+                        self._pending.setdefault(key, upsert_args)
+                return False
+            self.written_count += len(batch)
+            self.flushes_count += 1
+            return True
+
+    @contextmanager
+    def exclusive(self):
+        """
+        Blocks the flusher while the caller writes the csv files directly.
+        """
+        with self._write_lock:
+            yield
+
+    def stop(self):
+        """
+        Stops the background thread and writes everything still pending.
+        raises RuntimeError if the storage still fails after a retry (the objects stay pending, nothing is dropped).
+        """
+        with self._condition:
+            if self._stopped:
+                return
+            self._stopped = True
+            self._condition.notify()
+        self._thread.join()
+        if not self.flush() and not self.flush():
+            raise RuntimeError(f"Write-behind flusher stopped with {self.pending_count} unwritten objects.")
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if not self._stopped and len(self._pending) < self.max_pending:
+                    self._condition.wait(timeout=self.flush_interval)
+                if self._stopped:
+                    return
+            if not self.flush():
+                # the storage failed, waits an interval before retrying the batch
+                with self._condition:
+                    if not self._stopped:
+                        self._condition.wait(timeout=self.flush_interval)
@@ -0,0 +1,10 @@
+"""
+Shared helpers of the tests.
+"""
+
+
+def book_json(book_id, title, borrowed_users=None):
+    """A book's json (as Book.to_json returns it), for writing rows to the collections."""
+    return {"id": book_id, "title": title, "author": "Author", "year": 2000, "category": "Fiction",
+            "copies": 3, "isLoaned": "No", "borrow_count": 0, "user_observers": [],
+            "borrowed_users": borrowed_users or []}
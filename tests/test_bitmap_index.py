@@ -0,0 +1,64 @@
+import unittest
+
+from Classes.book import Book
+from indexes.bitmap_index import BitmapIndex, bitmap_of_ordinals, count_bits, iter_bits
+
+
+class TestBitmaps(unittest.TestCase):
+
+    def test_bits_round_trip(self):
+        ordinals = [0, 3, 8, 63, 64, 200]
+        bitmap = bitmap_of_ordinals(ordinals)
+        self.assertEqual(list(iter_bits(bitmap)), ordinals)
+        self.assertEqual(count_bits(bitmap), 6)
+        self.assertEqual(list(iter_bits(0)), [])
+
+
+class TestBitmapIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = BitmapIndex()
+        self.books = [Book.loaded_book(f"Bitmap {i}", "Author", 2000, category, 1, 1300 + i, [], 0, borrowed, False)
+                      for i, (category, borrowed) in enumerate([("Fiction", []), ("Drama", [1]), ("Fiction", []),
+                                                                ("Drama", [])])]
+        self.index.rebuild(self.books)
+
+    def test_maintained_bitmaps(self):
+        self.assertEqual(self.index.books_of(self.index.all), self.books)
+        self.assertEqual(self.index.books_of(self.index.available), [self.books[0], self.books[2], self.books[3]])
+        self.assertEqual(self.index.books_of(self.index.categories["Drama"] & ~self.index.available), [self.books[1]])
+
+    def test_composition_from_ids(self):
+        searched = self.index.bitmap_of_ids([1303, 1300, 9999])
+        self.assertEqual(self.index.books_of(searched & self.index.categories["Fiction"]), [self.books[0]])
+        self.assertEqual(self.index.books_of(searched | self.index.bitmap_of([self.books[1]])),
+                         [self.books[0], self.books[1], self.books[3]])
+
+    def test_add_remove_and_refresh(self):
+        book = self.books[0]
+        book.available_copies = 0
+        self.index.refresh_book(book)
+        self.assertNotIn(book, self.index.books_of(self.index.available))
+
+        self.index.remove_book(self.books[1])
+        self.assertEqual(self.index.books_of(self.index.categories["Drama"]), [self.books[3]])
+
+        added = Book.loaded_book("Bitmap new", "Author", 2000, "Poetry", 1, 1310, [], 0, [], False)
+        self.index.add_book(added)
+        self.assertEqual(self.index.books_of(self.index.categories["Poetry"]), [added])
+        self.assertEqual(self.index.books_of(self.index.all), [self.books[0], self.books[2], self.books[3], added])
+
+    def test_churn_keeps_the_bitmaps_bounded(self):
+        for i in range(1000):
+            added = Book.loaded_book(f"Churn {i}", "Author", 2000, "Poetry", 1, 2000 + i, [], 0, [], False)
+            self.index.add_book(added)
+            self.index.remove_book(added)
+            self.assertLessEqual(len(self.index.slots), 2 * len(self.books))
+            self.assertLessEqual(self.index.all.bit_length(), len(self.index.slots))
+        self.assertEqual(self.index.books_of(self.index.all), self.books)
+        self.assertEqual(self.index.books_of(self.index.categories["Drama"] & ~self.index.available), [self.books[1]])
+        self.assertNotIn("Poetry", self.index.categories)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+
+from Classes.book import Book
+from indexes.book_table import BookTable, NUMPY_AVAILABLE
+
+
+@unittest.skipUnless(NUMPY_AVAILABLE, "numpy is not installed")
+class TestBookTable(unittest.TestCase):
+
+    def setUp(self):
+        self.table = BookTable(capacity=2)
+        self.books = [
+            Book.loaded_book("First", "Orwell", 1949, "Dystopia", 1, 1201, [], 4, [], False),
+            Book.loaded_book("Second", "Orwell", 1945, "Satire", 1, 1202, [], 9, [1], True),
+            Book.loaded_book("Third", "Huxley", 1932, "Dystopia", 2, 1203, [], 1, [], False),
+        ]
+        self.table.rebuild(self.books)
+
+    def test_aggregates(self):
+        self.assertEqual(self.table.category_counts(), {"Dystopia": 2, "Satire": 1})
+        self.assertEqual(self.table.year_histogram(), {1930: 1, 1940: 2})
+        self.assertEqual(self.table.stats()["borrows"], 14)
+        self.assertEqual(self.table.stats()["unavailable"], 1)
+
+    def test_changes_keep_rows_in_sync(self):
+        first = self.books[0]
+        first.borrow_count = 20
+        first.available_copies = 0
+        self.table.refresh_book(first)
+        self.assertEqual(self.table.stats()["borrows"], 30)
+        self.assertEqual(self.table.stats()["unavailable"], 2)
+
+        self.table.remove_book(first)
+        self.assertEqual(self.table.rows, 2)
+        # the last row moved into the removed one
+        self.assertEqual(self.table.row_of, {1203: 0, 1202: 1})
+        self.assertEqual(self.table.category_counts(), {"Dystopia": 1, "Satire": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -70,6 +70,27 @@ class TestBook(unittest.TestCase):
         self.assertEqual(self.book.available_copies, 1)
         self.assertFalse(self.book.isLoaned)
 
+    def test_quiet_copies_update_is_standalone(self):
+        """A quiet copies update of a standalone book doesn't create the library (its log file)."""
+        from Classes.library import Library
+        previous = Library._Library__instance
+        Library._Library__instance = None
+        try:
+            self.book.updateCopies(-1, to_print=False)
+            self.book.set_borrow_count(4)
+            self.assertIsNone(Library._Library__instance)
+        finally:
+            Library._Library__instance = previous
+        self.assertEqual(self.book.available_copies, 4)
+
+    def test_create_books_bulk(self):
+        """Test creating many books with one reserved id range."""
+        books = Book.createBooks([("Bulk 1", "Author", 2001, "Fiction", 1), ("Bulk 2", "Author", 2002, "Drama", 2)])
+        self.assertEqual([book.title for book in books], ["Bulk 1", "Bulk 2"])
+        self.assertEqual(books[1].id, books[0].id + 1)
+        self.assertNotEqual(books[0].id, self.book.id)
+        self.assertIn(books[1].id, Book.book_ids)
+
     def test_set_id(self):
         """Test setting the ID of a book."""
         self.book.set_id(10)
@@ -0,0 +1,280 @@
+import csv
+import os
+import shutil
+import tempfile
+import unittest
+
+from manage_files import csv_manager, journal_manager, tombstone_manager
+from manage_files.write_behind import WriteBehindFlusher
+from tests.helpers import book_json
+
+
+class TestIdListEncoding(unittest.TestCase):
+
+    def test_round_trip(self):
+        """Id lists are written space separated and read back."""
+        self.assertEqual(csv_manager.encode_id_list([3, 1, 20]), "3 1 20")
+        self.assertEqual(csv_manager.decode_id_list("3 1 20"), [3, 1, 20])
+        self.assertEqual(csv_manager.encode_id_list([]), "")
+        self.assertEqual(csv_manager.decode_id_list(""), [])
+
+    def test_reads_legacy_cells(self):
+        """Legacy python/json list cells are still decoded."""
+        self.assertEqual(csv_manager.decode_id_list("[1, 2, 3]"), [1, 2, 3])
+        self.assertEqual(csv_manager.decode_id_list("[]"), [])
+        self.assertEqual(csv_manager.decode_id_list(" [0,0] "), [0, 0])
+
+    def test_obj_to_row_encodes_id_lists(self):
+        """obj_to_row writes the compact encoding for id list columns."""
+        row = csv_manager.obj_to_row({"id": 1, "borrowed_books": [4, 5], "previously_borrowed_books": []},
+                                     {"id": "user_id", "borrowed_books": "borrowed_books",
+                                      "previously_borrowed_books": "previously_borrowed_books"})
+        self.assertEqual(row, {"user_id": 1, "borrowed_books": "4 5", "previously_borrowed_books": ""})
+
+
+class BooksCsvTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """Create an empty books csv in a temp directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.books_csv = os.path.join(self.temp_dir, "books.csv")
+        with open(self.books_csv, 'w', encoding='utf-8', newline='') as outfile:
+            csv.DictWriter(outfile, fieldnames=csv_manager.book_headers_mapping.values()).writeheader()
+        self.mapping = csv_manager.book_headers_mapping
+
+    def tearDown(self):
+        journal_manager.clear_journal(self.books_csv)
+        tombstone_manager.clear_tombstones(self.books_csv)
+        shutil.rmtree(self.temp_dir)
+
+    def read_snapshot_ids(self):
+        with open(self.books_csv, 'r', encoding='utf-8', newline='') as infile:
+            return [row["id"] for row in csv.DictReader(infile)]
+
+
+class TestJournaledPersistence(BooksCsvTestCase):
+
+    def test_journaled_upsert_does_not_rewrite_snapshot(self):
+        """Journaled upserts only append to the journal, the csv stays untouched."""
+        args = {"obj_data": book_json(1, "First"), "csv_file_path": self.books_csv, "headers_mapping": self.mapping}
+        csv_manager.update_csv([args], journaled=True)
+        self.assertEqual(self.read_snapshot_ids(), [])
+        self.assertEqual(journal_manager.journal_records_count(self.books_csv), 1)
+
+    def test_load_replays_journal(self):
+        """Loading applies upserts and deletes from the journal on top of the snapshot."""
+        csv_manager.upsert_obj_to_csv(book_json(1, "Snapshot"), self.books_csv, self.mapping)
+        csv_manager.journal_upsert_obj(book_json(1, "Updated", [0]), self.books_csv, self.mapping)
+        csv_manager.journal_upsert_obj(book_json(2, "Second"), self.books_csv, self.mapping)
+        csv_manager.journal_upsert_obj(book_json(3, "Third"), self.books_csv, self.mapping)
+        csv_manager.journal_remove_book(2, self.books_csv, self.mapping)
+
+        books = csv_manager.load_objs_dict_from_csv(self.books_csv, self.mapping, "Book")
+        self.assertEqual(sorted(books.keys()), [1, 3])
+        self.assertEqual(books[1].title, "Updated")
+        self.assertEqual(books[1].borrowed_users, [0])
+
+    def test_compact_journal(self):
+        """Compaction folds the journal into the snapshot and removes the journal."""
+        csv_manager.journal_upsert_obj(book_json(1, "First"), self.books_csv, self.mapping)
+        csv_manager.journal_upsert_obj(book_json(2, "Second"), self.books_csv, self.mapping)
+        csv_manager.compact_journal(self.books_csv, self.mapping)
+
+        self.assertEqual(self.read_snapshot_ids(), ["1", "2"])
+        self.assertFalse(os.path.exists(journal_manager.journal_path(self.books_csv)))
+        self.assertEqual(journal_manager.journal_records_count(self.books_csv), 0)
+
+
+    def test_rewriting_upsert_folds_pending_journal(self):
+        """A plain upsert after journaled ones folds the journal first, so a load doesn't replay older rows."""
+        csv_manager.journal_upsert_obj(book_json(1, "Journaled"), self.books_csv, self.mapping)
+        csv_manager.upsert_obj_to_csv(book_json(1, "Newest"), self.books_csv, self.mapping)
+
+        self.assertEqual(journal_manager.journal_records_count(self.books_csv), 0)
+        books = csv_manager.load_objs_dict_from_csv(self.books_csv, self.mapping, "Book")
+        self.assertEqual(books[1].title, "Newest")
+
+    def test_switching_journaling_off_folds_journals(self):
+        """Turning the library's journaled persistence off folds the journals into the csv files."""
+        from Classes.library import Library
+        Library._Library__instance = None
+        library = Library.getInstance()
+        library.books_csv_file_path = self.books_csv
+        library.journaled_persistence = True
+        csv_manager.journal_upsert_obj(book_json(1, "Journaled"), self.books_csv, self.mapping)
+        library.journaled_persistence = False
+
+        self.assertEqual(journal_manager.journal_records_count(self.books_csv), 0)
+        self.assertEqual(self.read_snapshot_ids(), ["1"])
+        Library._Library__instance = None
+
+class TestWriteBehindFlusher(BooksCsvTestCase):
+
+    def test_coalesces_upserts_of_same_object(self):
+        """Pending upserts of the same id are written once, with the latest state."""
+        flusher = WriteBehindFlusher(flush_interval=60, max_pending=100)
+        for title in ["v1", "v2", "v3"]:
+            flusher.mark_dirty({"obj_data": book_json(1, title), "csv_file_path": self.books_csv,
+                                "headers_mapping": self.mapping})
+        flusher.mark_dirty({"obj_data": book_json(2, "other"), "csv_file_path": self.books_csv,
+                            "headers_mapping": self.mapping})
+        self.assertEqual(flusher.pending_count, 2)
+        self.assertEqual(self.read_snapshot_ids(), [])
+
+        flusher.stop()
+        self.assertEqual(flusher.written_count, 2)
+        books = csv_manager.load_objs_dict_from_csv(self.books_csv, self.mapping, "Book")
+        self.assertEqual(books[1].title, "v3")
+
+    def test_discard_pending_upsert(self):
+        """A discarded object is not written by the next flush."""
+        flusher = WriteBehindFlusher(flush_interval=60, max_pending=100)
+        flusher.mark_dirty({"obj_data": book_json(1, "removed"), "csv_file_path": self.books_csv,
+                            "headers_mapping": self.mapping})
+        flusher.discard(self.books_csv, 1)
+        flusher.stop()
+        self.assertEqual(self.read_snapshot_ids(), [])
+
+
+    def test_failed_flush_keeps_pending(self):
+        """A batch the storage failed to write stays pending, a newer mark isn't overwritten, stop() raises."""
+        flusher = WriteBehindFlusher(flush_interval=60, max_pending=100)
+        calls = []
+
+        def failing_update(batch):
+            calls.append(len(batch))
+            # marked again while the failing write runs
+            flusher._pending[(self.books_csv, "1")] = {"obj_data": book_json(1, "newer"),
+                                                       "csv_file_path": self.books_csv, "headers_mapping": self.mapping}
+            raise OSError("disk full")
+
+        flusher.storage.update = failing_update
+        flusher.mark_dirty({"obj_data": book_json(1, "older"), "csv_file_path": self.books_csv,
+                            "headers_mapping": self.mapping})
+        flusher.mark_dirty({"obj_data": book_json(2, "other"), "csv_file_path": self.books_csv,
+                            "headers_mapping": self.mapping})
+        self.assertFalse(flusher.flush())
+        self.assertEqual(flusher.pending_count, 2)
+        self.assertEqual(flusher._pending[(self.books_csv, "1")]["obj_data"]["title"], "newer")
+        with self.assertRaises(RuntimeError):
+            flusher.stop()
+        # stop retried once before giving up
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(flusher.pending_count, 2)
+
+class TestTombstones(BooksCsvTestCase):
+
+    def setUp(self):
+        """Write ten books to the csv."""
+        super().setUp()
+        csv_manager.upsert_objs_to_csv([book_json(book_id, f"Book {book_id}") for book_id in range(1, 11)],
+                                       self.books_csv, self.mapping)
+
+    def test_remove_records_tombstone_without_rewrite(self):
+        """A removal appends to the '.deleted' sidecar and the loaders skip the removed row."""
+        csv_manager.remove_objs_from_csv([4], self.books_csv, self.mapping)
+
+        self.assertEqual(len(self.read_snapshot_ids()), 10)
+        books = csv_manager.load_objs_dict_from_csv(self.books_csv, self.mapping, "Book")
+        self.assertNotIn(4, books)
+        self.assertEqual(len(books), 9)
+
+    def test_compaction_after_ratio(self):
+        """The file is rewritten once the tombstones pass the compaction ratio."""
+        csv_manager.remove_objs_from_csv([1], self.books_csv, self.mapping)
+        self.assertTrue(os.path.exists(tombstone_manager.tombstone_path(self.books_csv)))
+        csv_manager.remove_objs_from_csv([2], self.books_csv, self.mapping)
+
+        self.assertEqual(self.read_snapshot_ids(), [str(book_id) for book_id in range(3, 11)])
+        self.assertFalse(os.path.exists(tombstone_manager.tombstone_path(self.books_csv)))
+
+    def test_rewriting_upsert_drops_tombstoned_rows(self):
+        """A full rewrite by an upsert removes the tombstoned rows and clears the sidecar."""
+        csv_manager.remove_objs_from_csv([5], self.books_csv, self.mapping)
+        csv_manager.upsert_obj_to_csv(book_json(11, "New"), self.books_csv, self.mapping)
+
+        self.assertNotIn("5", self.read_snapshot_ids())
+        self.assertIn("11", self.read_snapshot_ids())
+        self.assertFalse(os.path.exists(tombstone_manager.tombstone_path(self.books_csv)))
+
+    def test_removing_decorated_book_keeps_decorators_csv(self):
+        """The compaction of the decorators csv keeps its own columns and doesn't mark it as a books csv."""
+        from Classes.library import Library
+        deco_csv = Library.decorators_file_path(self.books_csv)
+        users_csv = os.path.join(self.temp_dir, "users.csv")
+        with open(deco_csv, 'w', encoding='utf-8', newline='') as outfile:
+            writer = csv.DictWriter(outfile, fieldnames=csv_manager.book_deco_headers_mapping.values())
+            writer.writeheader()
+            writer.writerow({"id": 3, "type": "###description", "decorator": "###a description"})
+        csv_manager.create_empty_files(users_csv, csv_manager.user_headers_mapping.values(), "")
+        Library._Library__instance = None
+        library = Library.getInstance()
+        library.load_from_csv_files(self.books_csv, users_csv)
+        library.after_start()
+        self.assertIn(3, library.decorated_books)
+
+        # the only decorators row is tombstoned, so its file is compacted right away
+        library.removeBook(library.books[3])
+
+        with open(deco_csv, 'r', encoding='utf-8', newline='') as infile:
+            reader = csv.DictReader(infile)
+            self.assertEqual(reader.fieldnames, list(csv_manager.book_deco_headers_mapping.values()))
+            self.assertEqual(list(reader), [])
+        self.assertFalse(os.path.exists(csv_manager.schema_path(deco_csv)))
+        self.assertFalse(os.path.exists(tombstone_manager.tombstone_path(deco_csv)))
+        Library._Library__instance = None
+
+
+class TestBooksSchema(BooksCsvTestCase):
+
+    def setUp(self):
+        """Write a books csv in the original layout (no id, followers, borrow count or borrowers)."""
+        super().setUp()
+        with open(self.books_csv, 'w', encoding='utf-8', newline='') as outfile:
+            outfile.write("title,author,is_loaned,copies,genre,year\n"
+                          "Legacy One,Author,No,3,Fiction,1951\n"
+                          "Legacy Two,Author,Yes,2,Drama,1960\n")
+
+    def tearDown(self):
+        if os.path.exists(csv_manager.schema_path(self.books_csv)):
+            os.remove(csv_manager.schema_path(self.books_csv))
+        super().tearDown()
+
+    def test_load_fills_defaults_without_rewriting(self):
+        """An old books file is normalized in memory and left untouched on disk."""
+        with open(self.books_csv, 'r', encoding='utf-8') as infile:
+            original = infile.read()
+        books = csv_manager.load_objs_dict_from_csv(self.books_csv, self.mapping, "Book")
+
+        self.assertEqual(sorted(books.keys()), [1, 2])
+        self.assertEqual(books[2].borrowed_users, [0, 0])
+        self.assertEqual(books[1].borrow_count, 0)
+        with open(self.books_csv, 'r', encoding='utf-8') as infile:
+            self.assertEqual(infile.read(), original)
+        self.assertEqual(csv_manager.read_schema_version(self.books_csv), 0)
+
+    def test_migrate(self):
+        """The migrate command rewrites the file once and marks it with the schema version."""
+        csv_manager.modify_csv(self.books_csv)
+        self.assertEqual(csv_manager.read_schema_version(self.books_csv), csv_manager.BOOKS_SCHEMA_VERSION)
+        self.assertEqual(self.read_snapshot_ids(), ["1", "2"])
+        books = csv_manager.load_objs_dict_from_csv(self.books_csv, self.mapping, "Book")
+        self.assertEqual(books[2].borrowed_users, [0, 0])
+
+    def test_upsert_migrates_old_file(self):
+        """A rewriting upsert on an old file keeps the in-memory ids of the existing rows."""
+        csv_manager.upsert_obj_to_csv(book_json(3, "New"), self.books_csv, self.mapping)
+        self.assertEqual(self.read_snapshot_ids(), ["1", "2", "3"])
+        self.assertEqual(csv_manager.read_schema_version(self.books_csv), csv_manager.BOOKS_SCHEMA_VERSION)
+
+
+    def test_empty_borrowers_column_is_not_lost_copies(self):
+        """An empty borrowers cell (the compact empty list) of a loaned book doesn't invent lost copies."""
+        with open(self.books_csv, 'w', encoding='utf-8', newline='') as outfile:
+            outfile.write("id,title,author,is_loaned,copies,genre,year,followers_ids,borrow_count,borrowed_users\n"
+                          "1,Loaned,Author,Yes,2,Drama,1960,,0,\n")
+        books = csv_manager.load_objs_dict_from_csv(self.books_csv, self.mapping, "Book")
+        self.assertEqual(books[1].borrowed_users, [])
+
+if __name__ == "__main__":
+    unittest.main()
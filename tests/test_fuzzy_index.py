@@ -0,0 +1,59 @@
+import unittest
+
+from Classes.book import Book
+from design_patterns.strategy import FuzzySearchByAuthor, FuzzySearchByTitle, FuzzySearchTitleOrAuthor
+from indexes.fuzzy_index import FuzzyIndex, DeletionIndex, edit_distance
+
+
+class TestFuzzyIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = FuzzyIndex()
+        self.orwell = Book.loaded_book("Nineteen Eighty-Four", "George Orwell", 1949, "Dystopia", 1, 901, [], 0, [], False)
+        self.gatsby = Book.loaded_book("The Great Gatsby", "F. Scott Fitzgerald", 1925, "Fiction", 1, 902, [], 0, [], False)
+        self.farm = Book.loaded_book("Animal Farm", "George Orwell", 1945, "Satire", 1, 903, [], 0, [], False)
+        self.index.rebuild([self.orwell, self.gatsby, self.farm])
+
+    def test_edit_distance(self):
+        for first, second, distance in [("orwel", "orwell", 1), ("fitzgerlad", "fitzgerald", 2), ("gatsby", "gatsby", 0),
+                                        ("kitten", "sitting", 3), ("", "abc", 3)]:
+            with self.subTest(first=first, second=second):
+                self.assertEqual(edit_distance(first, second, 3), distance)
+        # larger distances are cut at max_distance + 1
+        self.assertEqual(edit_distance("kitten", "sitting", 1), 2)
+
+    def test_deletion_index_search(self):
+        words = DeletionIndex()
+        for word in ["orwell", "orwellian", "owl", "fitzgerald", "gerald"]:
+            words.add(word)
+        self.assertEqual(sorted(words.search("orwel", 2)), [("orwell", 1), ("owl", 2)])
+        self.assertEqual(words.search("orwel", 1), [("orwell", 1)])
+        self.assertEqual(sorted(words.search("fitzgerlad", 2)), [("fitzgerald", 2)])
+        self.assertEqual(words.search("tolkien", 2), [])
+
+    def test_misspelled_author(self):
+        results, message = FuzzySearchByAuthor(self.index).search(None, "Orwel")
+        self.assertEqual(results, [self.orwell, self.farm])
+        self.assertEqual(message, "Search by Author (fuzzy) 'Orwel': Found 2 book(s).")
+        results, _ = FuzzySearchByAuthor(self.index).search(None, "scott fitzgerlad")
+        self.assertEqual(results, [self.gatsby])
+        # one typo allowed in short words, none in words of two letters
+        self.assertEqual(FuzzySearchByTitle(self.index).search(None, "tha")[0], [self.gatsby])
+        self.assertEqual(FuzzySearchByTitle(self.index).search(None, "te")[0], [])
+
+    def test_title_or_author(self):
+        strategy = FuzzySearchTitleOrAuthor(self.index)
+        results, _ = strategy.search(None, "gatsbi")
+        self.assertEqual(results, [self.gatsby])
+        self.assertEqual(strategy.field_counts, {"title": 1, "author": 0})
+        results, _ = strategy.search([self.farm], "george")
+        self.assertEqual(results, [self.farm])
+
+    def test_remove_book(self):
+        self.index.remove_book(self.farm)
+        self.assertEqual(self.index.lookup("title", "anmal"), set())
+        self.assertEqual(self.index.lookup("author", "orwel"), {901})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+
+from Classes.id_allocator import IdAllocator
+
+
+class TestIdAllocator(unittest.TestCase):
+
+    def test_allocate_skips_reserved_ids(self):
+        """Allocation hands out increasing ids and skips reserved ones."""
+        allocator = IdAllocator(reserved=[0, 2])
+        self.assertEqual([allocator.allocate() for _ in range(3)], [3, 4, 5])
+        self.assertIn(2, allocator)
+        self.assertEqual(len(allocator), 5)
+        # with reuse_freed the gaps below the mark are filled
+        allocator = IdAllocator(reserved=[0, 2], reuse_freed=True)
+        self.assertEqual([allocator.allocate() for _ in range(3)], [1, 3, 4])
+
+    def test_release_without_reuse(self):
+        """Released ids are not handed out again by default."""
+        allocator = IdAllocator(reserved=[0])
+        first = allocator.allocate()
+        allocator.release(first)
+        self.assertNotIn(first, allocator)
+        self.assertNotEqual(allocator.allocate(), first)
+
+    def test_release_below_mark_without_reuse(self):
+        """An id released below the high-water mark is not handed out again without reuse_freed."""
+        allocator = IdAllocator()
+        allocator.reserve_many(range(1, 11))
+        allocator.release(5)
+        self.assertEqual(allocator.allocate(), 11)
+
+    def test_release_with_reuse(self):
+        """With reuse_freed, the smallest released id is handed out first."""
+        allocator = IdAllocator(reserved=[0], reuse_freed=True)
+        ids = [allocator.allocate() for _ in range(4)]
+        allocator.release(ids[2])
+        allocator.release(ids[0])
+        self.assertEqual(allocator.allocate(), ids[0])
+        self.assertEqual(allocator.allocate(), ids[2])
+        self.assertEqual(allocator.allocate(), ids[3] + 1)
+
+    def test_reserve_range(self):
+        """A reserved range starts after the highest used id and moves the high-water mark."""
+        allocator = IdAllocator(reserved=[0])
+        allocator.reserve(10)
+        ids = allocator.reserve_range(5)
+        self.assertEqual(list(ids), [11, 12, 13, 14, 15])
+        self.assertTrue(all(obj_id in allocator for obj_id in ids))
+        self.assertEqual(allocator.allocate(), 16)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -34,6 +34,13 @@ class TestLibrary(unittest.TestCase):
         with self.assertRaises(SignUpError):
             self.library.signUp(user_params)
 
+    def test_username_lookup_is_case_insensitive(self):
+        user = self.library.signUp({"username": "Case_User", "password": "password", "role": "regular user"})
+        self.assertIs(self.library.getUserByUsername("case_user"), user)
+        self.assertTrue(self.library.isUsernameTaken("CASE_USER"))
+        with self.assertRaises(SignUpError):
+            self.library.signUp({"username": "case_user", "password": "password", "role": "regular user"})
+
     def test_add_book_permission_denied(self):
         with self.assertRaises(PermissionDeniedException):
             self.library.addBook(self.book, caller=self.user)
@@ -47,10 +54,79 @@ class TestLibrary(unittest.TestCase):
         self.library.removeBook(self.book, caller=self.librarian)
         self.assertNotIn(self.book.id, self.library.books)
 
+    def test_remove_books(self):
+        other_book = Book.createBook("Other Book", "Author", 2001, "Fiction", 1)
+        self.library.addBook(self.book, caller=self.librarian)
+        self.library.addBook(other_book, caller=self.librarian)
+        removed = self.library.removeBooks([self.book, other_book], caller=self.librarian)
+        self.assertEqual(removed, 2)
+        self.assertNotIn(self.book.id, self.library.books)
+        self.assertNotIn(other_book.id, self.library.books)
+
+    def test_remove_books_nonexistent_book(self):
+        self.library.addBook(self.book, caller=self.librarian)
+        missing_book = Book.createBook("Missing Book", "Author", 2001, "Fiction", 1)
+        with self.assertRaises(BookNotFoundException):
+            self.library.removeBooks([self.book, missing_book], caller=self.librarian)
+        self.assertIn(self.book.id, self.library.books)
+
     def test_remove_nonexistent_book(self):
         with self.assertRaises(BookNotFoundException):
             self.library.removeBook(self.book, caller=self.librarian)
 
+    def test_category_and_availability_indexes(self):
+        book = Book.createBook("Indexed Book", "Author", 2001, "Indexed Genre", 1)
+        self.library.addBook(book, caller=self.librarian)
+        self.assertIn("Indexed Genre", self.library.getCategories())
+        self.assertEqual(self.library.getBooksByCategory("Indexed Genre"), [book])
+        self.assertIn(book, self.library.getAvailableBooks())
+
+        self.library.lendBook(self.user, book)
+        self.assertNotIn(book, self.library.getAvailableBooks())
+        self.assertIn(book, self.library.getUnavailableBooks())
+
+        self.library.removeBook(book, caller=self.librarian)
+        self.assertNotIn("Indexed Genre", self.library.getCategories())
+        self.assertNotIn(book, self.library.getUnavailableBooks())
+
+    def test_books_by_title(self):
+        first = Book.createBook("Shared Title", "First Author", 2001, "Fiction", 1)
+        second = Book.createBook("Shared Title", "Second Author", 2002, "Fiction", 1)
+        self.library.addBook(first, caller=self.librarian)
+        self.library.addBook(second, caller=self.librarian)
+        self.assertEqual(self.library.getBooksByTitle("Shared Title"), [first, second])
+        self.library.removeBook(first, caller=self.librarian)
+        self.assertEqual(self.library.getBooksByTitle("Shared Title"), [second])
+        self.library.removeBook(second, caller=self.librarian)
+        self.assertEqual(self.library.getBooksByTitle("Shared Title"), [])
+
+    def test_phonetic_author_search(self):
+        from design_patterns.decorator import DescriptionDecorator
+        from design_patterns.strategy import SearchByAuthorPhonetic
+        novel = Book.createBook("Anna Karenina", "Leo Tolstoy", 1878, "Novel", 1)
+        study = Book.createBook("Russian Novelists", "Someone Else", 1950, "Essays", 1)
+        self.library.addBook(novel, caller=self.librarian)
+        self.library.addBook(study, caller=self.librarian)
+        self.assertEqual(self.library.searchBooks("Tolstoi", SearchByAuthorPhonetic()), [novel])
+        # a description decorator's words are indexed when it's added
+        self.library.add_decorated_book(DescriptionDecorator(study, "On Tolstoi and Dostoevsky"))
+        self.assertEqual(self.library.searchBooks("Tolstoi", SearchByAuthorPhonetic()), [novel, study])
+        self.library.removeBook(novel, caller=self.librarian)
+        self.library.removeBook(study, caller=self.librarian)
+        # the removed book's decorator is dropped with it
+        self.assertNotIn(study.id, self.library.decorated_books)
+        self.assertEqual(self.library.searchBooks("Tolstoi", SearchByAuthorPhonetic()), [])
+
+    def test_book_stats(self):
+        book = Book.createBook("Stats Book", "Author", 1987, "Stats Genre", 1)
+        self.library.addBook(book, caller=self.librarian)
+        stats = self.library.getBookStats()
+        self.assertEqual(stats["books"], len(self.library.books))
+        self.assertEqual(stats["available"] + stats["unavailable"], len(self.library.books))
+        self.assertEqual(stats["categories"]["Stats Genre"], 1)
+        self.assertGreaterEqual(stats["years"][1980], 1)
+        self.library.removeBook(book, caller=self.librarian)
+
     def test_lend_book(self):
         self.library.addBook(self.book, caller=self.librarian)
         self.library.lendBook(self.user, self.book)
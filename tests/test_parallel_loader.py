@@ -0,0 +1,72 @@
+import csv
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from Classes.library import Library
+from manage_files import csv_manager, parallel_loader
+
+
+class TestParallelLoader(unittest.TestCase):
+
+    def setUp(self):
+        """Write a books csv, its decorators csv and a users csv, one user borrowed one book."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.books_csv = os.path.join(self.temp_dir, "books.csv")
+        self.users_csv = os.path.join(self.temp_dir, "users.csv")
+        self.write_csv(self.books_csv, csv_manager.book_headers_mapping, [
+            {"id": 1, "title": "First", "author": "Author", "year": 2000, "category": "Fiction", "copies": 2,
+             "isLoaned": "No", "borrow_count": 1, "user_observers": [], "borrowed_users": [5]},
+            {"id": 2, "title": "Second", "author": "Author", "year": 2001, "category": "Drama", "copies": 1,
+             "isLoaned": "No", "borrow_count": 0, "user_observers": [5], "borrowed_users": []},
+        ])
+        self.write_csv(Library.decorators_file_path(self.books_csv), csv_manager.book_deco_headers_mapping, [
+            {"id": 2, "type": "###description", "decorator": "###a description"},
+        ])
+        self.write_csv(self.users_csv, csv_manager.user_headers_mapping, [
+            {"id": 5, "username": "reader", "passwordHash": "hash", "role": "regular user",
+             "borrowed_books": [1], "previously_borrowed_books": []},
+        ])
+        Library._Library__instance = None
+        self.library = Library.getInstance()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write_csv(self, csv_file_path, headers_mapping, objs_data):
+        with open(csv_file_path, 'w', encoding='utf-8', newline='') as outfile:
+            writer = csv.DictWriter(outfile, fieldnames=headers_mapping.values())
+            writer.writeheader()
+            for obj_data in objs_data:
+                writer.writerow(csv_manager.obj_to_row(obj_data, headers_mapping))
+
+    def check_loaded_library(self):
+        self.library.after_start()
+        self.assertEqual(sorted(self.library.books), [1, 2])
+        self.assertEqual(self.library.users[5].borrowedBooks, [self.library.books[1]])
+        self.assertEqual(self.library.books[2].user_observers, [self.library.users[5]])
+        self.assertEqual(self.library.decorated_books[2].description, "a description")
+        self.assertEqual(self.library.book_decorators_file_path, Library.decorators_file_path(self.books_csv))
+
+    def test_load_in_process(self):
+        """Small files are parsed in-process and reported to the progress callback."""
+        progress = []
+        self.library.load_from_csv_files(self.books_csv, self.users_csv,
+                                         progress=lambda message, done, total: progress.append((done, total)))
+        self.assertEqual(progress, [(done, 6) for done in range(1, 7)])
+        self.check_loaded_library()
+
+    def test_load_in_worker_processes(self):
+        """With the size threshold off (and several cores) the files are parsed by the process pool."""
+        with patch.object(parallel_loader, "PARALLEL_MIN_BYTES", 0), \
+                patch.object(parallel_loader.os, "cpu_count", return_value=4), \
+                patch.object(parallel_loader, "ProcessPoolExecutor", wraps=parallel_loader.ProcessPoolExecutor) as pool:
+            self.library.load_from_csv_files(self.books_csv, self.users_csv, max_workers=2)
+        pool.assert_called_once_with(max_workers=2)
+        self.check_loaded_library()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+
+from Classes.book import Book
+from Classes.library import Library
+from design_patterns.strategy import (ParallelSearchStrategy, SearchByAllFields, SearchByAuthor, SearchByTitle,
+                                      TrigramSearchByTitle)
+
+
+class TestParallelSearchStrategy(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Starting the workers is the slow part, one pool of two workers is shared by the tests."""
+        cls.parallel = ParallelSearchStrategy(SearchByAllFields(), workers=2, min_books=0)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.parallel.close()
+
+    def setUp(self):
+        titles = ["Animal Farm", "Nineteen Eighty-Four", "Brave New World", "Farm Boy", "The Farmer", "Dune", "Emma"]
+        self.books = [Book.loaded_book(title, "Orwell" if i % 2 else "Huxley", 1900 + i, "Fiction" if i % 3 else "Farming",
+                                       1, 1000 + i, [], 0, [], False) for i, title in enumerate(titles)]
+
+    def test_same_results_as_serial(self):
+        serial = SearchByAllFields()
+        for query in ("farm", "orwell", "o", "nothing"):
+            expected, _ = serial.search(self.books, query)
+            results, message = self.parallel.search(self.books, query)
+            self.assertEqual([book.id for book in results], [book.id for book in expected])
+            # the workers' books are copies, the results are the caller's books
+            self.assertTrue(all(any(book is given for given in self.books) for book in results))
+            self.assertEqual(self.parallel.field_counts, serial.field_counts)
+            self.assertIn(f"Found {len(expected)} book(s)", message)
+
+    def test_shards_reloaded_when_the_books_change(self):
+        self.parallel.search(self.books, "farm")
+        self.books.append(Book.loaded_book("Farm Animals", "Someone", 2000, "Nature", 1, 2000, [], 0, [], False))
+        results, _ = self.parallel.search(self.books, "farm")
+        self.assertIn(2000, [book.id for book in results])
+
+    def test_shards_reloaded_when_a_book_is_replaced_in_place(self):
+        self.parallel.search(self.books, "farm")
+        self.books[-1] = Book.loaded_book("Farmhouse", "Someone", 2000, "Nature", 1, 2001, [], 0, [], False)
+        results, _ = self.parallel.search(self.books, "farm")
+        self.assertEqual(results, SearchByAllFields().search(self.books, "farm")[0])
+        self.assertIs(results[-1], self.books[-1])
+
+    def test_lending_keeps_the_library_shards(self):
+        Library._Library__instance = None
+        library = Library.getInstance()
+        for book in self.books:
+            library.addBook(book)
+        self.parallel.search(None, "farm")
+        loaded = self.parallel._loaded
+        library.updateBookCopies(self.books[0], -1, to_print=False)
+        self.parallel.search(None, "farm")
+        self.assertEqual(self.parallel._loaded, loaded)
+        Library._Library__instance = None
+
+    def test_given_list_replaces_the_library_shards(self):
+        Library._Library__instance = None
+        library = Library.getInstance()
+        for book in self.books:
+            library.addBook(book)
+        self.parallel.search(None, "farm")
+        self.assertEqual(self.parallel._loaded, library.catalog_version)
+        other = self.books[:2]
+        self.assertEqual(self.parallel.search(other, "farm")[0], SearchByAllFields().search(other, "farm")[0])
+        self.assertIsNone(self.parallel._loaded)
+        results, _ = self.parallel.search(None, "farm")
+        self.assertEqual(results, SearchByAllFields().search(list(library.books.values()), "farm")[0])
+        Library._Library__instance = None
+
+    def test_other_scanning_strategies(self):
+        for strategy in (SearchByTitle(), SearchByAuthor()):
+            parallel = ParallelSearchStrategy(strategy, workers=2, min_books=0)
+            parallel._pool = self.parallel._pool
+            results, _ = parallel.search(self.books, "or")
+            self.assertEqual(results, strategy.search(self.books, "or")[0])
+        # the shared pool holds the last strategy's shards now
+        self.parallel._loaded = None
+
+    def test_small_catalog_runs_serially(self):
+        strategy = ParallelSearchStrategy(SearchByTitle(), workers=2)
+        results, _ = strategy.search(self.books, "farm")
+        self.assertIsNone(strategy._pool)
+        self.assertEqual(results, SearchByTitle().search(self.books, "farm")[0])
+
+    def test_index_strategies_are_rejected(self):
+        with self.assertRaises(ValueError):
+            ParallelSearchStrategy(TrigramSearchByTitle())
+
+    def test_library_search(self):
+        Library._Library__instance = None
+        library = Library.getInstance()
+        for book in self.books:
+            library.addBook(book)
+        results = library.searchBooks("farm", self.parallel)
+        self.assertEqual(results, library.searchBooks("farm", SearchByAllFields(), list(library.books.values())))
+        Library._Library__instance = None
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+
+from Classes.book import Book
+from design_patterns.decorator import CoverDecorator, DescriptionDecorator, descriptions_of
+from design_patterns.strategy import SearchByAuthorPhonetic
+from indexes.phonetic_index import PhoneticIndex, phonetic_codes, soundex
+
+
+class TestPhoneticIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.descriptions = {}
+        self.index = PhoneticIndex(lambda book_id: self.descriptions.get(book_id, []))
+        self.crime = Book.loaded_book("Crime and Punishment", "Fyodor Dostoyevsky", 1866, "Novel", 1, 801, [], 0, [], False)
+        self.war = Book.loaded_book("War and Peace", "Leo Tolstoy", 1869, "Novel", 1, 802, [], 0, [], False)
+        self.emma = Book.loaded_book("Emma", "Jane Austen", 1815, "Novel", 1, 803, [], 0, [], False)
+        self.essays = Book.loaded_book("Essays", "Various", 1900, "Essays", 1, 804, [], 0, [], False)
+        self.descriptions[804] = ["Essays on Dostoevsky and Tolstoi"]
+        self.index.rebuild([self.crime, self.war, self.emma, self.essays])
+
+    def test_soundex(self):
+        for word, code in [("Robert", "R163"), ("Rupert", "R163"), ("Ashcraft", "A261"), ("Tymczak", "T522"),
+                           ("Pfister", "P236"), ("Tolstoi", "T423"), ("Tolstoy", "T423"), ("Dostoevsky", "D231"),
+                           ("Dostoïevski", "D231"), ("Lee", "L000"), ("1984", "")]:
+            with self.subTest(word=word):
+                self.assertEqual(soundex(word), code)
+        self.assertEqual(phonetic_codes("Fyodor Dostoyevsky, 1866"), {"F360", "D231"})
+
+    def test_sounds_like_author(self):
+        results, message = SearchByAuthorPhonetic(self.index).search(None, "Dostoevsky")
+        self.assertEqual(results, [self.crime, self.essays])
+        self.assertEqual(message, "Search by Author (sounds like) 'Dostoevsky': Found 2 book(s).")
+        # every word must sound like one of the book's words
+        self.assertEqual(self.index.lookup(None, "Tolstoi Leo"), {802})
+        self.assertEqual(self.index.lookup("author", "Tolstoi"), {802})
+        self.assertEqual(self.index.lookup("description", "Tolstoi"), {804})
+        self.assertEqual(self.index.lookup(None, "Tolkien"), set())
+        # restricted to the given books, in their order
+        results, _ = SearchByAuthorPhonetic(self.index).search([self.essays, self.war], "tolstoi")
+        self.assertEqual(results, [self.essays, self.war])
+
+    def test_add_remove_and_descriptions(self):
+        self.index.remove_book(self.essays)
+        self.assertEqual(self.index.lookup(None, "Dostoevsky"), {801})
+        self.assertNotIn(804, self.index.codes_by_id)
+        self.descriptions[803] = ["A comedy of manners, like Austin's others"]
+        self.index.refresh_descriptions(self.emma)
+        self.assertEqual(self.index.lookup("description", "manners"), {803})
+        # the indexed codes are removed even if the descriptions changed since
+        del self.descriptions[803]
+        self.index.remove_book(self.emma)
+        self.assertNotIn("M562", self.index.postings["description"])
+
+    def test_descriptions_of_decorators_chain(self):
+        decorated = DescriptionDecorator(CoverDecorator(DescriptionDecorator(self.war, "first"), "cover.png"), "second")
+        self.assertEqual(descriptions_of(decorated), ["second", "first"])
+        self.assertEqual(descriptions_of(None), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+
+from Classes.book import Book
+from Classes.library import Library
+from Classes.user import Librarian, User
+from indexes.popularity_index import PopularityIndex
+
+
+class TestPopularityIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = PopularityIndex()
+        self.books = [Book.loaded_book(f"Popular {i}", "Author", 2000, "Fiction", 1, 1100 + i, [], count, [], False)
+                      for i, count in enumerate([3, 0, 7, 3])]
+        self.index.rebuild(self.books)
+
+    def test_top(self):
+        self.assertEqual(self.index.top(3), [self.books[2], self.books[0], self.books[3]])
+        self.assertEqual(self.index.top(10), [self.books[2], self.books[0], self.books[3], self.books[1]])
+        self.assertEqual(self.index.counts, [0, 3, 7])
+
+    def test_refresh_and_remove(self):
+        book = self.books[1]
+        book.borrow_count = 8
+        self.index.refresh_book(book)
+        self.assertEqual(self.index.top(2), [book, self.books[2]])
+        self.assertEqual(self.index.counts, [3, 7, 8])
+        self.index.remove_book(book)
+        self.assertEqual(self.index.top(1), [self.books[2]])
+        self.assertEqual(self.index.counts, [3, 7])
+
+
+class TestLibraryPopularBooks(unittest.TestCase):
+
+    def setUp(self):
+        Library._Library__instance = None
+        self.library = Library.getInstance()
+        self.librarian = Librarian("popular_librarian", password_hash="hash")
+        self.user = User("popular_user", password_hash="hash")
+        self.book = Book.createBook("Popular Test", "Author", 2000, "Fiction", 2)
+        self.library.addBook(self.book, caller=self.librarian)
+
+    def tearDown(self):
+        self.library.removeBook(self.book, caller=self.librarian)
+
+    def test_borrow_moves_book_to_top(self):
+        self.assertTrue(self.library.lendBook(self.user, self.book, print_book=False))
+        self.assertEqual(self.library.getPopularBooks(1), [self.book])
+
+
+if __name__ == "__main__":
+    unittest.main()
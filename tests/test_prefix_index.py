@@ -0,0 +1,65 @@
+import unittest
+
+from Classes.book import Book
+from Classes.library import Library
+from Classes.user import Librarian, User
+from indexes.prefix_index import PrefixIndex, normalize
+
+
+class TestPrefixIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = PrefixIndex()
+        self.hobbit = Book.loaded_book("The Hobbit", "J.R.R. Tolkien", 1937, "Fantasy", 2, 801, [], 5, [], False)
+        self.rings = Book.loaded_book("The Lord of the Rings", "J.R.R. Tolkien", 1954, "Fantasy", 1, 802, [], 9, [], False)
+        self.hunger = Book.loaded_book("The Hunger Games", "Suzanne Collins", 2008, "Fiction", 1, 803, [], 1, [], False)
+        self.index.rebuild([self.hobbit, self.rings, self.hunger])
+
+    def test_normalize(self):
+        self.assertEqual(normalize("  The   HOBBIT "), "the hobbit")
+
+    def test_suggest_ranked_by_borrow_count(self):
+        self.assertEqual(self.index.suggest("the", 5), ["The Lord of the Rings", "The Hobbit", "The Hunger Games"])
+        self.assertEqual(self.index.suggest("H", 5), ["The Hobbit", "The Hunger Games"])
+        self.assertEqual(self.index.suggest("the h", 1), ["The Hobbit"])
+        # authors complete too, a completion is listed once
+        self.assertEqual(self.index.suggest("tolk", 5), ["J.R.R. Tolkien"])
+        self.assertEqual(self.index.suggest("", 5), [])
+        self.assertEqual(self.index.suggest("xyz", 5), [])
+
+    def test_cached_completions_follow_changes(self):
+        self.assertEqual(self.index.suggest("h", 5), ["The Hobbit", "The Hunger Games"])
+        self.hunger.borrow_count = 7
+        self.index.refresh_book(self.hunger)
+        self.assertEqual(self.index.suggest("h", 5), ["The Hunger Games", "The Hobbit"])
+
+        self.index.remove_book(self.hunger)
+        self.assertEqual(self.index.suggest("h", 5), ["The Hobbit"])
+        habits = Book.loaded_book("Atomic Habits", "James Clear", 2018, "Self-Help", 1, 804, [], 6, [], False)
+        self.index.add_book(habits)
+        self.assertEqual(self.index.suggest("h", 5), ["Atomic Habits", "The Hobbit"])
+
+
+class TestLibrarySuggest(unittest.TestCase):
+
+    def setUp(self):
+        Library._Library__instance = None
+        self.library = Library.getInstance()
+        self.librarian = Librarian("suggest_librarian", password_hash="hash")
+        self.user = User("suggest_user", password_hash="hash")
+        self.quiet = Book.createBook("Zyzzyva Quiet", "Author", 2000, "Fiction", 1)
+        self.loud = Book.createBook("Zyzzyva Loud", "Author", 2000, "Fiction", 1)
+        self.library.addBook(self.quiet, caller=self.librarian)
+        self.library.addBook(self.loud, caller=self.librarian)
+
+    def tearDown(self):
+        self.library.removeBooks([self.quiet, self.loud], caller=self.librarian)
+
+    def test_borrowing_reorders_suggestions(self):
+        self.assertEqual(self.library.suggest("zyzz", 2), ["Zyzzyva Loud", "Zyzzyva Quiet"])
+        self.assertTrue(self.library.lendBook(self.user, self.quiet, print_book=False))
+        self.assertEqual(self.library.suggest("zyzz", 2), ["Zyzzyva Quiet", "Zyzzyva Loud"])
+
+
+if __name__ == "__main__":
+    unittest.main()
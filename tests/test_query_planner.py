@@ -0,0 +1,89 @@
+import unittest
+
+from Classes.book import Book
+from Classes.library import Library
+from Classes.user import Librarian
+from design_patterns.exceptions import QuerySyntaxError
+from indexes.attribute_index import AttributeIndex
+from indexes.query_planner import is_structured_query, parse_year_range
+
+
+class TestAttributeIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = AttributeIndex()
+        self.books = [Book.loaded_book(f"Book {year}", "Author", year, "Fiction", 1, 1000 + year % 100, [], 0, [], False)
+                      for year in (1950, 1925, 1949, 1984)]
+        self.index.rebuild(self.books)
+
+    def test_year_range(self):
+        self.assertEqual(self.index.year_range(1940, 1960), {1049, 1050})
+        self.assertEqual(self.index.count_years(None, 1949), 2)
+        self.assertEqual(self.index.year_range(1985, None), set())
+        self.index.remove_book(self.books[0])
+        self.assertEqual(self.index.year_range(1940, 1960), {1049})
+
+    def test_availability_follows_copies(self):
+        book = self.books[1]
+        self.assertIn(book.id, self.index.available)
+        book.available_copies = 0
+        self.index.refresh_book(book)
+        self.assertIn(book.id, self.index.unavailable)
+        self.assertNotIn(book.id, self.index.available)
+
+
+class TestLibraryQuery(unittest.TestCase):
+
+    def setUp(self):
+        Library._Library__instance = None
+        self.library = Library.getInstance()
+        self.librarian = Librarian("query_librarian", password_hash="hash")
+        self.nineteen = Book.createBook("Nineteen Eighty-Four", "George Orwell", 1949, "Dystopia", 1)
+        self.farm = Book.createBook("Animal Farm", "George Orwell", 1945, "Satire", 0)
+        self.brave = Book.createBook("Brave New World", "Aldous Huxley", 1932, "Dystopia", 2)
+        self.books = [self.nineteen, self.farm, self.brave]
+        for book in self.books:
+            self.library.addBook(book, caller=self.librarian)
+
+    def tearDown(self):
+        self.library.removeBooks(self.books, caller=self.librarian)
+
+    def test_query_terms(self):
+        self.assertEqual(self.library.query("author:orwell year:1940..1960 genre:dystopia available"), [self.nineteen])
+        self.assertEqual(self.library.query("author:orwell unavailable"), [self.farm])
+        self.assertEqual(self.library.query('title:"animal farm"'), [self.farm])
+        self.assertEqual(self.library.query("year:..1946 dystopia"), [self.brave])
+        self.assertEqual(self.library.query("orwell year:1949"), [self.nineteen])
+
+    def test_query_follows_copies(self):
+        self.assertEqual(self.library.query("author:huxley available"), [self.brave])
+        self.library.updateBookCopies(self.brave, -2, to_print=False)
+        self.assertEqual(self.library.query("author:huxley available"), [])
+
+    def test_explain_runs_most_selective_first(self):
+        explain = self.library.explain_query("available author:huxley")
+        lines = explain.splitlines()
+        self.assertEqual(lines[0], "Query plan for 'available author:huxley':")
+        self.assertEqual(lines[1], "  1. author:huxley [tokens] scan, estimated 1 -> 1 book(s)")
+        self.assertTrue(lines[2].startswith("  2. available [attributes] filter, estimated "))
+        self.assertTrue(lines[2].endswith("-> 1 book(s)"))
+
+    def test_syntax_errors(self):
+        for query in ("year:abc", "year:1960..1940", "color:red", "available:maybe", "title:!!"):
+            with self.subTest(query=query):
+                with self.assertRaises(QuerySyntaxError):
+                    self.library.query(query)
+        self.assertEqual(parse_year_range("q", "1940.."), (1940, None))
+
+
+    def test_structured_query_detection(self):
+        for text in ("author:orwell", "Year:1949", 'title:"animal farm" available', "available:yes", "dune genre:sf"):
+            with self.subTest(text=text):
+                self.assertTrue(is_structured_query(text))
+        # a colon in a title isn't a query
+        for text in ("Re:Zero", "Potter:The", "Star Wars: A New Hope", "orwell"):
+            with self.subTest(text=text):
+                self.assertFalse(is_structured_query(text))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+
+from Classes.book import Book
+from Classes.library import Library
+from Classes.user import Librarian
+from design_patterns.strategy import SearchByTitle, SearchByAuthor, TrigramSearchAllFields
+from indexes.search_cache import SearchCache
+
+
+class TestSearchCache(unittest.TestCase):
+
+    def test_lru_eviction_and_stats(self):
+        cache = SearchCache(maxsize=2)
+        cache.put("a", 0, 1)
+        cache.put("b", 0, 2)
+        self.assertEqual(cache.get("a", 0), 1)
+        cache.put("c", 0, 3)
+        # "b" was the least recently used
+        self.assertIsNone(cache.get("b", 0))
+        self.assertEqual(cache.get("c", 0), 3)
+        self.assertEqual(cache.stats()["hits"], 2)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_stale_generation_is_a_miss(self):
+        cache = SearchCache()
+        cache.put("a", 0, 1)
+        self.assertIsNone(cache.get("a", 1))
+        self.assertEqual(len(cache), 0)
+
+
+class TestLibrarySearchCache(unittest.TestCase):
+
+    def setUp(self):
+        Library._Library__instance = None
+        self.library = Library.getInstance()
+        self.librarian = Librarian("cache_librarian", password_hash="hash")
+        self.book = Book.createBook("Cache Test Title", "Cache Author", 2000, "Fiction", 1)
+        self.library.addBook(self.book, caller=self.librarian)
+
+    def tearDown(self):
+        if self.book.id in self.library.books:
+            self.library.removeBook(self.book, caller=self.librarian)
+
+    def test_repeated_search_hits_cache(self):
+        self.assertEqual(self.library.searchBooks("cache test", SearchByTitle()), [self.book])
+        self.assertEqual(self.library.searchBooks("CACHE TEST", SearchByTitle()), [self.book])
+        stats = self.library.search_cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        # another strategy is another key
+        self.library.searchBooks("cache test", SearchByAuthor())
+        self.assertEqual(self.library.search_cache_stats()["misses"], 2)
+
+    def test_field_counts_restored_on_hit(self):
+        self.library.searchBooks("cache", TrigramSearchAllFields())
+        strategy = TrigramSearchAllFields()
+        self.assertEqual(self.library.searchBooks("cache", strategy), [self.book])
+        self.assertEqual(strategy.field_counts, {"title": 1, "author": 1, "category": 0})
+
+    def test_mutations_invalidate(self):
+        self.library.searchBooks("cache test", SearchByTitle())
+        other = Book.createBook("Cache Test Sequel", "Cache Author", 2001, "Fiction", 1)
+        self.library.addBook(other, caller=self.librarian)
+        try:
+            self.assertEqual(self.library.searchBooks("cache test", SearchByTitle()), [self.book, other])
+            generation = self.library.generation
+            self.library.updateBookCopies(other, -1, to_print=False)
+            self.assertGreater(self.library.generation, generation)
+        finally:
+            self.library.removeBook(other, caller=self.librarian)
+        self.assertEqual(self.library.searchBooks("cache test", SearchByTitle()), [self.book])
+        self.assertEqual(self.library.search_cache_stats()["hits"], 0)
+
+    def test_restricted_search_not_cached(self):
+        self.library.searchBooks("cache test", SearchByTitle(), books=[self.book])
+        self.assertEqual(self.library.search_cache_stats()["misses"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from Classes.book import Book
+from Classes.user import User, Librarian
+from design_patterns.decorator import CoverDecorator, DescriptionDecorator
+from manage_files import snapshot_manager
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        """Build a small object graph: two books, a user who borrowed and follows a book, a librarian."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.snapshot_path = os.path.join(self.temp_dir, "books.csv.snapshot")
+        self.lost_books_user = User("holds_lost_books", password_hash="hash0")
+        self.lost_books_user.id = 0
+
+        self.first = Book.loaded_book("First", "Author", 2001, "Fiction", 2, 901, [], 4, [], False)
+        self.second = Book.loaded_book("Second ✓", "Other", 1999, "History", 1, 902, [], 0, [], False)
+        self.user = User.loaded_user("reader", "hash1", 911)
+        self.librarian = Librarian.loaded_librarian("admin", "hash2", 912)
+
+        self.first.borrow_book(self.user, print_update_for_copy=False)
+        self.user.borrowedBooks.append(self.first)
+        self.user.previously_borrowed_books = [902]
+        self.second.borrowed_users.append(0)
+        self.lost_books_user.borrowedBooks.append(self.second)
+        self.second.user_observers.append(self.user)
+        self.decorated = CoverDecorator(DescriptionDecorator(self.first, "a description"), "cover.png")
+
+        snapshot_manager.save_snapshot(self.snapshot_path,
+                                       {0: self.lost_books_user, 911: self.user, 912: self.librarian},
+                                       {901: self.first, 902: self.second}, {901: self.decorated},
+                                       {"users": "users.csv", "books": "books.csv", "book_decorators": None})
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_round_trip(self):
+        """Loading a snapshot rebuilds the books, users, loans, followers and decorators."""
+        lost_books_user = User("holds_lost_books", password_hash="hash0")
+        loaded = snapshot_manager.load_snapshot(self.snapshot_path, lost_books_user)
+        books, users = loaded["books"], loaded["users"]
+
+        self.assertEqual(sorted(books), [901, 902])
+        self.assertEqual(books[902].title, "Second ✓")
+        self.assertEqual((books[901].available_copies, books[901].borrow_count), (1, 5))
+        self.assertEqual(books[901].borrowed_users, [911])
+        self.assertIs(users[0], lost_books_user)
+        self.assertEqual(users[0].borrowedBooks, [books[902]])
+        self.assertEqual(users[911].borrowedBooks, [books[901]])
+        self.assertEqual(users[911].previously_borrowed_books, [902])
+        self.assertEqual(users[911].passwordHash, "hash1")
+        self.assertEqual(users[912].role, "librarian")
+        self.assertEqual(books[902].user_observers, [users[911]])
+        self.assertEqual(loaded["decorated_books"][901].getDetails()["cover_image"], "cover.png")
+        self.assertEqual(loaded["decorated_books"][901].getDetails()["description"], "a description")
+        self.assertEqual(loaded["csv_paths"], {"users": "users.csv", "books": "books.csv", "book_decorators": None})
+
+    def test_corrupted_snapshot(self):
+        """A changed byte fails the checksum instead of loading a broken library."""
+        with open(self.snapshot_path, "r+b") as snapshot_file:
+            snapshot_file.seek(-1, os.SEEK_END)
+            last_byte = snapshot_file.read(1)
+            snapshot_file.seek(-1, os.SEEK_END)
+            snapshot_file.write(bytes([last_byte[0] ^ 0xFF]))
+        with self.assertRaises(snapshot_manager.SnapshotError):
+            snapshot_manager.load_snapshot(self.snapshot_path, self.lost_books_user)
+
+
+if __name__ == "__main__":
+    unittest.main()
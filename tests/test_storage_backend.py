@@ -0,0 +1,53 @@
+import csv
+import os
+import shutil
+import tempfile
+import unittest
+
+from manage_files import csv_manager
+from manage_files.sqlite_manager import SqliteStorageBackend
+from tests.helpers import book_json
+
+
+class TestSqliteStorageBackend(unittest.TestCase):
+
+    def setUp(self):
+        """Create a books csv with two books and an empty database in a temp directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.books_csv = os.path.join(self.temp_dir, "books.csv")
+        self.mapping = csv_manager.book_headers_mapping
+        with open(self.books_csv, 'w', encoding='utf-8', newline='') as outfile:
+            writer = csv.DictWriter(outfile, fieldnames=self.mapping.values())
+            writer.writeheader()
+            writer.writerow(csv_manager.obj_to_row(book_json(1, "First"), self.mapping))
+            writer.writerow(csv_manager.obj_to_row(book_json(2, "Second"), self.mapping))
+        self.storage = SqliteStorageBackend(os.path.join(self.temp_dir, "library.db"))
+
+    def tearDown(self):
+        self.storage.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_imports_csv_on_first_load(self):
+        """An empty table is imported from the csv layout."""
+        books = self.storage.load_objs_dict(self.books_csv, self.mapping, "Book")
+        self.assertEqual(sorted(books.keys()), [1, 2])
+        self.assertEqual(books[2].title, "Second")
+
+    def test_update_and_remove(self):
+        """Upserts update rows by primary key and removals delete them, without touching the csv."""
+        self.storage.load_objs_dict(self.books_csv, self.mapping, "Book")
+        self.storage.update([
+            {"obj_data": book_json(1, "First", [7]), "csv_file_path": self.books_csv, "headers_mapping": self.mapping},
+            {"obj_data": book_json(3, "Third"), "csv_file_path": self.books_csv, "headers_mapping": self.mapping},
+        ])
+        self.assertTrue(self.storage.remove_objs([2], self.books_csv, self.mapping))
+
+        books = self.storage.load_objs_dict(self.books_csv, self.mapping, "Book")
+        self.assertEqual(sorted(books.keys()), [1, 3])
+        self.assertEqual(books[1].borrowed_users, [7])
+        with open(self.books_csv, 'r', encoding='utf-8', newline='') as infile:
+            self.assertEqual(len(list(csv.DictReader(infile))), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+
+from Classes.book import Book
+from Classes.library import Library
+from Classes.user import Librarian
+from design_patterns.strategy import SearchByTitle, IndexedSearchByTitle, IndexedSearchByAuthor
+from indexes.token_index import TokenIndex, tokenize
+
+
+class TestTokenIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = TokenIndex()
+        self.hobbit = Book.loaded_book("The Hobbit", "J.R.R. Tolkien", 1937, "Fantasy", 2, 701, [], 0, [], False)
+        self.rings = Book.loaded_book("The Lord of the Rings", "J.R.R. Tolkien", 1954, "Fantasy", 1, 702, [], 0, [], False)
+        self.dune = Book.loaded_book("Dune", "Frank Herbert", 1965, "Science-Fiction", 1, 703, [], 0, [], False)
+        self.index.rebuild([self.hobbit, self.rings, self.dune])
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize("The Lord-of the RINGS"), ["the", "lord", "of", "the", "rings"])
+
+    def test_lookup_intersects_tokens(self):
+        self.assertEqual(self.index.lookup("title", "the"), {701, 702})
+        self.assertEqual(self.index.lookup("title", "rings THE"), {702})
+        self.assertEqual(self.index.lookup("category", "fiction"), {703})
+        self.assertEqual(self.index.lookup("title", "missing"), set())
+        self.assertEqual(self.index.lookup("title", ""), {701, 702, 703})
+
+    def test_remove_book(self):
+        self.index.remove_book(self.hobbit)
+        self.assertEqual(self.index.lookup("title", "the"), {702})
+        self.assertNotIn("hobbit", self.index.postings["title"])
+
+    def test_strategy_restricted_to_given_books(self):
+        strategy = IndexedSearchByAuthor(self.index)
+        results, message = strategy.search(None, "tolkien")
+        self.assertEqual(results, [self.hobbit, self.rings])
+        self.assertEqual(message, "Search by Author 'tolkien': Found 2 book(s).")
+        results, _ = strategy.search([self.rings, self.dune], "tolkien")
+        self.assertEqual(results, [self.rings])
+
+
+class TestLibraryTokenIndex(unittest.TestCase):
+
+    def setUp(self):
+        Library._Library__instance = None
+        self.library = Library.getInstance()
+        self.librarian = Librarian("index_librarian", password_hash="hash")
+        self.book = Book.createBook("Index Test Title", "Author", 2000, "Fiction", 1)
+
+    def test_add_and_remove_keep_index_in_sync(self):
+        self.library.addBook(self.book, caller=self.librarian)
+        self.assertEqual(self.library.searchBooks("index test", IndexedSearchByTitle()), [self.book])
+        self.assertEqual(self.library.searchBooks("index test", SearchByTitle()), [self.book])
+
+        self.library.removeBook(self.book, caller=self.librarian)
+        self.assertEqual(self.library.searchBooks("index test", IndexedSearchByTitle()), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
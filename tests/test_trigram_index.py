@@ -0,0 +1,68 @@
+import random
+import unittest
+
+from Classes.book import Book
+from design_patterns.strategy import (SearchByTitle, SearchByAuthor, SearchByCategory, SearchByAllFields,
+                                      TrigramSearchByTitle, TrigramSearchByAuthor, TrigramSearchByCategory,
+                                      TrigramSearchAllFields)
+from indexes.trigram_index import TrigramIndex
+
+
+class TestTrigramIndex(unittest.TestCase):
+
+    def setUp(self):
+        """Index a few hundred books with random titles, authors and categories."""
+        rng = random.Random(11)
+        words = ["Shadow", "river", "GARDEN", "Winter's", "sécret", "empire", "night-fall", "a", "of"]
+        self.books = [Book.loaded_book(" ".join(rng.choice(words) for _ in range(rng.randint(1, 4))),
+                                       f"{rng.choice(words)} {rng.choice(words)}", 2000, rng.choice(words), 1,
+                                       800 + book_id, [], 0, [], False)
+                      for book_id in range(300)]
+        self.index = TrigramIndex()
+        self.index.rebuild(self.books)
+        self.queries = ["", "a", "ow", "rDE", "den wi", "inter's", "SÉC", "night-f", "e o", "river river", "zzz"]
+
+    def test_same_results_as_scanning_strategies(self):
+        """Mid-word, short, case and unicode queries match exactly what the scans return, in the same order."""
+        pairs = [(SearchByTitle(), TrigramSearchByTitle(self.index)),
+                 (SearchByAuthor(), TrigramSearchByAuthor(self.index)),
+                 (SearchByCategory(), TrigramSearchByCategory(self.index))]
+        for scanning, indexed in pairs:
+            for query in self.queries:
+                with self.subTest(strategy=type(indexed).__name__, query=query):
+                    self.assertEqual(indexed.search(None, query)[0], scanning.search(self.books, query)[0])
+
+    def test_all_fields_search(self):
+        """The single pass and the single probe match the union of the three field searches, with their counts."""
+        for query in self.queries:
+            with self.subTest(query=query):
+                per_field = {field: strategy.search(self.books, query)[0] for field, strategy in
+                             [("title", SearchByTitle()), ("author", SearchByAuthor()), ("category", SearchByCategory())]}
+                expected = [book for book in self.books if any(book in results for results in per_field.values())]
+                expected_counts = {field: len(results) for field, results in per_field.items()}
+
+                scanning, indexed = SearchByAllFields(), TrigramSearchAllFields(self.index)
+                self.assertEqual(scanning.search(self.books, query)[0], expected)
+                self.assertEqual(indexed.search(None, query)[0], expected)
+                self.assertEqual(scanning.field_counts, expected_counts)
+                self.assertEqual(indexed.field_counts, expected_counts)
+
+    def test_all_fields_search_restricted_to_given_books(self):
+        strategy = TrigramSearchAllFields(self.index)
+        results, _ = strategy.search(self.books[:50], "a")
+        self.assertEqual(results, SearchByAllFields().search(self.books[:50], "a")[0])
+        self.assertLessEqual(sum(strategy.field_counts.values()), 150)
+
+    def test_incremental_updates(self):
+        """Removed books leave the postings, re-added books come back at the end of the order."""
+        book = self.books[0]
+        self.index.remove_book(book)
+        self.assertNotIn(book.id, self.index.lookup("title", book.title))
+        self.assertFalse(any(book.id in ids for ids in self.index.postings.values()))
+        self.index.add_book(book)
+        results, _ = TrigramSearchByTitle(self.index).search(None, book.title)
+        self.assertEqual(results[-1], book)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+from unittest.mock import patch
+
+from werkzeug.security import generate_password_hash
+
+from Classes.user import User, Librarian, LIBRARIAN_DEFAULT_PERMISSIONS
+
+
+class TestLoadedUsers(unittest.TestCase):
+
+    def setUp(self):
+        """Hash one password for the stored user rows."""
+        self.password_hash = generate_password_hash("secret")
+
+    def user_json(self, role):
+        return {"id": "7", "username": "loaded", "passwordHash": self.password_hash, "role": role,
+                "borrowed_books": "[1, 2]", "previously_borrowed_books": "[3]"}
+
+    def test_loaded_user_skips_hashing(self):
+        """Loading a user keeps the stored hash and never runs the key derivation."""
+        with patch("Classes.user.generate_password_hash") as mock_hash:
+            user = User.from_json(self.user_json("regular user"))
+            mock_hash.assert_not_called()
+        self.assertEqual(user.passwordHash, self.password_hash)
+        self.assertTrue(user.verify_password("secret"))
+        self.assertEqual(user.id, 7)
+        self.assertEqual(user.temp_borrowedBooks, [1, 2])
+        self.assertEqual(user.previously_borrowed_books, [3])
+
+    def test_loaded_librarian(self):
+        """Loading a librarian builds a Librarian from the stored hash."""
+        with patch("Classes.user.generate_password_hash") as mock_hash:
+            librarian = User.from_json(self.user_json("librarian"))
+            mock_hash.assert_not_called()
+        self.assertIsInstance(librarian, Librarian)
+        self.assertEqual(librarian.role, "librarian")
+        self.assertEqual(librarian.permissions, LIBRARIAN_DEFAULT_PERMISSIONS)
+        self.assertTrue(librarian.verify_password("secret"))
+
+    def test_new_user_hashes_password(self):
+        """Creating a user from a plain password still hashes it."""
+        user = User("new", "plain")
+        self.assertNotEqual(user.passwordHash, "plain")
+        self.assertTrue(user.verify_password("plain"))
+
+
+if __name__ == "__main__":
+    unittest.main()
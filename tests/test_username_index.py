@@ -0,0 +1,46 @@
+import unittest
+
+from Classes.user import User
+from indexes.username_index import UsernameIndex, normalize_username
+
+
+class TestUsernameIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = UsernameIndex()
+        self.alice = User("Alice", password_hash="hash")
+        self.bob = User("bob", password_hash="hash")
+        self.index.rebuild([self.alice, self.bob])
+
+    def test_case_insensitive_lookup(self):
+        self.assertEqual(normalize_username("  ALice "), "alice")
+        self.assertIs(self.index.get("alice"), self.alice)
+        self.assertIs(self.index.get("BOB"), self.bob)
+        self.assertIsNone(self.index.get("carol"))
+        self.assertTrue(self.index.is_taken("ALICE"))
+        self.assertFalse(self.index.is_taken("carol"))
+
+    def test_add_and_remove(self):
+        users = [User(f"patron{i}", password_hash="hash") for i in range(3000)]
+        for user in users:
+            self.index.add_user(user)
+        self.assertTrue(all(self.index.get(user.username) is user for user in users))
+        self.index.remove_user(self.alice)
+        self.assertIsNone(self.index.get("Alice"))
+        self.assertEqual(len(self.index), 3001)
+
+    def test_usernames_differing_by_case(self):
+        """Loaded users whose names differ only by case are all kept and found by their exact username."""
+        upper_bob = User("Bob", password_hash="hash")
+        collisions = self.index.rebuild([self.alice, self.bob, upper_bob])
+        self.assertEqual(collisions, [[self.bob, upper_bob]])
+        self.assertIs(self.index.get("bob"), self.bob)
+        self.assertIs(self.index.get("Bob"), upper_bob)
+        self.assertIsNone(self.index.get("BOB"))
+        self.assertTrue(self.index.is_taken("BOB"))
+        self.index.remove_user(self.bob)
+        self.assertIs(self.index.get("BOB"), upper_bob)
+
+
+if __name__ == "__main__":
+    unittest.main()